@@ -0,0 +1,13 @@
+"""Micro-benchmarks for the ML hot paths.
+
+    python -m benchmarks run                          # scales up to 10k rows
+    python -m benchmarks run --max-rows 1000000       # include the 1M-row cases
+    python -m benchmarks run -k 'feature_*' --out benchmarks/results/encoder.json
+    python -m benchmarks compare benchmarks/baseline.json benchmarks/results/latest.json
+
+`run` writes median/min/mean wall time, per-row cost and tracemalloc peak
+allocation for every case and scale to JSON. `compare` prints the change per
+case and exits 1 when any case slowed down by more than --threshold (default
+10%) or grew its peak memory by more than --mem-threshold (default 25%).
+Save a run as the baseline on the machine that does the comparing.
+"""
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from . import harness
+
+DEFAULT_OUT = Path(__file__).resolve().parent / 'results' / 'latest.json'
+
+
+def _run(args) -> int:
+    from . import bench_ml  # noqa: F401  (registers the cases)
+
+    results = harness.run_cases(args.k, max_rows=args.max_rows, repeat=args.repeat)
+    if not results:
+        print(f"No cases match '{args.k}'. Available: {', '.join(harness.CASES)}", file=sys.stderr)
+        return 2
+    harness.save(results, args.out)
+    print(f"Wrote {args.out}")
+    return 0
+
+
+def _compare(args) -> int:
+    rows = harness.compare(harness.load(args.baseline), harness.load(args.current),
+                           threshold=args.threshold, mem_threshold=args.mem_threshold)
+    if not rows:
+        print("No cases in common.", file=sys.stderr)
+        return 2
+    print(f"{'case':<45} {'base ms':>10} {'now ms':>10} {'time':>8} {'peak mem':>9}")
+    for r in rows:
+        flag = '  REGRESSION' if r['regressed'] else ''
+        print(f"{r['key']:<45} {r['base_ms']:10.3f} {r['cur_ms']:10.3f} "
+              f"{r['time_change']:+8.1%} {r['mem_change']:+9.1%}{flag}")
+    regressed = [r['key'] for r in rows if r['regressed']]
+    if regressed:
+        print(f"{len(regressed)} regression(s) beyond {args.threshold:.0%} time / {args.mem_threshold:.0%} memory")
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="ML hot-path micro-benchmarks.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Run the benchmarks and save JSON results.')
+    run.add_argument('-k', default='*', help='Glob over case names.')
+    run.add_argument('--max-rows', type=int, default=10_000, help='Skip scales above this row count.')
+    run.add_argument('--repeat', type=int, default=5, help='Minimum timed repeats per case.')
+    run.add_argument('--out', type=Path, default=DEFAULT_OUT)
+    run.set_defaults(func=_run)
+
+    cmp_ = sub.add_parser('compare', help='Compare two result files and flag regressions.')
+    cmp_.add_argument('baseline', type=Path)
+    cmp_.add_argument('current', type=Path)
+    cmp_.add_argument('--threshold', type=float, default=0.10, help='Allowed median-time increase (fraction).')
+    cmp_.add_argument('--mem-threshold', type=float, default=0.25, help='Allowed peak-memory increase (fraction).')
+    cmp_.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
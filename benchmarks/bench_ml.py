@@ -0,0 +1,119 @@
+"""Benchmark cases for the ML hot paths."""
+from __future__ import annotations
+
+from . import fixtures
+from .harness import case
+
+
+@case('feature_encoder.transform', scales=(1, 100, 10_000, 1_000_000))
+def feature_encoder_transform(n):
+    """FeatureEncoder.transform on n profiles."""
+    enc = fixtures.encoder()
+    df = fixtures.profile_frame(n)
+    return lambda: enc.transform(df)
+
+
+@case('sensei_predictor.predict', scales=(1, 100))
+def sensei_predict(n):
+    """SenseiPredictor.predict called once per payload (n payloads)."""
+    predictor = fixtures.predictor()
+    payloads = fixtures.payloads(n)
+    return lambda: [predictor.predict(p) for p in payloads]
+
+
+@case('sensei_predictor.predict_preview', scales=(1, 100))
+def sensei_predict_preview(n):
+    """SenseiPredictor.predict with model_tier="preview" (distilled linear model), n payloads."""
+    predictor = fixtures.predictor()
+    payloads = fixtures.payloads(n)
+    return lambda: [predictor.predict(p, model_tier='preview') for p in payloads]
+
+
+@case('sensei_predictor.predict_batch', scales=(1, 100))
+def sensei_predict_batch(n):
+    """SenseiPredictor.predict_batch on n payloads (one encoder pass, one predict_proba)."""
+    predictor = fixtures.predictor()
+    payloads = fixtures.payloads(n)
+    return lambda: predictor.predict_batch(payloads)
+
+
+@case('sensei_predictor.predict_batch_explain', scales=(1, 100))
+def sensei_predict_batch_explain(n):
+    """predict_batch with explain=True: pred_contribs for each payload's top-3 roles."""
+    predictor = fixtures.predictor()
+    payloads = fixtures.payloads(n)
+    predictor.predict_batch(payloads[:1], explain=True)  # load the boosters outside the timing
+    return lambda: predictor.predict_batch(payloads, explain=True)
+
+
+@case('sensei_predictor.what_if', scales=(1, 10))
+def sensei_what_if(n):
+    """SenseiPredictor.what_if (all single-skill additions, one batch each) for n payloads."""
+    predictor = fixtures.predictor()
+    payloads = fixtures.payloads(n)
+    role = predictor.roles[0]
+    return lambda: [predictor.what_if(p, role) for p in payloads]
+
+
+@case('trees.predict_proba', scales=(1, 100, 1000))
+def trees_predict_proba(n):
+    """Exported NumPy tree evaluator, all roles, one batch of n rows."""
+    model = fixtures.tree_ensemble()
+    X = fixtures.feature_matrix(n)
+    return lambda: model.predict_proba(X)
+
+
+@case('xgboost.predict_proba', scales=(1, 100, 1000))
+def xgboost_predict_proba(n):
+    """Pickled OneVsRestClassifier of XGBClassifiers, one batch of n rows."""
+    model = fixtures.xgb_model()
+    X = fixtures.feature_matrix(n)
+    return lambda: model.predict_proba(X)
+
+
+@case('predict_roles_local', scales=(1, 100))
+def predict_roles_local(n):
+    """Django skill-text role matcher, one call per profile."""
+    views = fixtures.django_views()
+    skills = fixtures.profile_frame(n)['skills'].tolist()
+    return lambda: [views.predict_roles_local(s) for s in skills]
+
+
+@case('tune_thresholds', scales=(100, 10_000, 1_000_000))
+def tune_thresholds(n):
+    """Per-role threshold grid search on n validation rows x 20 roles."""
+    from src.threshold_tuning import tune_thresholds as tune
+    y, scores = fixtures.label_matrix(n)
+    return lambda: tune(y, scores)
+
+
+@case('precision_recall_at_k', scales=(100, 10_000, 1_000_000))
+def precision_recall_at_k(n):
+    """precision@3 and recall@3 on n rows x 20 roles."""
+    from src.train_xgb import precision_at_k, recall_at_k
+    y, scores = fixtures.label_matrix(n)
+    return lambda: (precision_at_k(y, scores, 3), recall_at_k(y, scores, 3))
+
+
+@case('ranking_metrics', scales=(100, 10_000, 1_000_000))
+def ranking_metrics(n):
+    """precision/recall/nDCG/MAP/coverage at k=1,3,5 on n rows x 20 roles."""
+    from src.ranking_metrics import ranking_metrics as metrics
+    y, scores = fixtures.label_matrix(n)
+    return lambda: metrics(y, scores, ks=(1, 3, 5))
+
+
+@case('ingest.parse_list_column', scales=(100, 10_000, 1_000_000))
+def parse_list_column(n):
+    """Comma-separated skills column of n CSV rows parsed into lists."""
+    from src.ingest import parse_list_column as parse
+    column = fixtures.skills_column(n)
+    return lambda: parse(column)
+
+
+@case('analyze_text', scales=(1, 100, 10_000))
+def analyze_text(n):
+    """Sentiment + emotion analysis of n short messages."""
+    from main.utils.sentiment import analyze_text as analyze
+    texts = fixtures.texts(n)
+    return lambda: [analyze(t) for t in texts]
@@ -0,0 +1,172 @@
+"""Inputs and trained artifacts for the benchmark cases.
+
+Artifacts come from src/artifacts when a trained model is present there;
+otherwise a model is trained once on data/synthetic_career_data.csv into
+benchmarks/.cache/ (a few seconds) and reused by later runs.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .harness import ROOT
+
+CACHE_DIR = Path(__file__).resolve().parent / '.cache'
+DATA_CSV = ROOT / 'data' / 'synthetic_career_data.csv'
+CONFIGS_DIR = ROOT / 'src' / 'configs'
+
+SENTENCES = [
+    "I am excited and motivated to grow as a data scientist.",
+    "The last project failed and I feel stressed about the deadline.",
+    "My team was helpful and I love working with Python every day.",
+    "Not sure which role fits me; I like design but worry about the risk.",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def artifacts_dir() -> Path:
+    src = ROOT / 'src' / 'artifacts'
+    if (src / 'xgb_onevsrest.joblib').exists():
+        return src
+    out = CACHE_DIR / 'artifacts'
+    if not (out / 'xgb_onevsrest.joblib').exists():
+        print(f"Training a fixture model into {out} ...", file=sys.stderr)
+        subprocess.run(
+            [sys.executable, '-W', 'ignore', '-m', 'src.train_xgb', '--data', str(DATA_CSV), '--artifacts_dir', str(out)],
+            cwd=ROOT, check=True, stdout=subprocess.DEVNULL,
+        )
+    if not (out / 'xgb_trees.npz').exists():
+        # Fixture models trained before the NumPy tree export existed
+        subprocess.run([sys.executable, '-m', 'src.tree_export', '--artifacts_dir', str(out)],
+                       cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    if not (out / 'student_linear.npz').exists():
+        subprocess.run([sys.executable, '-W', 'ignore', '-m', 'src.distill', '--data', str(DATA_CSV),
+                        '--artifacts_dir', str(out)], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def predictor():
+    from src.predict_api import SenseiPredictor
+    return SenseiPredictor(artifacts_dir(), CONFIGS_DIR)
+
+
+@functools.lru_cache(maxsize=None)
+def xgb_model():
+    import joblib
+    return joblib.load(artifacts_dir() / 'xgb_onevsrest.joblib')
+
+
+@functools.lru_cache(maxsize=None)
+def tree_ensemble():
+    from src.tree_export import TreeEnsemble
+    return TreeEnsemble.load(artifacts_dir() / 'xgb_trees.npz')
+
+
+def feature_matrix(n: int) -> np.ndarray:
+    """Encoded features of n random profiles."""
+    return encoder().transform(profile_frame(n)).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def encoder():
+    return predictor().encoder
+
+
+def profile_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    """`n` random profiles in the schema FeatureEncoder expects."""
+    rng = np.random.default_rng(seed)
+    enc = encoder()
+    vocab = np.asarray(enc.skills_mlb.classes_)
+    desired = np.asarray(enc.desired_mlb.classes_)
+    counts = rng.integers(1, min(8, len(vocab)) + 1, size=n)
+    picks = rng.integers(0, len(vocab), size=counts.sum())
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    df = pd.DataFrame({
+        'skills': [vocab[picks[a:b]].tolist() for a, b in zip(bounds[:-1], bounds[1:])],
+        'desired_roles': [[desired[i]] if len(desired) else [] for i in rng.integers(0, max(len(desired), 1), size=n)],
+    })
+    for col, cats in zip(enc.categorical_cols, enc.cat_encoder.categories_):
+        df[col] = np.asarray(cats)[rng.integers(0, len(cats), size=n)]
+    for col in enc.numeric_cols:
+        df[col] = rng.integers(0, 6, size=n)
+    return df
+
+
+def payloads(n: int, seed: int = 0) -> list:
+    """`n` /predict request bodies."""
+    return [
+        {k: (v.item() if hasattr(v, 'item') else v) for k, v in row.items()}
+        for row in profile_frame(n, seed).to_dict(orient='records')
+    ]
+
+
+def label_matrix(n: int, labels: int = 20, positives: int = 1, seed: int = 0):
+    """(y_true, scores): `positives` true labels per row and noisy scores that favour them."""
+    rng = np.random.default_rng(seed)
+    y = np.zeros((n, labels), dtype=np.int64)
+    cols = rng.integers(0, labels, size=(n, positives))
+    y[np.arange(n)[:, None], cols] = 1
+    scores = rng.random((n, labels)) * 0.7 + y * rng.random((n, 1)) * 0.6
+    return y, scores
+
+
+def skills_column(n: int) -> pd.Series:
+    """The skills column of the bundled CSV, repeated to n raw strings."""
+    column = pd.read_csv(DATA_CSV, usecols=['skills'])['skills']
+    return pd.Series(np.resize(column.to_numpy(dtype=object), n), dtype=column.dtype)
+
+
+def texts(n: int) -> list:
+    return [SENTENCES[i % len(SENTENCES)] for i in range(n)]
+
+
+@functools.lru_cache(maxsize=None)
+def django_views():
+    """main.views with Django configured (no Ollama warm-up) and a role matcher loaded."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+    os.environ.setdefault('OLLAMA_WARMUP', '0')
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    import django
+    django.setup()
+    from main import views
+
+    if views.load_role_matcher() is None:
+        views._role_matcher_artifacts = _role_matcher()
+    return views
+
+
+def _role_matcher() -> dict:
+    """Same pipeline as scripts/train_role_model.py, trained on the bundled CSV."""
+    import joblib
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import LabelEncoder
+
+    path = CACHE_DIR / 'role_matcher.joblib'
+    if path.exists():
+        return joblib.load(path)
+    df = pd.read_csv(DATA_CSV).fillna('')
+    labeler = LabelEncoder()
+    y = labeler.fit_transform(df['role'])
+    pipeline = make_pipeline(
+        CountVectorizer(preprocessor=_clean_text, token_pattern=r"[a-zA-Z0-9_\+#\.]+"),
+        LogisticRegression(max_iter=400),
+    )
+    pipeline.fit(df['skills'], y)
+    artifacts = {'pipeline': pipeline, 'label_encoder': labeler}
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    joblib.dump(artifacts, path)
+    return artifacts
+
+
+def _clean_text(text: str) -> str:
+    return str(text).lower().replace(",", " ")
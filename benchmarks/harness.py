@@ -0,0 +1,133 @@
+"""Timing, memory measurement and result comparison for the benchmark suite.
+
+A case is registered with `@case(name, scales)` and is a setup function
+`setup(n) -> callable`: everything done in `setup` is untimed, the returned
+zero-argument callable is the measured work for `n` rows.
+
+Each (case, n) is timed with `time.perf_counter` over several repeats after a
+warm-up call, then run once more under `tracemalloc` to record the peak
+Python/NumPy allocation. Timing and tracing are kept apart because tracing
+slows allocation-heavy code severalfold.
+"""
+from __future__ import annotations
+
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CASES = {}
+
+
+def case(name: str, scales=(1,)):
+    """Register a benchmark setup function under `name` for the given row counts."""
+    def register(setup):
+        CASES[name] = {'setup': setup, 'scales': tuple(scales), 'doc': (setup.__doc__ or '').strip()}
+        return setup
+    return register
+
+
+def measure(fn, repeat: int = 5, min_time: float = 0.2, max_repeat: int = 50) -> dict:
+    """Time `fn`: at least `repeat` runs, more for fast calls until `min_time` is spent."""
+    fn()  # warm-up: imports, caches, lazy model loads
+    times = []
+    started = time.perf_counter()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(times) < repeat or (time.perf_counter() - started < min_time and len(times) < max_repeat):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        'repeats': len(times),
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'mean_s': statistics.fmean(times),
+        'stdev_s': statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def peak_memory(fn) -> dict:
+    """Peak and net bytes allocated during one call of `fn` (tracemalloc)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'peak_bytes': peak - before, 'retained_bytes': max(0, after - before)}
+
+
+def run_cases(pattern: str = '*', max_rows: int = 10_000, repeat: int = 5, log=print) -> dict:
+    results = {}
+    for name, spec in CASES.items():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        for n in spec['scales']:
+            if n > max_rows:
+                continue
+            key = f"{name}[{n}]"
+            fn = spec['setup'](n)
+            timing = measure(fn, repeat=repeat)
+            memory = peak_memory(fn)
+            results[key] = {'case': name, 'rows': n, **timing, **memory,
+                            'per_row_us': timing['median_s'] / n * 1e6}
+            log(f"{key:<45} median {timing['median_s'] * 1e3:10.3f} ms  "
+                f"({results[key]['per_row_us']:9.2f} us/row)  peak {memory['peak_bytes'] / 2**20:8.2f} MiB")
+            del fn
+            gc.collect()
+    return results
+
+
+def environment() -> dict:
+    import numpy
+    env = {'python': platform.python_version(), 'machine': platform.machine(),
+           'processor': platform.processor(), 'numpy': numpy.__version__}
+    try:
+        env['commit'] = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                                stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        env['commit'] = None
+    return env
+
+
+def save(results: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'environment': environment(), 'results': results}
+    path.write_text(json.dumps(doc, indent=2))
+
+
+def load(path: Path) -> dict:
+    return json.loads(Path(path).read_text())['results']
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10, mem_threshold: float = 0.25) -> list:
+    """Rows for every shared key; a row regresses when median time grows by more
+    than `threshold` or peak memory by more than `mem_threshold` (fractions)."""
+    rows = []
+    for key in sorted(set(baseline) & set(current)):
+        base, cur = baseline[key], current[key]
+        t_ratio = cur['median_s'] / base['median_s'] if base['median_s'] else float('inf')
+        m_ratio = (cur['peak_bytes'] / base['peak_bytes']) if base['peak_bytes'] else 1.0
+        rows.append({
+            'key': key,
+            'base_ms': base['median_s'] * 1e3,
+            'cur_ms': cur['median_s'] * 1e3,
+            'time_change': t_ratio - 1,
+            'mem_change': m_ratio - 1,
+            'regressed': t_ratio > 1 + threshold or m_ratio > 1 + mem_threshold,
+        })
+    return rows
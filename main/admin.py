@@ -1,6 +1,6 @@
 from django.contrib import admin
-from .models import (Post, Profile, Conversation, Message, Recommendation, 
-                     InterviewAttempt, Resume, CoverLetter)
+from .models import (Post, Profile, Conversation, Message, Recommendation, RecommendationItem,
+                     InterviewAttempt, Resume, CoverLetter, Job)
 
 
 @admin.register(Post)
@@ -57,12 +57,20 @@ class MessageAdmin(admin.ModelAdmin):
     full_text.short_description = "Full Text"
 
 
+class RecommendationItemInline(admin.TabularInline):
+    model = RecommendationItem
+    extra = 0
+    readonly_fields = ('rank', 'role', 'score')
+    can_delete = False
+
+
 @admin.register(Recommendation)
 class RecommendationAdmin(admin.ModelAdmin):
     list_display = ('profile', 'roles_display', 'created_at')
     list_filter = ('created_at', 'profile')
     search_fields = ('profile__name', 'recommended_roles')
     readonly_fields = ('created_at',)
+    inlines = [RecommendationItemInline]
     
     def roles_display(self, obj):
         roles = obj.get_roles()
@@ -182,4 +190,11 @@ class CoverLetterAdmin(admin.ModelAdmin):
     
     def full_body(self, obj):
         return obj.body
-    full_body.short_description = "Full Letter"
\ No newline at end of file
+    full_body.short_description = "Full Letter"
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status', 'created_at')
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
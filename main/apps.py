@@ -1,6 +1,24 @@
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _serves_requests() -> bool:
+    """False for one-off manage.py commands (migrate, test, shell, ...)."""
+    argv = sys.argv
+    if len(argv) > 1 and argv[0].endswith('manage.py'):
+        return argv[1] in ('runserver', 'run_jobs')
+    return True
 
 
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if getattr(settings, 'OLLAMA_WARMUP', False) and _serves_requests():
+            from .utils import ollama
+            ollama.start_warmer()
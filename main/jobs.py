@@ -0,0 +1,195 @@
+"""Lightweight database-backed job queue for slow LLM work.
+
+Views that call Ollama can enqueue a Job instead of blocking the request; the
+`run_jobs` management command runs a pool of worker threads that claim jobs
+from the table, execute the registered handler and store its JSON result.
+Failed attempts are retried with exponential backoff up to `max_attempts`.
+LLM concurrency is therefore bounded by the number of job workers rather than
+the number of web workers.
+
+Claiming uses a conditional UPDATE, so several worker processes can share the
+table safely. A job left in `running` by a crashed worker is picked up again
+once its lease (`LEASE_SECONDS`) expires. Handlers run under an LLM deadline
+(`DEADLINE_SECONDS`, kept below the lease) so a slow attempt gives up before
+another worker can claim the job, and the final write only lands while the
+worker still holds its claim.
+
+Configured through settings.JOBS.
+"""
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+from .utils import deadline
+from .utils.db import create_with_retry, retry_on_locked
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'WORKERS': 2,
+    'POLL_INTERVAL': 0.5,
+    'MAX_ATTEMPTS': 3,
+    'BACKOFF': 2.0,
+    'LEASE_SECONDS': 600,
+    # LLM budget per attempt; capped at 80% of the lease to leave time for saving
+    'DEADLINE_SECONDS': 480,
+}
+
+HANDLERS = {}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'JOBS', {})}
+
+
+def handler(kind: str):
+    """Register `fn(payload: dict) -> dict` as the handler for `kind`."""
+    def decorator(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+
+def enqueue(kind: str, payload: dict, max_attempts: int = None) -> Job:
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    return create_with_retry(
+        Job,
+        kind=kind,
+        payload=json.dumps(payload),
+        max_attempts=max_attempts or _config()['MAX_ATTEMPTS'],
+    )
+
+
+def job_state(job: Job) -> dict:
+    """Public JSON view of a job for the status endpoint."""
+    return {
+        'job_id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'attempts': job.attempts,
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.error or None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def claim_next():
+    """Atomically move the oldest runnable job to `running` and return it."""
+    now = timezone.now()
+    lease_expired = now - timedelta(seconds=_config()['LEASE_SECONDS'])
+    runnable = (
+        Q(status='pending', run_after__lte=now)
+        | Q(status='running', started_at__lt=lease_expired)
+    )
+    for job in Job.objects.filter(runnable).order_by('run_after', 'pk')[:5]:
+        claimed = retry_on_locked(
+            Job.objects.filter(pk=job.pk, status=job.status, started_at=job.started_at).update,
+            status='running', started_at=now, attempts=job.attempts + 1,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def execute(job: Job) -> None:
+    """Run a claimed job and record success, a scheduled retry, or failure.
+
+    The outcome is written only if the claim is still ours: when the lease ran
+    out and another worker re-claimed the job, its state is left alone.
+    """
+    cfg = _config()
+    try:
+        fn = HANDLERS[job.kind]
+        with deadline.deadline(min(cfg['DEADLINE_SECONDS'], cfg['LEASE_SECONDS'] * 0.8)):
+            result = fn(json.loads(job.payload))
+    except Exception as exc:
+        logger.warning(f"Job {job.pk} ({job.kind}) attempt {job.attempts} failed: {exc}")
+        job.error = str(exc)
+        if job.attempts >= job.max_attempts or job.kind not in HANDLERS:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+        else:
+            job.status = 'pending'
+            job.run_after = timezone.now() + timedelta(seconds=cfg['BACKOFF'] ** job.attempts)
+    else:
+        job.status = 'done'
+        job.result = json.dumps(result)
+        job.error = ''
+        job.finished_at = timezone.now()
+    fields = ('status', 'result', 'error', 'run_after', 'finished_at')
+    saved = retry_on_locked(
+        Job.objects.filter(pk=job.pk, status='running', started_at=job.started_at, attempts=job.attempts).update,
+        **{name: getattr(job, name) for name in fields},
+    )
+    if not saved:
+        logger.warning(f"Job {job.pk} ({job.kind}) attempt {job.attempts} lost its lease; outcome discarded")
+
+
+def run_once() -> bool:
+    """Claim and execute one job; returns False when nothing was runnable."""
+    job = claim_next()
+    if job is None:
+        return False
+    execute(job)
+    return True
+
+
+def work(stop: threading.Event, poll_interval: float = None, drain: bool = False) -> None:
+    """Worker loop; with drain=True it returns as soon as the queue is empty."""
+    poll_interval = poll_interval or _config()['POLL_INTERVAL']
+    try:
+        while not stop.is_set():
+            if not run_once():
+                if drain:
+                    break
+                stop.wait(poll_interval)
+    finally:
+        connection.close()
+
+
+# --- Handlers -------------------------------------------------------------
+# The generation logic lives in views.py; imports are deferred to avoid a
+# circular import (views enqueues jobs through this module).
+
+@handler('cover_letter')
+def _cover_letter(payload):
+    from .views import generate_cover_letter
+    return generate_cover_letter(payload['name'], payload['role'], payload.get('context', ''), raise_on_error=True)
+
+
+@handler('interview_mcqs')
+def _interview_mcqs(payload):
+    from .views import generate_interview
+    return generate_interview(payload['role'], int(payload.get('count', 5)))
+
+
+@handler('interview_grade')
+def _interview_grade(payload):
+    from .models import InterviewAttempt
+    from .views import grade_interview
+    ia = InterviewAttempt.objects.get(pk=payload['attempt_id'])
+    return grade_interview(ia, payload.get('answers', []), raise_on_error=True)
+
+
+@handler('cover_letter_upgrade')
+def _cover_letter_upgrade(payload):
+    from .views import upgrade_cover_letter
+    return upgrade_cover_letter(payload['cover_letter_id'], payload.get('context', ''))
+
+
+@handler('interview_grade_upgrade')
+def _interview_grade_upgrade(payload):
+    from .models import InterviewAttempt
+    from .views import grade_interview
+    ia = InterviewAttempt.objects.get(pk=payload['attempt_id'])
+    return grade_interview(ia, payload.get('answers', []), raise_on_error=True)
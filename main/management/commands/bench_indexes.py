@@ -0,0 +1,149 @@
+"""Benchmark the hot created_at queries with and without the model indexes.
+
+Seeds synthetic rows, then for each query prints the planner output and the
+median wall time twice: once with the indexes from migration 0003 dropped and
+once with them in place.
+
+    python manage.py bench_indexes --rows 1000000
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from main.models import Conversation, InterviewAttempt, Message, Resume
+from main.utils import stats
+
+
+ROLES = [
+    "Data Scientist", "Software Developer", "DevOps Engineer", "Product Manager",
+    "Cloud Engineer", "Data Analyst", "UX/UI Designer", "Business Analyst",
+]
+
+# Models whose Meta.indexes are exercised by the queries below
+INDEXED_MODELS = [Conversation, Message, InterviewAttempt, Resume]
+
+
+class Command(BaseCommand):
+    help = "Seed rows and compare query plans/timings with and without created_at indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000,
+                            help='Number of Message rows to seed (other tables get a fraction).')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query.')
+        parser.add_argument('--batch', type=int, default=5000, help='bulk_create batch size.')
+        parser.add_argument('--keep', action='store_true', help='Keep seeded rows afterwards.')
+
+    def handle(self, *args, **opts):
+        rows = opts['rows']
+        self.stdout.write(f"Seeding {rows} messages...")
+        seeded = self._seed(rows, opts['batch'])
+
+        conv_id = Conversation.objects.order_by('?').values_list('pk', flat=True).first()
+        queries = {
+            'recent_conversations': lambda: Conversation.objects.order_by('-created_at')[:10],
+            'latest_resume': lambda: Resume.objects.order_by('-created_at')[:1],
+            'conversation_messages': lambda: Message.objects.filter(conversation_id=conv_id).order_by('created_at'),
+            'interviews_by_role': lambda: InterviewAttempt.objects.filter(role=ROLES[0]).order_by('-created_at')[:10],
+        }
+
+        try:
+            self._drop_indexes()
+            before = self._run(queries, opts['repeat'], 'without indexes')
+            self._create_indexes()
+            after = self._run(queries, opts['repeat'], 'with indexes')
+        finally:
+            self._create_indexes()
+
+        self.stdout.write("\nSummary (median ms):")
+        for name in queries:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            self.stdout.write(f"  {name:24s} {before[name]:10.3f} -> {after[name]:10.3f}  ({speedup:.1f}x)")
+
+        if not opts['keep']:
+            self.stdout.write("Removing seeded rows...")
+            self._cleanup(seeded)
+        # bulk_create bypassed the counter signals
+        stats.recount()
+
+    def _seed(self, rows, batch):
+        n_convs = max(1, rows // 50)
+        n_side = max(1, rows // 10)
+        # Everything above these primary keys belongs to this run
+        floor = {model: model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+                 for model in INDEXED_MODELS}
+
+        with transaction.atomic():
+            Conversation.objects.bulk_create(
+                (Conversation(title=f"bench {i}") for i in range(n_convs)), batch_size=batch)
+            conv_ids = list(Conversation.objects.filter(pk__gt=floor[Conversation]).values_list('pk', flat=True))
+            Message.objects.bulk_create(
+                (Message(conversation_id=random.choice(conv_ids), role='user', text='bench')
+                 for _ in range(rows)), batch_size=batch)
+            InterviewAttempt.objects.bulk_create(
+                (InterviewAttempt(role=random.choice(ROLES), questions='[]') for _ in range(n_side)),
+                batch_size=batch)
+            Resume.objects.bulk_create(
+                (Resume(name='bench', data_json='{}') for _ in range(n_side)), batch_size=batch)
+
+        # auto_now_add ignores assigned values, so spread timestamps over a year
+        # afterwards; insert order then no longer matches time order.
+        year = 365 * 86400
+        now = timezone.now()
+        with transaction.atomic():
+            for model in INDEXED_MODELS:
+                qs = model.objects.filter(pk__gt=floor[model])
+                if connection.vendor == 'sqlite':
+                    with connection.cursor() as cur:
+                        cur.execute(
+                            f"UPDATE {model._meta.db_table} "
+                            f"SET created_at = datetime('now', '-' || abs(random() %% {year}) || ' seconds') "
+                            f"WHERE id > %s", [floor[model]])
+                else:
+                    for pk in qs.values_list('pk', flat=True).iterator():
+                        qs.filter(pk=pk).update(created_at=now - timedelta(seconds=random.randint(0, year)))
+        return floor
+
+    def _cleanup(self, floor):
+        with transaction.atomic():
+            for model in [Message, Conversation, InterviewAttempt, Resume]:
+                model.objects.filter(pk__gt=floor[model]).delete()
+
+    def _drop_indexes(self):
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    editor.execute(f"DROP INDEX IF EXISTS {editor.quote_name(index.name)}")
+
+    def _create_indexes(self):
+        with connection.schema_editor() as editor:
+            existing = connection.introspection.get_constraints
+            for model in INDEXED_MODELS:
+                with connection.cursor() as cur:
+                    present = existing(cur, model._meta.db_table)
+                for index in model._meta.indexes:
+                    if index.name not in present:
+                        editor.add_index(model, index)
+        with connection.cursor() as cur:
+            if connection.vendor == 'sqlite':
+                cur.execute("ANALYZE")
+
+    def _run(self, queries, repeat, label):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label} =="))
+        results = {}
+        for name, make_qs in queries.items():
+            self.stdout.write(f"[{name}]")
+            for line in make_qs().explain().splitlines():
+                self.stdout.write(f"    {line}")
+            timings = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                list(make_qs())
+                timings.append((time.perf_counter() - t0) * 1000)
+            results[name] = statistics.median(timings)
+            self.stdout.write(f"    median {results[name]:.3f} ms over {repeat} runs")
+        return results
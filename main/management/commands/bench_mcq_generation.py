@@ -0,0 +1,37 @@
+"""Compare single-shot and sharded MCQ generation wall-clock time.
+
+Talks to the Ollama configured in settings (point OLLAMA_URL at a stand-in
+server for reproducible numbers).
+
+    python manage.py bench_mcq_generation --counts 5 10 20 --repeat 3
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from main import views
+
+
+class Command(BaseCommand):
+    help = "Time interview MCQ generation single-shot vs sharded for several counts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--role', default='Data Scientist')
+        parser.add_argument('--counts', type=int, nargs='+', default=[5, 10, 20])
+        parser.add_argument('--repeat', type=int, default=1)
+        parser.add_argument('--shard-size', type=int, default=None)
+
+    def handle(self, *args, **opts):
+        self.stdout.write(f"{'count':>5}  {'mode':8}  {'median s':>9}  {'generated':>9}  {'fallback':>8}  {'failed':>6}")
+        for count in opts['counts']:
+            for mode, shard_size in (('single', count), ('sharded', opts['shard_size'])):
+                times, info = [], {}
+                for _ in range(opts['repeat']):
+                    t0 = time.perf_counter()
+                    _, info = views.generate_mcqs(opts['role'], count, shard_size=shard_size)
+                    times.append(time.perf_counter() - t0)
+                self.stdout.write(
+                    f"{count:>5}  {mode:8}  {statistics.median(times):>9.2f}  {info['generated']:>9}  "
+                    f"{info['fallback']:>8}  {info['failed_shards']:>3}/{info['shards']}"
+                )
@@ -0,0 +1,131 @@
+"""Concurrent-writer benchmark for the SQLite tuning in settings.SQLITE_PRAGMAS.
+
+Runs the same workload twice against throwaway database files: once with
+SQLite's defaults (rollback journal, synchronous=FULL, deferred transactions)
+and once with the project's pragmas. Each writer thread performs one
+single-row INSERT per transaction, which mirrors the autocommit `create()`
+calls in the views, while reader threads keep issuing the home-page style
+COUNT/ORDER BY queries.
+
+    python manage.py bench_sqlite_writers --writers 8 --inserts 500
+"""
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+SCHEMA = """
+CREATE TABLE message (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id INTEGER NOT NULL,
+    role VARCHAR(10) NOT NULL,
+    text TEXT NOT NULL,
+    created_at DATETIME NOT NULL
+);
+CREATE INDEX message_conv_created_idx ON message (conversation_id, created_at);
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure concurrent SQLite write throughput with default vs tuned pragmas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--readers', type=int, default=2)
+        parser.add_argument('--inserts', type=int, default=500, help='INSERTs per writer thread.')
+        parser.add_argument('--timeout', type=float, default=5.0,
+                            help='Busy timeout (s) for the default profile, matching Django\'s default.')
+
+    def handle(self, *args, **opts):
+        profiles = {
+            'default': {'pragmas': [], 'isolation': 'DEFERRED', 'timeout': opts['timeout']},
+            'tuned': {
+                'pragmas': settings.SQLITE_PRAGMAS,
+                'isolation': 'IMMEDIATE',
+                'timeout': settings.DATABASES['default'].get('OPTIONS', {}).get('timeout', 20),
+            },
+        }
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, profile in profiles.items():
+                results[name] = self._run(Path(tmp) / f"{name}.sqlite3", profile, opts)
+                r = results[name]
+                self.stdout.write(
+                    f"{name:8s} {r['ok']:6d} inserts in {r['seconds']:.2f}s "
+                    f"= {r['ok'] / r['seconds']:8.1f}/s, {r['locked']} locked errors, "
+                    f"{r['reads']} reads"
+                )
+
+        base = results['default']['ok'] / results['default']['seconds']
+        tuned = results['tuned']['ok'] / results['tuned']['seconds']
+        self.stdout.write(self.style.SUCCESS(f"Throughput gain: {tuned / base:.2f}x"))
+
+    def _connect(self, path, profile):
+        conn = sqlite3.connect(path, timeout=profile['timeout'], isolation_level=None,
+                               check_same_thread=False)
+        for pragma in profile['pragmas']:
+            conn.execute(pragma)
+        return conn
+
+    def _run(self, path, profile, opts):
+        setup = self._connect(path, profile)
+        setup.executescript(SCHEMA)
+        setup.close()
+
+        counts = {'ok': 0, 'locked': 0, 'reads': 0}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def writer(worker_id):
+            conn = self._connect(path, profile)
+            ok = locked = 0
+            for i in range(opts['inserts']):
+                try:
+                    conn.execute(f"BEGIN {profile['isolation']}")
+                    conn.execute(
+                        "INSERT INTO message (conversation_id, role, text, created_at) "
+                        "VALUES (?, 'user', ?, datetime('now'))",
+                        (worker_id, f"message {i}"))
+                    conn.execute("COMMIT")
+                    ok += 1
+                except sqlite3.OperationalError:
+                    locked += 1
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+            conn.close()
+            with lock:
+                counts['ok'] += ok
+                counts['locked'] += locked
+
+        def reader():
+            conn = self._connect(path, profile)
+            reads = 0
+            while not stop.is_set():
+                try:
+                    conn.execute("SELECT COUNT(*) FROM message").fetchone()
+                    conn.execute("SELECT id FROM message WHERE conversation_id = 0 "
+                                 "ORDER BY created_at DESC LIMIT 10").fetchall()
+                    reads += 1
+                except sqlite3.OperationalError:
+                    pass
+            conn.close()
+            with lock:
+                counts['reads'] += reads
+
+        writers = [threading.Thread(target=writer, args=(i,)) for i in range(opts['writers'])]
+        readers = [threading.Thread(target=reader) for _ in range(opts['readers'])]
+        t0 = time.perf_counter()
+        for t in readers + writers:
+            t.start()
+        for t in writers:
+            t.join()
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        for t in readers:
+            t.join()
+        return {**counts, 'seconds': elapsed}
@@ -0,0 +1,60 @@
+"""Serve the local Ollama stand-in (main/utils/fake_ollama.py).
+
+    python manage.py fake_ollama
+    python manage.py fake_ollama --latency lognormal:800:0.7 --error-rate 0.05
+    python manage.py fake_ollama --latency fixed:0 --responses canned.json
+
+Defaults come from settings.OLLAMA_FAKE; run the app with OLLAMA_FAKE=1 to
+point OLLAMA_URL at it.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.utils.fake_ollama import FakeOllamaServer
+
+
+def parse_latency(spec: str) -> dict:
+    """'fixed:MS', 'uniform:MIN:MAX' or 'lognormal:MEDIAN[:SIGMA]' -> latency dict."""
+    dist, *args = spec.split(':')
+    try:
+        nums = [float(a) for a in args]
+        if dist == 'fixed':
+            return {'dist': 'fixed', 'ms': nums[0]}
+        if dist == 'uniform':
+            return {'dist': 'uniform', 'min_ms': nums[0], 'max_ms': nums[1]}
+        if dist == 'lognormal':
+            return {'dist': 'lognormal', 'median_ms': nums[0], 'sigma': nums[1] if len(nums) > 1 else 0.5}
+    except (IndexError, ValueError):
+        pass
+    raise CommandError(f"Bad --latency '{spec}'; use fixed:MS, uniform:MIN:MAX or lognormal:MEDIAN[:SIGMA]")
+
+
+class Command(BaseCommand):
+    help = "Run an offline stand-in for the Ollama /api/generate endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default=None)
+        parser.add_argument('--port', type=int, default=None)
+        parser.add_argument('--latency', default=None, help='Latency distribution, e.g. lognormal:300:0.5 (ms).')
+        parser.add_argument('--error-rate', type=float, default=None, help='Fraction of calls answered with HTTP 500.')
+        parser.add_argument('--responses', default=None, help='JSON file of canned {"match", "response"} rules.')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **opts):
+        cfg = getattr(settings, 'OLLAMA_FAKE', {})
+        server = FakeOllamaServer(
+            host=opts['host'] or cfg.get('HOST', '127.0.0.1'),
+            port=opts['port'] or cfg.get('PORT', 11435),
+            model=getattr(settings, 'OLLAMA_MODEL', 'mistral'),
+            latency=parse_latency(opts['latency']) if opts['latency'] else cfg.get('LATENCY'),
+            error_rate=opts['error_rate'] if opts['error_rate'] is not None else cfg.get('ERROR_RATE', 0.0),
+            rules=opts['responses'] or cfg.get('RESPONSES'),
+            seed=opts['seed'] if opts['seed'] is not None else cfg.get('SEED'),
+        )
+        self.stdout.write(f"Ollama stand-in on {server.url} (latency={server.latency}, "
+                          f"error_rate={server.error_rate}, rules={len(server.rules)}); Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"Served {server.counts}")
@@ -0,0 +1,36 @@
+"""Preload the Ollama model before traffic arrives.
+
+    python manage.py ollama_warmup            # load once, exit 1 on failure
+    python manage.py ollama_warmup --serve    # keep refreshing keep_alive
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.utils import ollama
+
+
+class Command(BaseCommand):
+    help = "Load OLLAMA_MODEL into memory with keep_alive and verify it is resident."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--timeout', type=float, default=None, help='Warm-up request timeout (s).')
+        parser.add_argument('--serve', action='store_true', help='Keep refreshing keep_alive until interrupted.')
+
+    def handle(self, *args, **opts):
+        model = ollama.model_name()
+        self.stdout.write(f"Warming up '{model}' at {ollama.base_url()} (keep_alive={ollama.keep_alive()})...")
+        t0 = time.perf_counter()
+        if not ollama.warm_up(opts['timeout']):
+            raise CommandError(f"Warm-up failed: {ollama.status()['last_error']}")
+        self.stdout.write(f"Loaded in {time.perf_counter() - t0:.1f}s; resident: {ollama.is_loaded()}")
+
+        if opts['serve']:
+            ollama.start_warmer()
+            self.stdout.write("Refreshing keep_alive; Ctrl+C to stop.")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+        self.stdout.write(self.style.SUCCESS("Model ready."))
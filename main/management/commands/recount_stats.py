@@ -0,0 +1,21 @@
+"""Recompute the home-page StatCounter rows from exact COUNT(*) queries.
+
+Run after bulk imports or deletes that bypass model signals, or periodically
+(e.g. from cron) as a reconciliation step.
+"""
+from django.core.management.base import BaseCommand
+
+from main.utils import stats
+
+
+class Command(BaseCommand):
+    help = "Recompute home-page statistics counters exactly."
+
+    def handle(self, *args, **opts):
+        before = stats.get_stats()
+        after = stats.recount()
+        for name, value in after.items():
+            drift = value - before.get(name, 0)
+            note = f" (drift {drift:+d})" if drift else ""
+            self.stdout.write(f"{name:14s} {value}{note}")
+        self.stdout.write(self.style.SUCCESS("Counters reconciled."))
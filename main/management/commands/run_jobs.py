@@ -0,0 +1,45 @@
+"""Run background job workers.
+
+    python manage.py run_jobs --workers 4
+    python manage.py run_jobs --drain     # process what is queued, then exit
+"""
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main import jobs
+
+
+class Command(BaseCommand):
+    help = "Process queued LLM jobs (cover letters, interview MCQs and grading)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Worker threads (default: settings.JOBS["WORKERS"]).')
+        parser.add_argument('--poll', type=float, default=None, help='Idle poll interval in seconds.')
+        parser.add_argument('--drain', action='store_true', help='Exit once the queue is empty.')
+
+    def handle(self, *args, **opts):
+        workers = opts['workers'] or getattr(settings, 'JOBS', {}).get('WORKERS', jobs.DEFAULTS['WORKERS'])
+        stop = threading.Event()
+
+        def shutdown(signum, frame):
+            self.stdout.write("Stopping workers after their current job...")
+            stop.set()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        threads = [
+            threading.Thread(target=jobs.work, args=(stop, opts['poll'], opts['drain']), name=f'job-worker-{i}')
+            for i in range(workers)
+        ]
+        self.stdout.write(f"Starting {workers} job workers ({', '.join(sorted(jobs.HANDLERS))})")
+        for t in threads:
+            t.start()
+        for t in threads:
+            while t.is_alive():
+                t.join(timeout=0.5)
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_conversation_coverletter_interviewattempt_profile_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['-created_at'], name='conversation_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewattempt',
+            index=models.Index(fields=['role', 'created_at'], name='interview_role_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewattempt',
+            index=models.Index(fields=['-created_at'], name='interview_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'created_at'], name='message_conv_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(fields=['profile', 'created_at'], name='rec_profile_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['-created_at'], name='resume_created_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_items(apps, schema_editor):
+    # Legacy rows only kept the comma-joined role names; their scores are unknown.
+    Recommendation = apps.get_model('main', 'Recommendation')
+    RecommendationItem = apps.get_model('main', 'RecommendationItem')
+    batch = []
+    for rec_id, roles in Recommendation.objects.values_list('pk', 'recommended_roles').iterator():
+        for rank, role in enumerate([r.strip() for r in roles.split(',') if r.strip()], start=1):
+            batch.append(RecommendationItem(recommendation_id=rec_id, role=role, rank=rank))
+        if len(batch) >= 5000:
+            RecommendationItem.objects.bulk_create(batch)
+            batch = []
+    RecommendationItem.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(max_length=120)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['recommendation', 'rank'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(fields=['created_at'], name='rec_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='recommendationitem',
+            name='recommendation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='main.recommendation'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendationitem',
+            index=models.Index(fields=['role', 'score'], name='recitem_role_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recommendationitem',
+            index=models.Index(fields=['recommendation', 'rank'], name='recitem_rec_rank_idx'),
+        ),
+        migrations.RunPython(backfill_items, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:01
+
+from django.db import migrations, models
+
+
+def seed_counters(apps, schema_editor):
+    StatCounter = apps.get_model('main', 'StatCounter')
+    for name, model_name in [('conversations', 'Conversation'), ('profiles', 'Profile'),
+                             ('interviews', 'InterviewAttempt'), ('resumes', 'Resume')]:
+        count = apps.get_model('main', model_name).objects.count()
+        StatCounter.objects.update_or_create(name=name, defaults={'value': count})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_recommendation_items'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
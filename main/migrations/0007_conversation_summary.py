@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='summary',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='summary_message_id',
+            field=models.BigIntegerField(default=0, help_text='Last message folded into summary'),
+        ),
+    ]
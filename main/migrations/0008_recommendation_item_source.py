@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_conversation_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationitem',
+            name='source',
+            field=models.CharField(blank=True, choices=[('predictor', 'predictor'), ('role_matcher', 'role_matcher'), ('rules', 'rules')], help_text='Scorer that produced `score`; blank for legacy rows', max_length=20),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+import main.models
+
+
+def fill_tokens(apps, schema_editor):
+    # Every existing job needs its own token before the unique constraint goes on
+    Job = apps.get_model('main', 'Job')
+    for job in Job.objects.filter(token__isnull=True).only('pk').iterator():
+        Job.objects.filter(pk=job.pk).update(token=main.models.new_job_token())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_recommendation_item_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='token',
+            field=models.CharField(editable=False, max_length=40, null=True),
+        ),
+        migrations.RunPython(fill_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='job',
+            name='token',
+            field=models.CharField(default=main.models.new_job_token, editable=False, max_length=40, unique=True),
+        ),
+    ]
@@ -1,4 +1,7 @@
+import secrets
+
 from django.db import models
+from django.utils import timezone
 
 
 class Post(models.Model):
@@ -25,6 +28,14 @@ class Conversation(models.Model):
 	"""Stores a chat conversation (lightweight)."""
 	title = models.CharField(max_length=200, blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
+	# Rolling summary of turns older than the prompt window (main/utils/chat_context.py)
+	summary = models.TextField(blank=True)
+	summary_message_id = models.BigIntegerField(default=0, help_text='Last message folded into summary')
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['-created_at'], name='conversation_created_idx'),
+		]
 
 	def __str__(self):
 		return self.title or f"Conversation {self.pk}"
@@ -36,6 +47,12 @@ class Message(models.Model):
 	text = models.TextField()
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			# Serves conversation.messages.order_by('created_at') without a sort step
+			models.Index(fields=['conversation', 'created_at'], name='message_conv_created_idx'),
+		]
+
 	def __str__(self):
 		return f"{self.role}: {self.text[:40]}"
 
@@ -45,10 +62,41 @@ class Recommendation(models.Model):
 	recommended_roles = models.TextField(help_text='Comma separated roles')
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['profile', 'created_at'], name='rec_profile_created_idx'),
+			models.Index(fields=['created_at'], name='rec_created_idx'),
+		]
+
 	def get_roles(self):
 		return [r.strip() for r in self.recommended_roles.split(',') if r.strip()]
 
 
+class RecommendationItem(models.Model):
+	"""One ranked role of a Recommendation, kept alongside `recommended_roles` for SQL analytics."""
+	# Scores from different scorers are on different scales and are never pooled
+	SOURCE_CHOICES = (
+		('predictor', 'predictor'),
+		('role_matcher', 'role_matcher'),
+		('rules', 'rules'),
+	)
+	recommendation = models.ForeignKey(Recommendation, on_delete=models.CASCADE, related_name='items')
+	role = models.CharField(max_length=120)
+	rank = models.PositiveSmallIntegerField()
+	score = models.FloatField(null=True, blank=True)
+	source = models.CharField(max_length=20, choices=SOURCE_CHOICES, blank=True, help_text='Scorer that produced `score`; blank for legacy rows')
+
+	class Meta:
+		ordering = ['recommendation', 'rank']
+		indexes = [
+			models.Index(fields=['role', 'score'], name='recitem_role_score_idx'),
+			models.Index(fields=['recommendation', 'rank'], name='recitem_rec_rank_idx'),
+		]
+
+	def __str__(self):
+		return f"{self.rank}. {self.role} ({self.score})"
+
+
 class InterviewAttempt(models.Model):
 	role = models.CharField(max_length=120)
 	questions = models.TextField(help_text='JSON list string of questions')
@@ -56,6 +104,12 @@ class InterviewAttempt(models.Model):
 	score = models.FloatField(null=True, blank=True)
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			models.Index(fields=['role', 'created_at'], name='interview_role_created_idx'),
+			models.Index(fields=['-created_at'], name='interview_created_idx'),
+		]
+
 	def __str__(self):
 		return f"Interview {self.role} ({self.pk})"
 
@@ -65,6 +119,12 @@ class Resume(models.Model):
 	data_json = models.TextField(help_text='JSON string of resume data')
 	created_at = models.DateTimeField(auto_now_add=True)
 
+	class Meta:
+		indexes = [
+			# resume_download() reads order_by('-created_at').first()
+			models.Index(fields=['-created_at'], name='resume_created_idx'),
+		]
+
 	def __str__(self):
 		return f"Resume {self.name} ({self.pk})"
 
@@ -77,3 +137,56 @@ class CoverLetter(models.Model):
 
 	def __str__(self):
 		return f"CoverLetter {self.name} for {self.role} ({self.pk})"
+
+
+class StatCounter(models.Model):
+	"""Denormalized row count for the home-page statistics.
+
+	Kept up to date by the signal handlers in main/signals.py; the
+	`recount_stats` management command recomputes the values exactly.
+	"""
+	name = models.CharField(max_length=50, primary_key=True)
+	value = models.BigIntegerField(default=0)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	def __str__(self):
+		return f"{self.name}={self.value}"
+
+
+def new_job_token():
+	return secrets.token_urlsafe(24)
+
+
+class Job(models.Model):
+	"""Background task for a slow LLM call, processed by `manage.py run_jobs`.
+
+	The status URL is keyed by the random `token`, not the sequential pk, so
+	results (cover letters, grades) are only readable by whoever got the URL.
+	"""
+	STATUS_CHOICES = (
+		('pending', 'pending'),
+		('running', 'running'),
+		('done', 'done'),
+		('failed', 'failed'),
+	)
+	kind = models.CharField(max_length=50)
+	token = models.CharField(max_length=40, unique=True, default=new_job_token, editable=False)
+	status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+	payload = models.TextField(help_text='JSON string of handler arguments')
+	result = models.TextField(blank=True, help_text='JSON string of the handler result')
+	error = models.TextField(blank=True)
+	attempts = models.PositiveSmallIntegerField(default=0)
+	max_attempts = models.PositiveSmallIntegerField(default=3)
+	run_after = models.DateTimeField(default=timezone.now)
+	created_at = models.DateTimeField(auto_now_add=True)
+	started_at = models.DateTimeField(null=True, blank=True)
+	finished_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		indexes = [
+			# Workers poll for the oldest runnable job
+			models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+		]
+
+	def __str__(self):
+		return f"Job {self.kind} ({self.pk}) {self.status}"
@@ -0,0 +1,40 @@
+"""Signal handlers keeping StatCounter in step with the counted tables.
+
+The counter UPDATE runs in `transaction.on_commit`, after the row it counts is
+committed, and its errors are logged rather than raised. A locked or failing
+counter therefore never fails the save: `create_with_retry` cannot replay an
+INSERT that already went through, and a delete is never rolled back over a
+counter. A missed adjustment only drifts the home-page figure until the next
+`recount_stats`.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .utils import stats
+from .utils.db import retry_on_locked
+
+logger = logging.getLogger(__name__)
+
+
+def _adjust(name, delta):
+    try:
+        retry_on_locked(stats.increment, name, delta)
+    except Exception as exc:
+        logger.warning(f"Could not adjust the {name} counter by {delta}: {exc}")
+
+
+@receiver(post_save, dispatch_uid='main.stats.post_save')
+def count_created(sender, instance, created, raw=False, **kwargs):
+    name = stats.counter_name(sender)
+    if name and created and not raw:
+        transaction.on_commit(lambda: _adjust(name, 1))
+
+
+@receiver(post_delete, dispatch_uid='main.stats.post_delete')
+def count_deleted(sender, instance, **kwargs):
+    name = stats.counter_name(sender)
+    if name:
+        transaction.on_commit(lambda: _adjust(name, -1))
@@ -1,10 +1,39 @@
-from django.test import TestCase, Client
+from django.test import SimpleTestCase, TestCase, Client, override_settings
 from django.urls import reverse
-from .models import InterviewAttempt, Resume
+from django.utils import timezone
+from django.db import OperationalError
+from unittest import mock
+from .models import InterviewAttempt, Resume, Profile, Recommendation, RecommendationItem, StatCounter
+from .utils import stats
+from . import jobs
+from .models import Job, CoverLetter, Conversation, Message
+from .utils import chat_context, deadline, ollama
+from .utils.singleflight import SingleFlight, SingleFlightTimeout
+from .utils.fake_ollama import FakeOllamaServer
+import threading
+import time
+from .utils.db import create_with_retry, retry_on_locked
+from .utils.write_behind import WriteBehindBuffer
 import json
 
 
+TEST_CACHES = {
+	'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+	'resume_pdf': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'resume-pdf-tests'},
+}
+
+
 class InterviewTests(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# Talk to the local stand-in instead of a real (or missing) Ollama
+		server = FakeOllamaServer(latency={'dist': 'fixed', 'ms': 0}, seed=0).start()
+		cls.addClassCleanup(server.stop)
+		override = override_settings(OLLAMA_URL=server.url)
+		override.enable()
+		cls.addClassCleanup(override.disable)
+
 	def setUp(self):
 		self.client = Client()
 
@@ -13,11 +42,19 @@ class InterviewTests(TestCase):
 		res = self.client.post(reverse('interview_api'), json.dumps({'role': 'Data Scientist', 'count': 3}), content_type='application/json')
 		self.assertEqual(res.status_code, 200)
 		data = res.json()
-		self.assertIn('questions', data)
+		self.assertIn('mcqs', data)
 		self.assertIn('attempt_id', data)
 
 		attempt_id = data['attempt_id']
-		questions = data['questions']
+		questions = data['mcqs']
+		# All three come from the stand-in server, none from the fallback bank
+		self.assertEqual(len(questions), 3)
+		self.assertEqual(data['generation']['fallback'], 0)
+		for q in questions:
+			self.assertIn('Data Scientist', q['question'])
+			self.assertEqual(len(q['options']), 4)
+			self.assertIn(q['answer_index'], range(4))
+		self.assertEqual(json.loads(InterviewAttempt.objects.get(pk=attempt_id).questions), questions)
 		# Submit dummy answers
 		answers = ['Answer one', 'Short', 'Another answer']
 		sub = self.client.post(reverse('interview_submit_api'), json.dumps({'attempt_id': attempt_id, 'answers': answers}), content_type='application/json')
@@ -31,6 +68,7 @@ class InterviewTests(TestCase):
 		self.assertIn('overall_score', result)
 
 
+@override_settings(CACHES=TEST_CACHES)
 class ResumeTests(TestCase):
 	def setUp(self):
 		self.client = Client()
@@ -52,6 +90,26 @@ class ResumeTests(TestCase):
 		self.assertEqual(dl.status_code, 200)
 		self.assertEqual(dl['Content-Type'], 'application/json')
 
+	def test_resume_pdf_is_rendered_once(self):
+		Resume.objects.create(name='Cached', data_json=json.dumps({'summary': 'S'}))
+		with mock.patch('main.utils.resume_pdf.render_resume_pdf', return_value=b'%PDF-stub') as render:
+			first = self.client.get(reverse('resume_download') + '?pdf=1')
+			second = self.client.get(reverse('resume_download') + '?pdf=1')
+		self.assertEqual(render.call_count, 1)
+		self.assertEqual(first.content, second.content)
+
+	@override_settings(RESUME_EXPORT_WORKERS=0)
+	def test_bulk_export_streams_zip(self):
+		import io, zipfile
+		from django.contrib.auth.models import User
+		ids = [Resume.objects.create(name=f'User {i}', data_json=json.dumps({'skills': 'Python'})).pk for i in range(3)]
+		self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+		res = self.client.get(reverse('resume_export'), {'ids': ','.join(map(str, ids[:2]))})
+		self.assertEqual(res.status_code, 200)
+		zf = zipfile.ZipFile(io.BytesIO(b''.join(res.streaming_content)))
+		self.assertEqual(len(zf.namelist()), 2)
+		self.assertTrue(all(zf.read(n).startswith(b'%PDF') for n in zf.namelist()))
+
 	def test_resume_pdf_download(self):
 		# Create resume directly
 		r = Resume.objects.create(name='PDF User', data_json=json.dumps({'summary':'X','experiences':'Y','education':'Z','skills':'K'}))
@@ -59,3 +117,614 @@ class ResumeTests(TestCase):
 		self.assertEqual(dl.status_code, 200)
 		self.assertEqual(dl['Content-Type'], 'application/pdf')
 
+
+class DatabaseRetryTests(TestCase):
+	def test_retries_lock_errors_outside_transactions(self):
+		fn = mock.Mock(side_effect=[OperationalError('database is locked'), 'ok'])
+		with mock.patch('main.utils.db.connection') as conn, mock.patch('main.utils.db.time.sleep'):
+			conn.in_atomic_block = False
+			self.assertEqual(retry_on_locked(fn, backoff=0), 'ok')
+		self.assertEqual(fn.call_count, 2)
+
+	def test_other_errors_are_not_retried(self):
+		fn = mock.Mock(side_effect=OperationalError('no such table'))
+		with self.assertRaises(OperationalError):
+			retry_on_locked(fn)
+		self.assertEqual(fn.call_count, 1)
+
+
+class WriteBehindTests(TestCase):
+	def test_buffer_bulk_writes_profiles_with_recommendations(self):
+		buf = WriteBehindBuffer(max_batch=2, flush_interval=3600, max_pending=10, background=False)
+		for i in range(3):
+			profile = Profile(name=f'User {i}')
+			buf.submit(profile, [Recommendation(profile=profile, recommended_roles='Data Scientist,Data Analyst')])
+		self.assertEqual(Profile.objects.count(), 0)
+		self.assertEqual(buf.flush(), 3)
+		buf.close()
+		self.assertEqual(Profile.objects.count(), 3)
+		self.assertEqual(Recommendation.objects.filter(profile__name='User 2').count(), 1)
+
+	def test_full_queue_writes_inline(self):
+		buf = WriteBehindBuffer(max_batch=10, flush_interval=3600, max_pending=1, background=False)
+		buf.submit(Profile(name='queued'))
+		buf.submit(Profile(name='inline'))
+		self.assertTrue(Profile.objects.filter(name='inline').exists())
+		buf.close()
+		self.assertTrue(Profile.objects.filter(name='queued').exists())
+
+	def test_locked_batch_is_requeued_not_dropped(self):
+		buf = WriteBehindBuffer(max_batch=10, flush_interval=3600, max_pending=10, background=False)
+		profile = Profile(name='kept')
+		buf.submit(profile, [Recommendation(profile=profile, recommended_roles='Data Scientist')])
+		with mock.patch('main.utils.write_behind.retry_on_locked', side_effect=OperationalError('database is locked')):
+			self.assertEqual(buf.flush(), 0)
+		self.assertEqual((buf.pending(), buf.requeued, buf.dropped), (1, 1, 0))
+		self.assertEqual(buf.flush(), 1)
+		buf.close()
+		self.assertEqual(Recommendation.objects.filter(profile__name='kept').count(), 1)
+
+	@override_settings(WRITE_BEHIND={'ENABLED': False})
+	def test_recommend_api_persists_recommendation(self):
+		res = self.client.post(reverse('recommend_api'), json.dumps({'name': 'Ada', 'skills': 'python, sql'}), content_type='application/json')
+		self.assertEqual(res.status_code, 200)
+		rec = Recommendation.objects.get(profile__name='Ada')
+		self.assertEqual(rec.get_roles(), [r['role'] for r in res.json()['recommendations']])
+		self.assertEqual(list(rec.items.values_list('role', flat=True)), rec.get_roles())
+		# No role matcher model in the test tree, so the rules scored this one
+		self.assertEqual(set(rec.items.values_list('source', flat=True)), {'rules'})
+
+
+class RecommendationAnalyticsTests(TestCase):
+	def setUp(self):
+		profile = Profile.objects.create(name='Stats')
+		for scores in ([0.6, 0.3], [0.8, 0.1], [0.4, 0.2]):
+			rec = Recommendation.objects.create(profile=profile, recommended_roles='Data Scientist,Data Analyst')
+			RecommendationItem.objects.create(recommendation=rec, role='Data Scientist', rank=1, score=scores[0], source='rules')
+			RecommendationItem.objects.create(recommendation=rec, role='Data Analyst', rank=2, score=scores[1], source='rules')
+
+	def test_role_frequency(self):
+		res = self.client.get(reverse('recommendation_role_stats_api'), {'days': 7})
+		self.assertEqual(res.status_code, 200)
+		roles = {r['role']: r for r in res.json()['roles']}
+		self.assertEqual(roles['Data Scientist']['count'], 3)
+		self.assertEqual(roles['Data Scientist']['top1'], 3)
+		self.assertEqual(roles['Data Analyst']['top1'], 0)
+
+	def test_score_percentiles(self):
+		res = self.client.get(reverse('recommendation_score_stats_api'), {'role': 'Data Scientist'})
+		self.assertEqual(res.status_code, 200)
+		series = res.json()['series']
+		self.assertEqual(len(series), 1)
+		self.assertEqual(series[0]['count'], 3)
+		self.assertAlmostEqual(series[0]['p50'], 0.6)
+		self.assertAlmostEqual(series[0]['p99'], 0.8)
+
+	def test_score_percentiles_are_not_pooled_across_sources(self):
+		rec = Recommendation.objects.create(profile=Profile.objects.get(), recommended_roles='Data Scientist')
+		RecommendationItem.objects.create(recommendation=rec, role='Data Scientist', rank=1, score=0.05, source='role_matcher')
+		series = self.client.get(reverse('recommendation_score_stats_api'), {'role': 'Data Scientist'}).json()['series']
+		by_source = {s['source']: s for s in series}
+		self.assertEqual(by_source['rules']['count'], 3)
+		self.assertAlmostEqual(by_source['rules']['p50'], 0.6)
+		self.assertEqual(by_source['role_matcher']['count'], 1)
+		only = self.client.get(reverse('recommendation_score_stats_api'), {'role': 'Data Scientist', 'source': 'role_matcher'}).json()['series']
+		self.assertEqual([s['source'] for s in only], ['role_matcher'])
+		self.assertEqual(self.client.get(reverse('recommendation_score_stats_api'), {'source': 'mixed'}).status_code, 400)
+
+
+class HomeStatsTests(TestCase):
+	def test_counters_follow_saves_and_deletes(self):
+		stats.recount()
+		# Counters are adjusted once the row is committed
+		with self.captureOnCommitCallbacks(execute=True):
+			Resume.objects.create(name='A', data_json='{}')
+			r = Resume.objects.create(name='B', data_json='{}')
+		self.assertEqual(stats.get_stats()['resumes'], 2)
+		with self.captureOnCommitCallbacks(execute=True):
+			r.delete()
+		self.assertEqual(stats.get_stats()['resumes'], 1)
+
+	def test_locked_counter_does_not_fail_or_repeat_the_insert(self):
+		stats.recount()
+		locked = OperationalError('database is locked')
+		with mock.patch('main.utils.stats.increment', side_effect=locked) as increment, \
+				mock.patch('main.utils.db.time.sleep'):
+			with self.captureOnCommitCallbacks(execute=True):
+				create_with_retry(Resume, name='Once', data_json='{}')
+		self.assertTrue(increment.called)
+		self.assertEqual(Resume.objects.filter(name='Once').count(), 1)
+
+	def test_index_reads_counters_and_recount_fixes_drift(self):
+		Profile.objects.bulk_create([Profile(name='bulk') for _ in range(3)])
+		stats.recount()
+		StatCounter.objects.filter(name='profiles').update(value=99)
+		res = self.client.get(reverse('index'))
+		self.assertEqual(res.context['profiles'], 99)
+		self.assertEqual(stats.recount()['profiles'], 3)
+
+
+class JobQueueTests(TestCase):
+	@mock.patch('main.views.call_ollama', return_value='Dear team, ...')
+	def test_async_cover_letter_runs_in_worker(self, _ollama):
+		res = self.client.post(reverse('cover_letter_api'), json.dumps({'name': 'Ada', 'role': 'Data Scientist', 'async': True}), content_type='application/json')
+		self.assertEqual(res.status_code, 202)
+		status_url = res.json()['status_url']
+		self.assertEqual(self.client.get(status_url).json()['status'], 'pending')
+		self.assertFalse(CoverLetter.objects.exists())
+
+		self.assertTrue(jobs.run_once())
+		state = self.client.get(status_url).json()
+		self.assertEqual(state['status'], 'done')
+		self.assertEqual(state['result']['cover_letter'], 'Dear team, ...')
+
+	def test_status_is_not_readable_by_sequential_id(self):
+		job = jobs.enqueue('cover_letter', {'name': 'Ada', 'role': 'PM'})
+		self.assertEqual(self.client.get(reverse('job_status_api', args=[str(job.pk)])).status_code, 404)
+		self.assertEqual(self.client.get(reverse('job_status_api', args=[job.token])).json()['job_id'], job.pk)
+		self.assertNotEqual(jobs.enqueue('cover_letter', {'name': 'Bo', 'role': 'PM'}).token, job.token)
+
+	@mock.patch('main.views.call_ollama', return_value='Error: Cannot connect to Ollama')
+	def test_failed_job_is_retried_then_marked_failed(self, _ollama):
+		job = jobs.enqueue('cover_letter', {'name': 'Ada', 'role': 'PM'}, max_attempts=2)
+		self.assertTrue(jobs.run_once())
+		job.refresh_from_db()
+		self.assertEqual(job.status, 'pending')
+		Job.objects.filter(pk=job.pk).update(run_after=job.created_at)
+		self.assertTrue(jobs.run_once())
+		job.refresh_from_db()
+		self.assertEqual((job.status, job.attempts), ('failed', 2))
+		self.assertFalse(CoverLetter.objects.exists())
+
+	@mock.patch('main.views.call_ollama', return_value='Error: Cannot connect to Ollama')
+	def test_interview_grade_job_retries_instead_of_falling_back(self, _ollama):
+		ia = InterviewAttempt.objects.create(role='Data Scientist', questions=json.dumps([{'q': 'Q1'}]))
+		job = jobs.enqueue('interview_grade', {'attempt_id': ia.pk, 'answers': ['A']})
+		self.assertTrue(jobs.run_once())
+		job.refresh_from_db()
+		self.assertEqual((job.status, job.attempts), ('pending', 1))
+
+	@override_settings(JOBS={'LEASE_SECONDS': 60, 'DEADLINE_SECONDS': 480})
+	def test_handler_runs_under_deadline_and_a_lost_lease_keeps_the_new_claim(self):
+		seen = {}
+
+		def slow(payload):
+			seen['remaining'] = deadline.remaining()
+			# The lease ran out and another worker re-claimed the job meanwhile
+			Job.objects.filter(pk=job.pk).update(started_at=timezone.now(), attempts=2)
+			return {'ok': True}
+
+		with mock.patch.dict(jobs.HANDLERS, {'probe': slow}):
+			job = jobs.enqueue('probe', {})
+			self.assertTrue(jobs.run_once())
+		self.assertLessEqual(seen['remaining'], 48)
+		job.refresh_from_db()
+		self.assertEqual((job.status, job.attempts, job.result), ('running', 2, ''))
+
+
+@override_settings(CHAT_CONTEXT={'MAX_TURNS': 4, 'TOKEN_BUDGET': 1000, 'SUMMARY_EVERY': 3})
+class ChatContextTests(TestCase):
+	def _add(self, conv, n, start=0):
+		for i in range(start, start + n):
+			Message.objects.create(conversation=conv, role='user' if i % 2 == 0 else 'assistant', text=f'turn {i}')
+
+	def test_short_conversation_is_sent_whole(self):
+		conv = Conversation.objects.create(title='t')
+		self._add(conv, 5)
+		llm = mock.Mock()
+		prompt = chat_context.build_prompt(conv, llm)
+		self.assertIn('User: turn 0', prompt)
+		self.assertIn('User: turn 4', prompt)
+		llm.assert_not_called()
+
+	def test_summary_refreshes_only_when_stale(self):
+		conv = Conversation.objects.create(title='t')
+		self._add(conv, 8)
+		llm = mock.Mock(return_value='User wants a data career.')
+		prompt = chat_context.build_prompt(conv, llm)
+		self.assertEqual(llm.call_count, 1)
+		self.assertIn('User wants a data career.', prompt)
+		recent = prompt.split('Conversation so far:')[1]
+		self.assertNotIn('turn 3', recent)
+		self.assertIn('turn 4', recent)
+		self.assertIn('turn 7', recent)
+
+		self._add(conv, 2, start=8)
+		chat_context.build_prompt(conv, llm)
+		self.assertEqual(llm.call_count, 1)
+		conv.refresh_from_db()
+		self.assertEqual(conv.summary, 'User wants a data career.')
+
+	@override_settings(CHAT_CONTEXT={'MAX_TURNS': 4, 'TOKEN_BUDGET': 1000, 'SUMMARY_EVERY': 3, 'SUMMARY_BATCH_LIMIT': 5})
+	def test_long_backlog_is_folded_oldest_first_in_batches(self):
+		conv = Conversation.objects.create(title='t')
+		self._add(conv, 16)
+		llm = mock.Mock(side_effect=lambda prompt, _: prompt.split('New turns:')[1])
+		# turns 0-11 precede the window: one batch of 5 per request, oldest first, nothing skipped
+		for calls, last in [(1, 'turn 4'), (2, 'turn 9')]:
+			prompt = chat_context.build_prompt(conv, llm)
+			self.assertEqual(llm.call_count, calls)
+			conv.refresh_from_db()
+			self.assertEqual(conv.summary_message_id, Message.objects.get(conversation=conv, text=last).pk)
+		self.assertIn('turn 0', llm.call_args_list[0].args[0])
+		self.assertIn('turn 5', llm.call_args_list[1].args[0])
+		# Turns 10-15 now fit the window, so the next request folds nothing
+		prompt = chat_context.build_prompt(conv, llm)
+		self.assertEqual(llm.call_count, 2)
+		self.assertIn('turn 10', prompt.split('Conversation so far:')[1])
+
+	@override_settings(LLM_DEADLINES={'chat_summary': 5})
+	def test_chat_api_folds_the_summary_under_a_deadline(self):
+		conv = Conversation.objects.create(title='t')
+		self._add(conv, 12)
+		session = self.client.session
+		session['current_conversation'] = conv.pk
+		session.save()
+		budgets = []
+
+		def fake_ollama(prompt, system_prompt):
+			budgets.append(deadline.remaining())
+			return 'summary' if prompt.startswith('Current summary') else 'reply'
+
+		with mock.patch('main.views.call_ollama', side_effect=fake_ollama):
+			res = self.client.post(reverse('chat_api'), json.dumps({'text': 'next'}), content_type='application/json')
+		self.assertEqual(res.json()['response'], 'reply')
+		self.assertEqual(len(budgets), 2)
+		self.assertLessEqual(budgets[0], 5)
+		self.assertIsNone(budgets[1])
+
+	def test_prompt_respects_token_budget(self):
+		conv = Conversation.objects.create(title='t')
+		Message.objects.create(conversation=conv, role='user', text='x ' * 5000)
+		Message.objects.create(conversation=conv, role='user', text='latest question')
+		prompt = chat_context.build_prompt(conv, mock.Mock())
+		self.assertIn('latest question', prompt)
+		self.assertLess(chat_context.estimate_tokens(prompt), 1100)
+
+
+class OllamaReadinessTests(TestCase):
+	def setUp(self):
+		patcher = mock.patch.dict(ollama._state, {'started': True, 'ready': False, 'loaded_at': None})
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def test_cold_model_fails_fast(self):
+		from .views import call_ollama
+		with mock.patch('main.views.requests.post') as post:
+			self.assertTrue(call_ollama('hi').startswith('Error:'))
+		post.assert_not_called()
+		self.assertEqual(self.client.get(reverse('ollama_ready_api')).status_code, 503)
+
+	def test_timeout_does_not_mark_loaded_model_cold(self):
+		import requests
+		from .views import _call_ollama
+		ollama.mark_ready()
+		with mock.patch('main.views.requests.post', side_effect=requests.exceptions.ReadTimeout('slow')):
+			self.assertTrue(_call_ollama('hi', retries=1).startswith('Error:'))
+		self.assertFalse(ollama.is_cold())
+		self.assertIn('read timeout', ollama.status()['last_error'])
+		with mock.patch('main.views.requests.post', side_effect=requests.exceptions.ConnectionError('refused')):
+			_call_ollama('hi', retries=1)
+		self.assertTrue(ollama.is_cold())
+
+	def test_ready_after_warm_up(self):
+		with mock.patch('main.utils.ollama.requests.post', return_value=mock.Mock(status_code=200)):
+			self.assertTrue(ollama.warm_up())
+		res = self.client.get(reverse('ollama_ready_api'))
+		self.assertEqual(res.status_code, 200)
+		self.assertTrue(res.json()['ready'])
+
+
+class SingleFlightTests(TestCase):
+	def _run_concurrently(self, n, target):
+		results = []
+		threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(n)]
+		for t in threads:
+			t.start()
+		for t in threads:
+			t.join()
+		return results
+
+	def test_identical_calls_share_one_execution(self):
+		sf = SingleFlight()
+		fn = mock.Mock(side_effect=lambda: time.sleep(0.2) or 'shared')
+		results = self._run_concurrently(5, lambda: sf.do('k', fn))
+		self.assertEqual(results, ['shared'] * 5)
+		self.assertEqual(fn.call_count, 1)
+		self.assertEqual(sf.stats()['coalesced'], 4)
+		self.assertEqual(sf.stats()['in_flight'], 0)
+
+	def test_errors_propagate_to_followers(self):
+		sf = SingleFlight()
+
+		def boom():
+			time.sleep(0.2)
+			raise ValueError('bad json')
+
+		def call():
+			try:
+				return sf.do('k', boom)
+			except ValueError as e:
+				return str(e)
+
+		self.assertEqual(self._run_concurrently(3, call), ['bad json'] * 3)
+
+	def test_follower_timeout(self):
+		sf = SingleFlight()
+		started = threading.Event()
+		leader = threading.Thread(target=lambda: sf.do('k', lambda: started.set() or time.sleep(0.3)))
+		leader.start()
+		started.wait()
+		with self.assertRaises(SingleFlightTimeout):
+			sf.do('k', mock.Mock(), timeout=0.05)
+		leader.join()
+		self.assertEqual(sf.stats()['timeouts'], 1)
+
+
+class ShardedMcqTests(TestCase):
+	@staticmethod
+	def _reply(prompt, *args, **kwargs):
+		n = int(prompt.split('Create ')[1].split(' ')[0])
+		topic = prompt.split('Focus on ')[1].split('.')[0] if 'Focus on' in prompt else 'all'
+		if 'tools' in topic:
+			return 'not json at all'
+		return json.dumps({'mcqs': [
+			{'question': f'{topic} question {i}', 'options': ['a', 'b', 'c', 'd'], 'answer_index': 1} for i in range(n)
+		] + [{'question': f'{topic} question 0', 'options': ['a', 'b', 'c', 'd'], 'answer_index': 1}]})
+
+	@override_settings(INTERVIEW_MCQ={'SHARD_SIZE': 3, 'MAX_PARALLEL': 4})
+	def test_shards_are_merged_deduplicated_and_backfilled(self):
+		from .views import generate_mcqs
+		with mock.patch('main.views.call_ollama', side_effect=self._reply) as ollama:
+			mcqs, info = generate_mcqs('Data Scientist', 10)
+		self.assertEqual(ollama.call_count, 4)
+		self.assertEqual(len(mcqs), 10)
+		self.assertEqual(len({q['question'] for q in mcqs}), 10)
+		# One shard of 3 returned garbage and is filled from the fallback bank
+		self.assertEqual(info, {'shards': 4, 'failed_shards': 1, 'generated': 7, 'fallback': 3})
+
+	def test_zero_count_returns_no_questions(self):
+		from .views import generate_mcqs
+		with mock.patch('main.views.call_ollama') as ollama:
+			mcqs, info = generate_mcqs('Data Scientist', 0)
+		self.assertEqual(mcqs, [])
+		self.assertEqual(info['shards'], 0)
+		ollama.assert_not_called()
+
+	@override_settings(INTERVIEW_MCQ={'SHARD_SIZE': 3, 'MAX_PARALLEL': 4, 'MAX_COUNT': 6})
+	def test_interview_api_rejects_bad_counts_and_clamps_large_ones(self):
+		def post(count):
+			return self.client.post(reverse('interview_api'), json.dumps({'role': 'Data Scientist', 'count': count}),
+									content_type='application/json')
+		for bad in (0, -3, 'many'):
+			self.assertEqual(post(bad).status_code, 400)
+		with mock.patch('main.views.call_ollama', side_effect=self._reply) as ollama:
+			res = post(1000)
+		self.assertEqual(res.status_code, 200)
+		self.assertEqual(len(res.json()['mcqs']), 6)
+		self.assertEqual(ollama.call_count, 2)
+
+	def test_malformed_question_only_drops_itself(self):
+		from .views import parse_mcq_shard
+		reply = 'Sure! {"mcqs": [{"question": "Q1", "options": ["a","b"], "answer_index": 5}, {"question": "Q2"}]}'
+		self.assertEqual(parse_mcq_shard(reply), [{'question': 'Q1', 'options': ['a', 'b', 'N/A', 'N/A'], 'answer_index': 1}])
+
+
+class DeadlineTests(TestCase):
+	def test_attempt_timeout_is_clamped_and_spent_deadline_fails_fast(self):
+		from .views import _call_ollama
+		with deadline.deadline(1.0):
+			with mock.patch('main.views.requests.post') as post:
+				post.return_value = mock.Mock(status_code=200, json=lambda: {'response': 'ok'})
+				self.assertEqual(_call_ollama('hi', timeout=180), 'ok')
+				self.assertLessEqual(post.call_args.kwargs['timeout'], 1.0)
+		with deadline.deadline(0.0) as dl:
+			with mock.patch('main.views.requests.post') as post:
+				self.assertEqual(_call_ollama('hi'), deadline.DEADLINE_ERROR)
+				post.assert_not_called()
+		self.assertTrue(dl.exceeded)
+
+	def test_unlimited_follower_retries_after_short_deadline_leader(self):
+		import requests
+		from .views import call_ollama
+		started = threading.Event()
+
+		def post(url, json, timeout):
+			started.set()
+			if timeout < 0.4:
+				time.sleep(timeout)
+				raise requests.exceptions.ReadTimeout('still generating')
+			time.sleep(0.4)
+			return mock.Mock(status_code=200, json=lambda: {'response': 'full answer'})
+
+		results = {}
+
+		def leader():
+			with deadline.deadline(0.3):
+				results['leader'] = call_ollama('same prompt')
+
+		def follower():
+			started.wait()
+			results['follower'] = call_ollama('same prompt')
+
+		with mock.patch('main.views.requests.post', side_effect=post) as mocked:
+			threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+			for t in threads:
+				t.start()
+			for t in threads:
+				t.join()
+		self.assertEqual(results['leader'], deadline.DEADLINE_ERROR)
+		self.assertEqual(results['follower'], 'full answer')
+		self.assertEqual(mocked.call_count, 2)
+
+	def test_nested_deadline_never_extends_outer(self):
+		with deadline.deadline(1.0) as outer:
+			with deadline.deadline(60):
+				self.assertLessEqual(deadline.remaining(), 1.0)
+		self.assertFalse(outer.exceeded)
+		self.assertIsNone(deadline.remaining())
+
+	@override_settings(LLM_BACKGROUND_UPGRADE=True)
+	def test_cover_letter_falls_back_to_template_and_queues_upgrade(self):
+		# Stand-in for a model that is still busy when the view's budget runs out
+		def slow_model(*args, **kwargs):
+			deadline.current().exceeded = True
+			return deadline.DEADLINE_ERROR
+
+		with mock.patch('main.views.call_ollama', side_effect=slow_model):
+			resp = Client().post(reverse('cover_letter_api'), data=json.dumps({'name': 'Ada', 'role': 'Data Scientist'}), content_type='application/json')
+		data = resp.json()
+		self.assertTrue(data['fallback'])
+		self.assertIn('Dear Hiring Manager', data['cover_letter'])
+		job = Job.objects.get(pk=data['upgrade_job_id'])
+		self.assertEqual(job.kind, 'cover_letter_upgrade')
+
+		with mock.patch('main.views.call_ollama', return_value='Model letter'):
+			jobs.execute(jobs.claim_next())
+		self.assertEqual(CoverLetter.objects.get(pk=data['id']).body, 'Model letter')
+
+
+class FakeOllamaTests(TestCase):
+	def _server(self, **kwargs):
+		server = FakeOllamaServer(latency={'dist': 'fixed', 'ms': 0}, seed=0, **kwargs).start()
+		self.addCleanup(server.stop)
+		return server
+
+	def test_canned_rules_and_streaming(self):
+		import requests
+		server = self._server(rules=[{'match': r'^ping', 'response': {'pong': True}}])
+		with override_settings(OLLAMA_URL=server.url):
+			from .views import _call_ollama
+			self.assertEqual(json.loads(_call_ollama('ping please')), {'pong': True})
+		r = requests.post(f"{server.url}/api/generate", json={'prompt': 'How do I become a data engineer?'}, stream=True)
+		lines = [json.loads(line) for line in r.iter_lines() if line]
+		self.assertTrue(lines[-1]['done'])
+		self.assertGreater(len(lines), 2)
+		self.assertIn('portfolio', ''.join(line['response'] for line in lines))
+
+	def test_error_rate_surfaces_as_ollama_error(self):
+		server = self._server(error_rate=1.0)
+		with override_settings(OLLAMA_URL=server.url):
+			from .views import _call_ollama
+			self.assertTrue(_call_ollama('hi', retries=1).startswith('Error:'))
+		self.assertEqual(server.counts['errors'], 1)
+
+
+@override_settings(WRITE_BEHIND={'ENABLED': False})
+@mock.patch('main.views.predict_roles_local', return_value=[])
+class RecommendSensitivityTests(TestCase):
+	profile = {'name': 'Ada', 'skills': 'python, sql, statistics', 'risk_taking': 'high',
+			   'interests': {'data': 4, 'programming': 2, 'design': 3, 'management': 1}}
+
+	def _post(self, name, body):
+		return self.client.post(reverse(name), json.dumps(body), content_type='application/json')
+
+	def test_grid_matches_recommend_api(self, _):
+		res = self._post('recommend_sensitivity_api', self.profile)
+		self.assertEqual(res.status_code, 200)
+		data = res.json()
+		self.assertEqual(data['source'], 'rules')
+		self.assertEqual(data['shape'], [5, 5, 5, 5])
+		self.assertEqual(len(data['points']), 625)
+		self.assertEqual(len(data['scores']), 625)
+
+		interests = {'data': 5, 'programming': 1, 'design': 2, 'management': 4}
+		rec = self._post('recommend_api', {**self.profile, 'interests': interests}).json()['recommendations']
+		row = data['scores'][data['points'].index([5, 1, 2, 4])]
+		ranked = sorted(zip(data['roles'], row), key=lambda x: x[1], reverse=True)[:5]
+		self.assertEqual([r for r, _ in ranked], [r['role'] for r in rec])
+		for (_, score), r in zip(ranked, rec):
+			self.assertAlmostEqual(score, r['score'], places=9)
+
+	def test_axis_mode_varies_one_slider_at_a_time(self, _):
+		res = self._post('recommend_sensitivity_api', {**self.profile, 'mode': 'axis', 'axes': ['design', 'data'], 'values': [1, 5]})
+		self.assertEqual(res.status_code, 200)
+		self.assertEqual(res.json()['points'], [[4, 2, 1, 1], [4, 2, 5, 1], [1, 2, 3, 1], [5, 2, 3, 1]])
+
+	def test_rejects_bad_axes_and_oversized_grids(self, _):
+		self.assertEqual(self._post('recommend_sensitivity_api', {**self.profile, 'axes': ['hardware']}).status_code, 400)
+		self.assertEqual(self._post('recommend_sensitivity_api', {**self.profile, 'values': list(range(20))}).status_code, 400)
+
+
+class ListColumnParsingTests(SimpleTestCase):
+	"""src/ingest.py parse_list_column must give exactly what ensure_list gives, per encoding."""
+	CASES = {
+		'native': [['Python', 'SQL'], ('R',), [], None],
+		'json': ['["Python", "SQL"]', '[]', '[1, 2]', '["a", "b", "c"]'],
+		'python': ["['Python', 'SQL']", "['R']", '[]'],
+		'delimited': ['Python, SQL', ' sql ,, r ,', '', None, 'None', '1', '["x"]', '{"a": 1}', 2.5],
+		'delimited_scalars': ['None', '1'],
+		'empty': [None, None, ''],
+	}
+
+	def test_matches_ensure_list_for_every_encoding(self):
+		import numpy as np
+		import pandas as pd
+		from src.ingest import detect_list_encoding, ensure_list, parse_list_column
+		cases = {**self.CASES, 'native': self.CASES['native'] + [np.array(['Go'])]}
+		for name, values in cases.items():
+			with self.subTest(encoding=name):
+				series = pd.Series(values, dtype=object)
+				self.assertEqual(detect_list_encoding(series), name.split('_')[0])
+				parsed = parse_list_column(series)
+				self.assertEqual(parsed.dtype, object)
+				expected = [ensure_list(v) for v in values]
+				self.assertEqual([(type(v), v) for v in parsed], [(type(v), v) for v in expected])
+
+
+class WhatIfLearningPlanTests(SimpleTestCase):
+	"""SenseiPredictor.what_if on encoder tokens ('sql') against the Title Case configs ('SQL')."""
+
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		import tempfile
+		from pathlib import Path
+		import joblib
+		import pandas as pd
+		from sklearn.multiclass import OneVsRestClassifier
+		from sklearn.preprocessing import MultiLabelBinarizer
+		from xgboost import XGBClassifier
+		from src.feature_pipeline import FeatureEncoder
+		from src.predict_api import SenseiPredictor
+		cls.tmp = tempfile.TemporaryDirectory()
+		artifacts = Path(cls.tmp.name)
+		encoder = FeatureEncoder.create()
+		profile = {**dict.fromkeys(encoder.numeric_cols, 3), 'education': 'UG', 'field_of_study': 'CS',
+				   'personality': 'ambivert', 'work_preference': 'team', 'sentiment': 'neutral', 'desired_roles': []}
+		rows = pd.DataFrame([
+			{**profile, 'skills': skills, 'labels': [role]}
+			for skills, role in [(['sql', 'excel'], 'Data Analyst'), (['figma'], 'UX/UI Designer'),
+								 (['python', 'sql'], 'Data Analyst'), (['figma', 'python'], 'UX/UI Designer')]
+		])
+		encoder.fit(rows)
+		lb = MultiLabelBinarizer()
+		Y = lb.fit_transform(rows['labels'])
+		model = OneVsRestClassifier(XGBClassifier(n_estimators=2, max_depth=2)).fit(encoder.transform(rows), Y)
+		joblib.dump(model, artifacts / 'xgb_onevsrest.joblib')
+		joblib.dump(encoder, artifacts / 'feature_encoder.joblib')
+		joblib.dump(lb, artifacts / 'label_binarizer.joblib')
+		cls.configs = Path(__file__).resolve().parents[1] / 'src' / 'configs'
+		cls.predictor = SenseiPredictor(artifacts, cls.configs, engine='xgboost')
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.tmp.cleanup()
+		super().tearDownClass()
+
+	def test_known_skill_gets_its_configured_course(self):
+		courses = json.loads((self.configs / 'skill_to_course.json').read_text())
+		result = self.predictor.what_if({'skills': ['Excel']}, 'Data Analyst')
+		by_skill = {tuple(r['skills']): r for r in result['results']}
+		self.assertNotIn(('excel',), by_skill)
+		plan = by_skill[('sql',)]['learning_plan']
+		self.assertEqual(plan, [{'skill': 'SQL', 'course': courses['SQL'], 'source': 'online', 'weeks': 2}])
+
+	def test_added_token_counts_towards_skill_fit(self):
+		import numpy as np
+		predictor = self.predictor
+		row = predictor._sanitize({})
+		proba = np.zeros((2, len(predictor.roles)))
+		scores = predictor._blend(proba, [set(), {'sql'}], [row])
+		j = predictor.roles.index('Data Analyst')
+		self.assertGreater(scores[1, j], scores[0, j])
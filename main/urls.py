@@ -9,12 +9,19 @@ urlpatterns = [
     path('api/chat/', views.chat_api, name='chat_api'),
     path('recommendations/', views.recommendations_page, name='recommendations'),
     path('api/recommend/', views.recommend_api, name='recommend_api'),
+    path('api/recommend/sensitivity/', views.recommend_sensitivity_api, name='recommend_sensitivity_api'),
+    path('api/analytics/roles/', views.recommendation_role_stats_api, name='recommendation_role_stats_api'),
+    path('api/analytics/scores/', views.recommendation_score_stats_api, name='recommendation_score_stats_api'),
     path('interview/', views.interview_page, name='interview'),
     path('api/interview/', views.interview_api, name='interview_api'),
     path('api/interview/submit/', views.interview_submit_api, name='interview_submit_api'),
     path('resume/', views.resume_page, name='resume'),
     path('resume/download/', views.resume_download, name='resume_download'),
+    path('resume/export/', views.resume_export, name='resume_export'),
     path('api/sentiment/', views.analyze_sentiment_api, name='analyze_sentiment_api'),
     path('cover-letter/', views.cover_letter_page, name='cover_letter'),
     path('api/cover-letter/', views.cover_letter_api, name='cover_letter_api'),
+    path('api/jobs/<str:token>/', views.job_status_api, name='job_status_api'),
+    path('api/ollama/ready/', views.ollama_ready_api, name='ollama_ready_api'),
+    path('api/ollama/stats/', views.ollama_stats_api, name='ollama_stats_api'),
 ]
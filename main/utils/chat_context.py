@@ -0,0 +1,142 @@
+"""Prompt context for chat_api: recent turns plus a rolling summary.
+
+Sending the whole history to Ollama would make prompt processing (and so
+latency) grow with every turn. Instead the prompt holds:
+
+  - the turns not yet covered by the summary, packed newest-first under
+    TOKEN_BUDGET, and
+  - `Conversation.summary`, a summary of everything older.
+
+The summary is extended incrementally: once more than MAX_TURNS +
+SUMMARY_EVERY turns are unsummarized, all but the newest MAX_TURNS are sent
+to the model together with the previous summary, and `summary_message_id`
+records how far it now reaches. Turns are folded oldest first in batches of
+SUMMARY_BATCH_LIMIT, at most SUMMARY_MAX_BATCHES per request, so a long
+legacy conversation catches up over its next few turns instead of blocking
+one reply on dozens of model calls. Between refreshes the summary is reused
+as stored, so the prompt size stays bounded however long the conversation
+gets.
+
+Configured through settings.CHAT_CONTEXT.
+"""
+import logging
+
+from django.conf import settings
+
+from .db import retry_on_locked
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_TURNS': 8,
+    'TOKEN_BUDGET': 1500,
+    'SUMMARY_EVERY': 6,
+    'SUMMARY_MAX_TOKENS': 300,
+    # Turns folded per summary call; long legacy conversations take several
+    'SUMMARY_BATCH_LIMIT': 100,
+    # Summary calls per request; the rest of a backlog waits for later turns
+    'SUMMARY_MAX_BATCHES': 1,
+}
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a career guidance chat. Keep facts about the user "
+    "(background, skills, goals, constraints) and advice already given. Be concise."
+)
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'CHAT_CONTEXT', {})}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text or '') // 4 + 1
+
+
+def _truncate(text: str, tokens: int) -> str:
+    limit = max(tokens, 1) * 4
+    return text if len(text) <= limit else text[:limit].rsplit(' ', 1)[0] + ' ...'
+
+
+def _format_turn(message) -> str:
+    speaker = 'User' if message.role == 'user' else 'Assistant'
+    return f"{speaker}: {message.text}"
+
+
+def refresh_summary(conversation, window_start_id: int, llm) -> None:
+    """Fold turns between the stored summary and the window into the summary.
+
+    Turns are folded oldest first, at most SUMMARY_BATCH_LIMIT per model call
+    and SUMMARY_MAX_BATCHES calls per refresh. Progress is saved after every
+    batch, so turns not folded yet (or after a failed call) are left for the
+    next refresh instead of being skipped.
+    """
+    cfg = _config()
+    for _ in range(cfg['SUMMARY_MAX_BATCHES']):
+        pending = list(
+            conversation.messages
+            .filter(pk__gt=conversation.summary_message_id, pk__lt=window_start_id)
+            .order_by('created_at', 'pk')[:cfg['SUMMARY_BATCH_LIMIT']]
+        )
+        if not pending:
+            return
+        transcript = '\n'.join(_format_turn(m) for m in pending)
+        prompt = (
+            f"Current summary:\n{conversation.summary or '(none)'}\n\n"
+            f"New turns:\n{transcript}\n\n"
+            f"Write the updated summary in at most {cfg['SUMMARY_MAX_TOKENS'] * 3 // 4} words."
+        )
+        summary = llm(prompt, SUMMARY_SYSTEM_PROMPT)
+        if not summary or summary.startswith('Error:'):
+            # Keep the stale summary; the next turn will try again
+            logger.warning(f"Conversation {conversation.pk}: summary refresh failed: {summary}")
+            return
+        conversation.summary = _truncate(summary.strip(), cfg['SUMMARY_MAX_TOKENS'])
+        conversation.summary_message_id = pending[-1].pk
+        retry_on_locked(conversation.save, update_fields=['summary', 'summary_message_id'])
+
+
+def build_prompt(conversation, llm) -> str:
+    """Prompt for the newest user turn (already saved) of `conversation`.
+
+    `llm(prompt, system_prompt) -> str` is only called when the summary is
+    stale and needs extending.
+    """
+    cfg = _config()
+    # Newest unsummarized turns; fetching one extra tells us whether the
+    # summary has gone stale.
+    fetch = cfg['MAX_TURNS'] + cfg['SUMMARY_EVERY']
+    window = list(
+        conversation.messages
+        .filter(pk__gt=conversation.summary_message_id)
+        .order_by('-created_at', '-pk')[:fetch + 1]
+    )
+    if not window:
+        return ''
+
+    if len(window) > fetch:
+        window = window[:cfg['MAX_TURNS']]
+        refresh_summary(conversation, window[-1].pk, llm)
+
+    summary = conversation.summary
+    budget = cfg['TOKEN_BUDGET'] - (estimate_tokens(summary) if summary else 0)
+
+    # Pack newest-first; the current user message always goes in, truncated if needed
+    newest = window[0]
+    lines = [_truncate(_format_turn(newest), budget)]
+    budget -= estimate_tokens(lines[0])
+    for message in window[1:]:
+        line = _format_turn(message)
+        cost = estimate_tokens(line)
+        if cost > budget:
+            break
+        lines.append(line)
+        budget -= cost
+    lines.reverse()
+
+    parts = []
+    if summary:
+        parts.append(f"Summary of the earlier conversation:\n{summary}")
+    parts.append("Conversation so far:\n" + '\n'.join(lines))
+    parts.append("Assistant:")
+    return '\n\n'.join(parts)
@@ -0,0 +1,49 @@
+"""Database helpers for Career Compass.
+
+SQLite allows a single writer at a time. Even with WAL and a busy timeout a
+burst of concurrent API writes can still surface "database is locked", so the
+views route their INSERTs through `create_with_retry` which backs off and
+tries again a few times before giving up.
+
+Functions:
+  - is_lock_error(exc) -> True for SQLite lock conflicts
+  - retry_on_locked(fn, *args, **kwargs) -> result of fn
+  - create_with_retry(model, **fields) -> saved model instance
+"""
+import logging
+import random
+import time
+
+from django.db import OperationalError, connection
+
+logger = logging.getLogger(__name__)
+
+LOCK_RETRIES = 5
+LOCK_BACKOFF = 0.05  # seconds, doubled on every attempt
+
+
+def is_lock_error(exc: Exception) -> bool:
+    msg = str(exc).lower()
+    return 'database is locked' in msg or 'database table is locked' in msg
+
+
+def retry_on_locked(fn, *args, retries: int = LOCK_RETRIES, backoff: float = LOCK_BACKOFF, **kwargs):
+    """Call `fn` and retry it when SQLite reports a lock conflict.
+
+    Retrying inside an enclosing transaction is unsafe (the transaction is
+    already broken), so in that case the error is re-raised immediately.
+    """
+    for attempt in range(1, retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except OperationalError as exc:
+            if not is_lock_error(exc) or connection.in_atomic_block or attempt == retries:
+                raise
+            delay = backoff * (2 ** (attempt - 1)) * (1 + random.random())
+            logger.warning(f"Database locked on attempt {attempt}, retrying in {delay:.3f}s")
+            time.sleep(delay)
+
+
+def create_with_retry(model, **fields):
+    """`model.objects.create(**fields)` with lock-conflict retries."""
+    return retry_on_locked(model.objects.create, **fields)
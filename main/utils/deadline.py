@@ -0,0 +1,71 @@
+"""Request-scoped deadlines for LLM calls.
+
+A view wraps its slow work in `with deadline(seconds):`; `call_ollama` then
+clamps every attempt's timeout and every backoff sleep to the time left, and
+gives up with DEADLINE_ERROR once it is spent, so the view can return its
+deterministic fallback instead of stalling for minutes. Nested deadlines
+never extend an outer one.
+
+The deadline lives in a ContextVar. Work handed to a thread pool must run
+under `contextvars.copy_context().run(...)` to inherit it. The Deadline
+object is shared, so `exceeded` set in a worker thread is visible to the view.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEADLINE_ERROR = "Error: Deadline exceeded before the AI model responded."
+
+# Below this many seconds another network attempt is not worth starting
+MIN_ATTEMPT_SECONDS = 0.25
+
+_current = ContextVar('llm_deadline', default=None)
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+        self.exceeded = False
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+@contextmanager
+def deadline(seconds: float):
+    outer = _current.get()
+    dl = Deadline(seconds)
+    if outer is not None and outer.expires_at < dl.expires_at:
+        dl.expires_at = outer.expires_at
+    token = _current.set(dl)
+    try:
+        yield dl
+    finally:
+        if dl.exceeded and outer is not None and outer.expires_at <= dl.expires_at:
+            outer.exceeded = True
+        _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def remaining():
+    """Seconds left on the active deadline, or None when there is none."""
+    dl = _current.get()
+    return None if dl is None else dl.remaining()
+
+
+def clamp(seconds: float):
+    """`seconds` limited by the active deadline (unchanged when there is none)."""
+    left = remaining()
+    return seconds if left is None else min(seconds, left)
+
+
+def exhausted(min_left: float = MIN_ATTEMPT_SECONDS) -> bool:
+    """True (and the deadline marked exceeded) when less than `min_left` remains."""
+    dl = _current.get()
+    if dl is None or dl.remaining() >= min_left:
+        return False
+    dl.exceeded = True
+    return True
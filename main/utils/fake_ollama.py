@@ -0,0 +1,263 @@
+"""Local stand-in for the Ollama HTTP API, for load tests and the test suite.
+
+Implements POST /api/generate (streaming NDJSON and non-streaming), plus
+GET /api/ps and /api/tags so the warmer and readiness probe work against it.
+Every generate call sleeps for a latency drawn from a configurable
+distribution and fails with HTTP 500 at a configurable rate. Replies come
+from canned rules (first match on the prompt wins) and then from built-in
+responders that understand the prompts this app sends: MCQ shards, interview
+grading and chat summaries get valid JSON or text, anything else gets a
+short advisory paragraph.
+
+Run it with `python manage.py fake_ollama`, or turn on settings.OLLAMA_FAKE
+(env OLLAMA_FAKE=1) so OLLAMA_URL points at it. Tests start one in-process:
+
+    server = FakeOllamaServer(latency={'dist': 'fixed', 'ms': 0}).start()
+    with override_settings(OLLAMA_URL=server.url): ...
+    server.stop()
+
+Latency specs (milliseconds):
+  {'dist': 'fixed', 'ms': 300}
+  {'dist': 'uniform', 'min_ms': 100, 'max_ms': 800}
+  {'dist': 'lognormal', 'median_ms': 300, 'sigma': 0.6}   # long right tail
+
+Canned rules are dicts {'match': <regex>, 'response': <str or JSON value>},
+optionally with 'status' to force an HTTP error for matching prompts. A JSON
+file of such a list can be passed as `responses`.
+"""
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY = {'dist': 'lognormal', 'median_ms': 300, 'sigma': 0.5}
+STREAM_CHUNK_WORDS = 4
+
+
+def sample_latency(spec: dict, rng: random.Random) -> float:
+    """Seconds to wait for one call according to a latency spec."""
+    dist = (spec or {}).get('dist', 'fixed')
+    if dist == 'fixed':
+        ms = spec.get('ms', 0)
+    elif dist == 'uniform':
+        ms = rng.uniform(spec.get('min_ms', 0), spec.get('max_ms', 0))
+    elif dist == 'lognormal':
+        ms = rng.lognormvariate(math.log(max(spec.get('median_ms', 1), 1e-3)), spec.get('sigma', 0.5))
+        ms = min(ms, spec.get('max_ms', float('inf')))
+    else:
+        raise ValueError(f"Unknown latency distribution: {dist}")
+    return max(0.0, ms) / 1000.0
+
+
+def load_rules(path) -> list:
+    with open(path, encoding='utf-8') as fh:
+        rules = json.load(fh)
+    if not isinstance(rules, list):
+        raise ValueError(f"{path}: expected a JSON list of {{'match', 'response'}} rules")
+    return rules
+
+
+def _mcq_reply(prompt: str) -> str:
+    n = int(re.search(r"Create (\d+) multiple-choice", prompt).group(1))
+    role = re.search(r"for the role: (.+?)\.", prompt)
+    role = role.group(1) if role else 'the role'
+    topic = re.search(r"Focus on (.+?)\.", prompt)
+    topic = topic.group(1) if topic else 'core skills'
+    # Salt with the prompt so concurrent shards do not all collide on dedup
+    salt = zlib.crc32(prompt.encode('utf-8')) % 10000
+    return json.dumps({'mcqs': [
+        {
+            'question': f"[{salt}-{i}] For a {role}, which statement about {topic} is most accurate?",
+            'options': [f"Option {c} on {topic}" for c in 'ABCD'],
+            'answer_index': i % 4,
+        }
+        for i in range(n)
+    ]})
+
+
+def _grading_reply(prompt: str) -> str:
+    try:
+        answers = json.loads(prompt.split('Input:\n', 1)[1]).get('answers', [])
+    except Exception:
+        answers = []
+    scores = [min(10, 3 + len(a or '') // 15) for a in answers]
+    return json.dumps({
+        'scores': scores,
+        'feedback': ['Clear answer; add a concrete example.' for _ in scores],
+        'overall_score': int(sum(scores) / max(1, len(scores))),
+        'summary': 'Solid fundamentals with room for more depth.',
+    })
+
+
+def builtin_reply(prompt: str, system: str = '') -> str:
+    """Plausible reply for the prompts the Django views send."""
+    if 'multiple-choice questions' in prompt and 'Create ' in prompt:
+        return _mcq_reply(prompt)
+    if 'keys: scores, feedback, overall_score, summary' in prompt:
+        return _grading_reply(prompt)
+    if prompt.startswith('Current summary:'):
+        return 'The user is exploring career options and has discussed their skills and goals.'
+    if 'cover letter' in prompt:
+        return ("Dear Hiring Manager,\n\nI am excited to apply for this position. My experience and skills "
+                "match the role well.\n\nSincerely,\nCandidate")
+    return ("Focus on building practical projects, strengthen the core skills for your target role, "
+            "and keep a portfolio that shows measurable results.")
+
+
+class FakeOllamaServer:
+    """Threaded HTTP server speaking enough of the Ollama API for this app."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, model: str = 'mistral',
+                 latency: dict = None, error_rate: float = 0.0, rules=None, seed: int = None):
+        self.model = model
+        self.latency = latency if latency is not None else dict(DEFAULT_LATENCY)
+        self.error_rate = error_rate
+        self.rules = load_rules(rules) if isinstance(rules, str) else list(rules or [])
+        self._compiled = [(re.compile(r.get('match', ''), re.S), r) for r in self.rules]
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self.counts = {'requests': 0, 'errors': 0, 'streamed': 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeOllamaServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-ollama', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def _count(self, key: str) -> None:
+        with self._counts_lock:
+            self.counts[key] += 1
+
+    def _draw(self):
+        """(latency seconds, fail?) for one call."""
+        with self._rng_lock:
+            return sample_latency(self.latency, self._rng), self._rng.random() < self.error_rate
+
+    def reply_for(self, prompt: str, system: str = ''):
+        """(HTTP status, response text) for a prompt: canned rules, then built-ins."""
+        for pattern, rule in self._compiled:
+            if pattern.search(prompt):
+                resp = rule.get('response', '')
+                return rule.get('status', 200), resp if isinstance(resp, str) else json.dumps(resp)
+        return 200, builtin_reply(prompt, system)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, fmt, *args):
+                logger.debug("fake-ollama: " + fmt, *args)
+
+            def _send_json(self, status, body):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == '/api/ps':
+                    self._send_json(200, {'models': [{'name': f"{server.model}:latest", 'model': server.model}]})
+                elif self.path == '/api/tags':
+                    self._send_json(200, {'models': [{'name': f"{server.model}:latest"}]})
+                elif self.path == '/':
+                    self._send_json(200, {'status': 'Ollama is running (stand-in)'})
+                else:
+                    self._send_json(404, {'error': 'not found'})
+
+            def do_POST(self):
+                if self.path != '/api/generate':
+                    self._send_json(404, {'error': 'not found'})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    req = json.loads(self.rfile.read(length) or b'{}')
+                except (ValueError, json.JSONDecodeError):
+                    self._send_json(400, {'error': 'invalid JSON body'})
+                    return
+                server._count('requests')
+                prompt = req.get('prompt', '') or ''
+                latency, fail = server._draw()
+                if not prompt:
+                    # Warm-up / keep-alive call: loads the model, generates nothing
+                    self._send_json(200, self._final(req, '', 0.0))
+                    return
+                status, text = (500, 'stand-in injected failure') if fail else server.reply_for(prompt, req.get('system', ''))
+                if status != 200:
+                    time.sleep(latency)
+                    server._count('errors')
+                    self._send_json(status, {'error': text})
+                    return
+                if req.get('stream', True):
+                    server._count('streamed')
+                    self._stream(req, text, latency)
+                else:
+                    time.sleep(latency)
+                    body = self._final(req, text, latency)
+                    body['response'] = text
+                    self._send_json(200, body)
+
+            def _final(self, req, text, latency):
+                return {
+                    'model': req.get('model', server.model),
+                    'created_at': datetime.now(timezone.utc).isoformat(),
+                    'response': '',
+                    'done': True,
+                    'done_reason': 'stop',
+                    'total_duration': int(latency * 1e9),
+                    'eval_count': len(text.split()),
+                }
+
+            def _stream(self, req, text, latency):
+                words = text.split(' ')
+                chunks = [' '.join(words[i:i + STREAM_CHUNK_WORDS]) + (' ' if i + STREAM_CHUNK_WORDS < len(words) else '')
+                          for i in range(0, len(words), STREAM_CHUNK_WORDS)] or ['']
+                # Half the latency is time to first token, the rest is spread over chunks
+                per_chunk = latency / 2 / len(chunks)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                time.sleep(latency / 2)
+                for chunk in chunks:
+                    self._write_chunk({'model': req.get('model', server.model),
+                                       'created_at': datetime.now(timezone.utc).isoformat(),
+                                       'response': chunk, 'done': False})
+                    time.sleep(per_chunk)
+                self._write_chunk(self._final(req, text, latency))
+                self.wfile.write(b'0\r\n\r\n')
+
+            def _write_chunk(self, obj):
+                line = (json.dumps(obj) + '\n').encode('utf-8')
+                self.wfile.write(f"{len(line):x}\r\n".encode('ascii') + line + b'\r\n')
+                self.wfile.flush()
+
+        return Handler
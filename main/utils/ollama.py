@@ -0,0 +1,154 @@
+"""Ollama model warm-up, keep-alive and readiness tracking.
+
+The first generate call after a deploy or an idle period pays for Ollama
+loading the model into memory, which regularly outlasts the request timeout
+and then gets retried. This module preloads `OLLAMA_MODEL` with a
+`keep_alive` so it stays resident, refreshes that from a daemon thread, and
+tracks whether the model is loaded so `call_ollama` can fail fast (and the
+views fall back) while it is still cold.
+
+Readiness is only enforced once the warmer has been started, from
+MainConfig.ready() when settings.OLLAMA_WARMUP is on, or by
+`manage.py ollama_warmup --serve`. Processes that never start it keep the
+old behaviour.
+
+Functions:
+  - warm_up(timeout) -> bool
+  - start_warmer() -> starts the refresh thread once per process
+  - mark_unavailable(reason) / report_slow(reason) -> connection failures
+    flip readiness; timeouts only wake the warmer to re-check
+  - is_cold() -> True when the warmer runs and the model is not loaded
+  - status() -> readiness snapshot for the /api/ollama/ready/ endpoint
+"""
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "http://localhost:11434"
+DEFAULT_MODEL = "mistral"
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_state = {
+    'started': False,
+    'ready': False,
+    'loaded_at': None,
+    'last_check': None,
+    'last_error': None,
+}
+
+
+def base_url() -> str:
+    return getattr(settings, 'OLLAMA_URL', DEFAULT_URL)
+
+
+def model_name() -> str:
+    return getattr(settings, 'OLLAMA_MODEL', DEFAULT_MODEL)
+
+
+def keep_alive() -> str:
+    return getattr(settings, 'OLLAMA_KEEP_ALIVE', '30m')
+
+
+def mark_ready() -> None:
+    with _lock:
+        if not _state['ready']:
+            _state['loaded_at'] = time.time()
+        _state['ready'] = True
+        _state['last_error'] = None
+        _state['last_check'] = time.time()
+
+
+def mark_unavailable(reason: str) -> None:
+    with _lock:
+        _state['ready'] = False
+        _state['last_error'] = reason
+        _state['last_check'] = time.time()
+    # Let the warmer retry soon instead of waiting for the next refresh
+    _wake.set()
+
+
+def report_slow(reason: str) -> None:
+    """Note a timed-out generation without changing readiness.
+
+    A slow answer on a busy host does not mean the model was unloaded, so only
+    the warmer (or /api/ps) decides; it is woken to re-check right away.
+    """
+    with _lock:
+        _state['last_error'] = reason
+        _state['last_check'] = time.time()
+    _wake.set()
+
+
+def is_cold() -> bool:
+    with _lock:
+        return _state['started'] and not _state['ready']
+
+
+def status() -> dict:
+    with _lock:
+        return {
+            'model': model_name(),
+            'ready': _state['ready'],
+            'warmer_running': _state['started'],
+            'loaded_at': _state['loaded_at'],
+            'last_check': _state['last_check'],
+            'last_error': _state['last_error'],
+        }
+
+
+def is_loaded(timeout: float = 5.0) -> bool:
+    """Ask Ollama (/api/ps) whether the model is resident in memory."""
+    try:
+        r = requests.get(f"{base_url()}/api/ps", timeout=timeout)
+        r.raise_for_status()
+        names = {m.get('name', '') for m in r.json().get('models', [])}
+    except Exception as exc:
+        logger.debug(f"Ollama /api/ps failed: {exc}")
+        return False
+    wanted = model_name()
+    return any(n == wanted or n.split(':')[0] == wanted for n in names)
+
+
+def warm_up(timeout: float = None) -> bool:
+    """Load the model (an empty prompt only loads it) and set its keep_alive."""
+    timeout = timeout or getattr(settings, 'OLLAMA_WARMUP_TIMEOUT', 300)
+    payload = {'model': model_name(), 'prompt': '', 'stream': False, 'keep_alive': keep_alive()}
+    try:
+        r = requests.post(f"{base_url()}/api/generate", json=payload, timeout=timeout)
+        if r.status_code != 200:
+            mark_unavailable(f"warm-up returned status {r.status_code}")
+            return False
+    except Exception as exc:
+        mark_unavailable(f"warm-up failed: {exc}")
+        return False
+    mark_ready()
+    return True
+
+
+def _warmer_loop():
+    refresh = getattr(settings, 'OLLAMA_KEEPALIVE_REFRESH', 240)
+    retry = getattr(settings, 'OLLAMA_WARMUP_RETRY', 10)
+    while True:
+        ok = warm_up()
+        if ok:
+            logger.info(f"Ollama model '{model_name()}' loaded (keep_alive={keep_alive()})")
+        else:
+            logger.warning(f"Ollama warm-up failed: {status()['last_error']}")
+        _wake.wait(refresh if ok else retry)
+        _wake.clear()
+
+
+def start_warmer() -> bool:
+    """Start the warm-up/keep-alive thread; returns False if already running."""
+    with _lock:
+        if _state['started']:
+            return False
+        _state['started'] = True
+    threading.Thread(target=_warmer_loop, name='ollama-warmer', daemon=True).start()
+    return True
@@ -0,0 +1,168 @@
+"""Resume PDF rendering, caching and bulk export.
+
+Rendering is a pure function of the resume's name and data, so finished PDFs
+are cached under a SHA-256 of that content and repeat downloads skip
+reportlab entirely. The bulk export renders cache misses in a process pool
+with a bounded number of jobs in flight and streams the results out as a zip,
+so memory stays flat however many resumes are exported.
+
+Functions:
+  - render_resume_pdf(name, data_json) -> bytes
+  - resume_content_key(name, data_json) -> str
+  - get_resume_pdf(resume) -> bytes (cached)
+  - stream_resume_zip(rows, workers) -> iterator of zip bytes
+"""
+import hashlib
+import io
+import json
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+PDF_CACHE_ALIAS = 'resume_pdf'
+PDF_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+# Bump when the layout below changes so stale renders are not served
+PDF_LAYOUT_VERSION = 1
+
+
+def render_resume_pdf(name: str, data_json: str) -> bytes:
+    """Render a resume to PDF bytes. Top-level so process pools can pickle it."""
+    try:
+        data = json.loads(data_json)
+    except Exception:
+        data = {}
+
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    x = 50
+    y = height - 50
+
+    p.setFont('Helvetica-Bold', 16)
+    p.drawString(x, y, f"{name} - Resume")
+    y -= 30
+
+    p.setFont('Helvetica', 11)
+    summary = data.get('summary', '')
+    if summary:
+        p.drawString(x, y, 'Professional Summary:')
+        y -= 18
+        text = p.beginText(x, y)
+        text.setFont('Helvetica', 10)
+        for line in summary.split('\n'):
+            text.textLine(line)
+            y -= 14
+        p.drawText(text)
+        y -= 10
+
+    for key, title in (('experiences', 'Experience:'), ('education', 'Education:')):
+        section = data.get(key, '')
+        if section:
+            p.setFont('Helvetica-Bold', 12)
+            p.drawString(x, y, title)
+            y -= 18
+            p.setFont('Helvetica', 10)
+            text = p.beginText(x, y)
+            for line in section.split('\n'):
+                text.textLine(line)
+                y -= 14
+            p.drawText(text)
+            y -= 10
+
+    skills = data.get('skills', '')
+    if skills:
+        p.setFont('Helvetica-Bold', 12)
+        p.drawString(x, y, 'Skills:')
+        y -= 18
+        p.setFont('Helvetica', 10)
+        text = p.beginText(x, y)
+        text.textLine(skills)
+        p.drawText(text)
+
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def resume_content_key(name: str, data_json: str) -> str:
+    digest = hashlib.sha256(f"{PDF_LAYOUT_VERSION}\0{name}\0{data_json}".encode('utf-8')).hexdigest()
+    return f"resume-pdf:{digest}"
+
+
+def _cache():
+    from django.core.cache import caches
+    return caches[PDF_CACHE_ALIAS]
+
+
+def get_resume_pdf(resume) -> bytes:
+    """PDF bytes for a Resume instance, rendered at most once per content hash."""
+    cache = _cache()
+    key = resume_content_key(resume.name, resume.data_json)
+    pdf = cache.get(key)
+    if pdf is None:
+        pdf = render_resume_pdf(resume.name, resume.data_json)
+        cache.set(key, pdf, PDF_CACHE_TIMEOUT)
+    return pdf
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target that hands zip output back in pieces."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _rendered(rows, workers, window):
+    """Yield (pk, name, pdf) in input order, rendering cache misses in a pool."""
+    cache = _cache()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    pending = deque()
+
+    def emit(entry):
+        pk, name, key, pdf = entry
+        if not isinstance(pdf, bytes):
+            pdf = pdf.result()
+            cache.set(key, pdf, PDF_CACHE_TIMEOUT)
+        return pk, name, pdf
+
+    try:
+        for pk, name, data_json in rows:
+            key = resume_content_key(name, data_json)
+            pdf = cache.get(key)
+            if pdf is None:
+                pdf = pool.submit(render_resume_pdf, name, data_json) if pool else render_resume_pdf(name, data_json)
+            pending.append((pk, name, key, pdf))
+            # Bound the number of renders held in memory at once
+            while len(pending) >= window:
+                yield emit(pending.popleft())
+        while pending:
+            yield emit(pending.popleft())
+    finally:
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def stream_resume_zip(rows, workers: int = 4, window: int = 32):
+    """Stream a zip of resume PDFs for an iterable of (pk, name, data_json) rows."""
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for pk, name, pdf in _rendered(rows, workers, max(window, workers * 2, 1)):
+            safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)[:60] or 'resume'
+            zf.writestr(f"resume_{pk}_{safe}.pdf", pdf)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,88 @@
+"""Rule-based role scoring for recommend_api, vectorized over slider settings.
+
+recommend_api falls back to these rules when neither the prediction service
+nor the role matcher answers. Required-skill overlap, the four interest
+sliders, motivation and risk taking are blended and then softmaxed over the
+roles. The interest sliders are the only inputs that change while a user
+explores the page, so `rule_scores` accepts a matrix of slider settings and
+scores all of them in one pass; recommend_api passes a single row.
+
+Functions:
+  - slider_points(base, mode, axes, values) -> (n, 4) slider settings
+  - interest_fit(roles, interests) -> (n, n_roles)
+  - rule_scores(roles, role_required, user_skills, interests, motivation, risk_num) -> (raw, scores)
+"""
+import itertools
+
+import numpy as np
+
+INTEREST_AXES = ('data', 'programming', 'design', 'management')
+SLIDER_VALUES = (1, 2, 3, 4, 5)
+SENSITIVITY_MODES = ('grid', 'axis')
+
+# The two sliders that drive each role's interest fit; other roles use (3, 3)
+ROLE_INTEREST_AXES = {
+    'Data Scientist': ('data', 'programming'),
+    'Data Analyst': ('data', 'programming'),
+    'Machine Learning Engineer': ('data', 'programming'),
+    'Software Developer': ('programming', 'data'),
+    'Full Stack Developer': ('programming', 'design'),
+    'Frontend Developer': ('design', 'programming'),
+    'Backend Developer': ('programming', 'data'),
+    'Product Manager': ('management', 'design'),
+    'Business Analyst': ('management', 'data'),
+    'Blockchain Developer': ('programming', 'data'),
+}
+RISK_NORM = {2: 0.2, 3: 0.5, 5: 1.0}
+
+
+def slider_points(base, mode='grid', axes=INTEREST_AXES, values=SLIDER_VALUES):
+    """Slider settings to score, one row per point, columns in INTEREST_AXES order.
+
+    `base` maps each axis to the profile's current value. 'grid' varies all
+    `axes` jointly (the cartesian product, last axis fastest); 'axis' varies
+    one axis at a time with the others left at `base`, axis by axis.
+    """
+    if mode not in SENSITIVITY_MODES:
+        raise ValueError(f"mode must be one of {', '.join(SENSITIVITY_MODES)}")
+    unknown = [a for a in axes if a not in INTEREST_AXES]
+    if unknown or not axes:
+        raise ValueError(f"axes must be a non-empty subset of {', '.join(INTEREST_AXES)}")
+    origin = np.array([float(base[a]) for a in INTEREST_AXES])
+    columns = [INTEREST_AXES.index(a) for a in axes]
+    if mode == 'grid':
+        combos = np.array(list(itertools.product(values, repeat=len(columns))), dtype=float)
+        points = np.repeat(origin[None, :], len(combos), axis=0)
+        points[:, columns] = combos
+        return points
+    points = np.repeat(origin[None, :], len(columns) * len(values), axis=0)
+    for i, col in enumerate(columns):
+        points[i * len(values):(i + 1) * len(values), col] = values
+    return points
+
+
+def interest_fit(roles, interests):
+    """(a + b) / 10 for each role's two sliders, per row of `interests`."""
+    interests = np.asarray(interests, dtype=float)
+    fit = np.full((len(interests), len(roles)), (3 + 3) / 10.0)
+    for j, role in enumerate(roles):
+        pair = ROLE_INTEREST_AXES.get(role)
+        if pair:
+            a, b = (INTEREST_AXES.index(axis) for axis in pair)
+            fit[:, j] = (interests[:, a] + interests[:, b]) / 10.0
+    return fit
+
+
+def rule_scores(roles, role_required, user_skills, interests, motivation, risk_num, temperature=0.8):
+    """(raw blend, softmax scores), each (len(interests), len(roles))."""
+    user_set = set(user_skills)
+    skill_fit = np.array([
+        len(set(role_required.get(role, [])) & user_set) / max(len(role_required.get(role, [])), 1)
+        for role in roles
+    ])
+    mot_norm = min(max(motivation, 0), 100) / 100.0
+    risk_norm = RISK_NORM.get(risk_num, 0.5)
+    raw = 0.55 * skill_fit + 0.25 * interest_fit(roles, interests) + 0.1 * mot_norm + 0.1 * risk_norm
+    logits = raw / temperature
+    exps = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return raw, exps / exps.sum(axis=1, keepdims=True)
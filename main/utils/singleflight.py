@@ -0,0 +1,77 @@
+"""Request coalescing ("single-flight") for identical concurrent calls.
+
+When many requests need the same expensive result at the same moment, such
+as a cohort starting the same mock interview, only the first caller (the
+leader) runs the function. Callers that arrive while it is in flight wait for
+its outcome and share it: the same return value, or the same exception
+re-raised. Nothing is cached after the call completes, so a later request
+starts a fresh generation.
+
+Coalescing is per process (threads of one web worker).
+"""
+import threading
+
+
+class SingleFlightTimeout(TimeoutError):
+    """A follower gave up waiting for the in-flight call."""
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {'leaders': 0, 'coalesced': 0, 'errors': 0, 'timeouts': 0}
+
+    def do(self, key, fn, *args, timeout: float = None, **kwargs):
+        """Run `fn(*args, **kwargs)` once per `key` among concurrent callers.
+
+        Followers wait at most `timeout` seconds (None waits forever) and then
+        raise SingleFlightTimeout; the leader keeps running for the others.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._counters['leaders'] += 1
+                leader = True
+            else:
+                call.followers += 1
+                self._counters['coalesced'] += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self._counters['timeouts'] += 1
+                raise SingleFlightTimeout(f"timed out after {timeout}s waiting for in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self._counters['errors'] += 1
+            raise
+        finally:
+            # Remove before signalling so callers arriving afterwards start a new flight
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, 'in_flight': len(self._calls)}
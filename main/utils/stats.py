@@ -0,0 +1,55 @@
+"""Home-page statistics backed by the StatCounter table.
+
+`index()` used to run COUNT(*) over four tables on every view, which is a full
+scan each on SQLite. The counts now live in StatCounter rows, adjusted by
+post_save/post_delete handlers (main/signals.py) and by code paths that
+bypass signals, such as `bulk_create` in the write-behind buffer.
+
+Functions:
+  - get_stats() -> {'conversations': int, 'profiles': int, ...}
+  - increment(name, delta=1)
+  - recount() -> exact counts, rewritten into StatCounter
+"""
+from django.db.models import F
+
+from ..models import Conversation, InterviewAttempt, Profile, Resume, StatCounter
+
+COUNTED_MODELS = {
+    'conversations': Conversation,
+    'profiles': Profile,
+    'interviews': InterviewAttempt,
+    'resumes': Resume,
+}
+
+
+def counter_name(model):
+    for name, counted in COUNTED_MODELS.items():
+        if counted is model:
+            return name
+    return None
+
+
+def increment(name: str, delta: int = 1) -> None:
+    """Atomically adjust a counter; creates it from an exact count if missing."""
+    if not StatCounter.objects.filter(name=name).update(value=F('value') + delta):
+        _store(name, COUNTED_MODELS[name].objects.count())
+
+
+def get_stats() -> dict:
+    """Return all counters with a single primary-key range read."""
+    stats = dict(StatCounter.objects.filter(name__in=COUNTED_MODELS).values_list('name', 'value'))
+    for name in COUNTED_MODELS:
+        if name not in stats:
+            # First use after deploy or a wiped table: seed from an exact count once
+            stats[name] = _store(name, COUNTED_MODELS[name].objects.count())
+    return {name: max(0, stats[name]) for name in COUNTED_MODELS}
+
+
+def recount() -> dict:
+    """Recompute every counter exactly and store the result."""
+    return {name: _store(name, model.objects.count()) for name, model in COUNTED_MODELS.items()}
+
+
+def _store(name: str, value: int) -> int:
+    StatCounter.objects.update_or_create(name=name, defaults={'value': value})
+    return value
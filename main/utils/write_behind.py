@@ -0,0 +1,192 @@
+"""Write-behind persistence for recommend_api.
+
+`recommend_api` stores a Profile, its Recommendation and the per-role
+RecommendationItem rows on every call. Doing
+that synchronously puts two INSERTs on the latency path of the busiest
+endpoint, so the view hands unsaved model instances to `WriteBehindBuffer`
+and returns immediately. A daemon thread flushes the buffer with
+`bulk_create` whenever `MAX_BATCH` records are waiting or `FLUSH_INTERVAL`
+seconds have passed, and once more at interpreter shutdown.
+
+The queue is bounded by `MAX_PENDING`, which caps how many records can be
+lost if the process dies before a flush. When it is full, `submit` falls back
+to writing on the caller's thread rather than dropping data. A batch that
+still hits "database is locked" after `retry_on_locked` gives up is put back
+on the queue and retried by the next flush, so a lock storm delays writes
+instead of losing them; records are only dropped (and logged) when the queue
+has no room left for them.
+
+Configured through settings.WRITE_BEHIND; set ENABLED to False to write
+synchronously (used by the test suite).
+"""
+import atexit
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+
+from ..models import Profile, Recommendation, RecommendationItem
+from . import stats
+from .db import is_lock_error, retry_on_locked
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAX_BATCH': 200,
+    'FLUSH_INTERVAL': 1.0,
+    'MAX_PENDING': 5000,
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'WRITE_BEHIND', {})}
+
+
+class WriteBehindBuffer:
+    """Bounded in-memory queue of (Profile, [Recommendation], [RecommendationItem]) records.
+
+    With background=False no worker thread is started and records are only
+    written by explicit `flush()`/`close()` calls.
+    """
+
+    def __init__(self, max_batch=None, flush_interval=None, max_pending=None, background=True):
+        cfg = _config()
+        self.background = background
+        self.max_batch = max_batch or cfg['MAX_BATCH']
+        self.flush_interval = flush_interval or cfg['FLUSH_INTERVAL']
+        self._queue = queue.Queue(maxsize=max_pending or cfg['MAX_PENDING'])
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.flushed = 0
+        self.requeued = 0
+        self.dropped = 0
+
+    def submit(self, profile, recommendations=(), items=()):
+        """Queue an unsaved profile, recommendations that reference it and their items."""
+        item = (profile, list(recommendations), list(items))
+        if not _config()['ENABLED'] or self._stopping.is_set():
+            self._write([item])
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            logger.warning("Write-behind queue full; writing on the request thread")
+            self._write([item])
+            return
+        self._ensure_worker()
+        if self._queue.qsize() >= self.max_batch:
+            self._wake.set()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> int:
+        """Drain everything queued so far; returns the number of profiles written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = []
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    break
+                if not self._write(batch):
+                    # The batch went back on the queue; try again on the next flush
+                    break
+                written += len(batch)
+        return written
+
+    def close(self):
+        """Stop the worker and flush whatever is left."""
+        self._stopping.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout=10)
+        self.flush()
+        if self.pending():
+            logger.error(f"Write-behind closed with {self.pending()} profiles still unwritten")
+
+    def _ensure_worker(self):
+        if not self.background:
+            return
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self.flush()
+        finally:
+            connection.close()
+
+    def _write(self, items) -> bool:
+        """Insert a batch; returns False when it was re-queued or dropped instead."""
+        try:
+            retry_on_locked(self._bulk_insert, items)
+            self.flushed += len(items)
+            return True
+        except Exception as exc:
+            if isinstance(exc, OperationalError) and is_lock_error(exc):
+                self._requeue(items, exc)
+            else:
+                logger.error(f"Write-behind flush of {len(items)} profiles failed: {exc}")
+            return False
+
+    def _requeue(self, items, exc):
+        kept = 0
+        for profile, recs, ris in items:
+            _reset(profile, recs, ris)
+            try:
+                self._queue.put_nowait((profile, recs, ris))
+                kept += 1
+            except queue.Full:
+                break
+        self.requeued += kept
+        self.dropped += len(items) - kept
+        if kept < len(items):
+            logger.error(f"Write-behind queue full; dropped {len(items) - kept} locked profiles: {exc}")
+        else:
+            logger.warning(f"Database still locked; re-queued {kept} profiles for the next flush")
+        self._ensure_worker()
+
+    @staticmethod
+    def _bulk_insert(items):
+        with transaction.atomic():
+            Profile.objects.bulk_create([profile for profile, _, _ in items])
+            # bulk_create fills in the pks, which the dependent rows pick up
+            # through their `profile`/`recommendation` attributes
+            Recommendation.objects.bulk_create([rec for _, recs, _ in items for rec in recs])
+            RecommendationItem.objects.bulk_create([ri for _, _, ris in items for ri in ris])
+            # bulk_create skips post_save, so the home-page counter is bumped here
+            stats.increment('profiles', len(items))
+
+
+def _reset(profile, recs, ris):
+    """Forget pks a rolled-back bulk_create may have assigned, so a retry inserts fresh rows."""
+    profile.pk = None
+    profile._state.adding = True
+    for rec in recs:
+        rec.pk, rec.profile_id = None, None
+        rec._state.adding = True
+    for ri in ris:
+        ri.pk, ri.recommendation_id = None, None
+        ri._state.adding = True
+
+
+buffer = WriteBehindBuffer()
+atexit.register(buffer.close)
@@ -1,13 +1,18 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse, HttpResponse
-import io
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from django.urls import reverse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from .models import (Post, Conversation, Message, Profile, Recommendation, 
-                     InterviewAttempt, Resume, CoverLetter)
+from django.db import connection
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+from .models import (Post, Conversation, Message, Profile, Recommendation, RecommendationItem,
+                     InterviewAttempt, Resume, CoverLetter, Job)
 from .forms import ProfileForm, ResumeForm, CoverLetterForm
+from datetime import timedelta
+import hashlib
 import json
 import requests
 import logging
@@ -16,6 +21,10 @@ import numpy as np
 import joblib
 from pathlib import Path
 from .utils.sentiment import analyze_text, analyze_sentiment
+from .utils.db import create_with_retry, retry_on_locked
+from .utils import chat_context, deadline, ollama, resume_pdf, role_scoring, stats, write_behind
+from .utils.singleflight import SingleFlight, SingleFlightTimeout
+from . import jobs
 
 logger = logging.getLogger(__name__)
 
@@ -72,12 +81,52 @@ ALL_CAREER_ROLES = [
     "Robotics Engineer", "Blockchain Developer"
 ]
 
-OLLAMA_URL = "http://localhost:11434"
-OLLAMA_MODEL = "mistral"
 USE_LOCAL_MODEL = True
 
 
+class LLMError(RuntimeError):
+    """Raised when an Ollama call fails and the caller asked for an exception."""
+
+
+ollama_flights = SingleFlight()
+
+
 def call_ollama(prompt: str, system_prompt: str = "", timeout: int = 180, retries: int = 4, backoff: float = 2.0) -> str:
+    """Call Ollama, coalescing identical concurrent prompts into one generation.
+
+    Requests with the same model, system prompt and prompt that arrive while
+    one is in flight wait for it and share its response (see
+    main/utils/singleflight.py). Arguments are those of `_call_ollama`.
+
+    The leader runs under its own request deadline. A follower that gets
+    DEADLINE_ERROR back while its own deadline is not spent (a background job,
+    or a request with a larger budget) tries once more, leading a new flight
+    on its own budget.
+    """
+    if deadline.exhausted():
+        return deadline.DEADLINE_ERROR
+    fingerprint = hashlib.sha256(
+        json.dumps([ollama.model_name(), system_prompt, prompt]).encode('utf-8')
+    ).hexdigest()
+    worst_case = timeout * retries + sum(backoff ** a for a in range(1, retries))
+    for attempt in (1, 2):
+        try:
+            result = ollama_flights.do(
+                fingerprint, _call_ollama, prompt, system_prompt, timeout, retries, backoff,
+                timeout=deadline.clamp(worst_case),
+            )
+        except SingleFlightTimeout:
+            if deadline.exhausted():
+                return deadline.DEADLINE_ERROR
+            return "Error: Timed out waiting for an identical in-flight Ollama request."
+        own = deadline.current()
+        if result != deadline.DEADLINE_ERROR or (own is not None and own.exceeded) or deadline.exhausted():
+            return result
+        logger.debug("Shared Ollama flight hit the leader's deadline; retrying on this caller's budget")
+    return result
+
+
+def _call_ollama(prompt: str, system_prompt: str = "", timeout: int = 180, retries: int = 4, backoff: float = 2.0) -> str:
     """Call Ollama API to generate response with retries and backoff.
 
     Args:
@@ -89,21 +138,41 @@ def call_ollama(prompt: str, system_prompt: str = "", timeout: int = 180, retrie
 
     Returns:
         string response from Ollama or a helpful error message
+
+    An active request deadline (main/utils/deadline.py) caps every attempt's
+    timeout and every backoff sleep; once it is spent DEADLINE_ERROR is
+    returned.
     """
+    if ollama.is_cold():
+        # The warmer is still loading the model; answer now so the view can fall back
+        return "Error: The AI model is still loading. Please try again in a moment."
+
     payload = {
-        "model": OLLAMA_MODEL,
+        "model": ollama.model_name(),
         "prompt": prompt,
         "stream": False,
+        "keep_alive": ollama.keep_alive(),
         "system": system_prompt if system_prompt else "You are a helpful career guidance AI assistant."
     }
-    url = f"{OLLAMA_URL}/api/generate"
+    url = f"{ollama.base_url()}/api/generate"
+
+    def backoff_sleep(seconds):
+        """Sleep before the next attempt unless the deadline would pass first."""
+        if deadline.exhausted(seconds + deadline.MIN_ATTEMPT_SECONDS):
+            return False
+        time.sleep(seconds)
+        return True
 
     last_exception = None
     for attempt in range(1, retries + 1):
+        if deadline.exhausted():
+            return deadline.DEADLINE_ERROR
+        attempt_timeout = deadline.clamp(timeout)
         try:
-            logger.debug(f"Calling Ollama (attempt {attempt}) with timeout={timeout}")
-            response = requests.post(url, json=payload, timeout=timeout)
+            logger.debug(f"Calling Ollama (attempt {attempt}) with timeout={attempt_timeout}")
+            response = requests.post(url, json=payload, timeout=attempt_timeout)
             if response.status_code == 200:
+                ollama.mark_ready()
                 # Prefer JSON 'response' key but fallback to raw text
                 try:
                     return response.json().get("response", response.text)
@@ -115,31 +184,39 @@ def call_ollama(prompt: str, system_prompt: str = "", timeout: int = 180, retrie
         except requests.exceptions.ReadTimeout as rte:
             last_exception = rte
             logger.warning(f"Ollama read timeout on attempt {attempt}: {rte}")
+            if deadline.exhausted():
+                return deadline.DEADLINE_ERROR
             if attempt == retries:
+                ollama.report_slow(f"read timeout: {rte}")
                 return ("Error: Ollama request timed out while reading the response. This often happens if the model is loading or the host is busy. "
                         "Ensure Ollama is running (`ollama serve`) and the model is pulled (`ollama pull <model>`). Try again or increase the timeout.")
-            sleep_for = backoff ** attempt
-            time.sleep(sleep_for)
+            if not backoff_sleep(backoff ** attempt):
+                return deadline.DEADLINE_ERROR
             continue
         except requests.exceptions.Timeout as te:
             last_exception = te
             logger.warning(f"Ollama timeout on attempt {attempt}: {te}")
+            if deadline.exhausted():
+                return deadline.DEADLINE_ERROR
             if attempt == retries:
+                ollama.report_slow(f"timeout: {te}")
                 return ("Error: Ollama request timed out. This can happen when the model is loading (first call may take a while). "
                         "Ensure Ollama is running (`ollama serve`) and the model is pulled. You can increase the timeout in settings or try again.")
-            sleep_for = backoff ** attempt
-            time.sleep(sleep_for)
+            if not backoff_sleep(backoff ** attempt):
+                return deadline.DEADLINE_ERROR
             continue
         except requests.exceptions.ConnectionError as ce:
             last_exception = ce
             logger.error(f"Cannot connect to Ollama: {ce}")
+            ollama.mark_unavailable(f"connection error: {ce}")
             return "Error: Cannot connect to Ollama. Make sure Ollama is running (ollama serve)"
         except Exception as e:
             last_exception = e
             logger.error(f"Ollama error on attempt {attempt}: {e}")
             if attempt == retries:
                 return f"Error: {str(e)}"
-            time.sleep(backoff ** attempt)
+            if not backoff_sleep(backoff ** attempt):
+                return deadline.DEADLINE_ERROR
 
     # If we exit loop without return
     if last_exception:
@@ -147,15 +224,88 @@ def call_ollama(prompt: str, system_prompt: str = "", timeout: int = 180, retrie
     return "Error: Ollama call failed unexpectedly"
 
 
+def llm_deadline(name: str):
+    """Deadline context for an LLM-backed view, from settings.LLM_DEADLINES."""
+    seconds = getattr(settings, 'LLM_DEADLINES', {}).get(name)
+    return deadline.deadline(seconds if seconds else float('inf'))
+
+
+def schedule_upgrade(kind: str, payload: dict) -> dict:
+    """Queue a background job that replaces a fallback answer with a model answer."""
+    if not getattr(settings, 'LLM_BACKGROUND_UPGRADE', False):
+        return {}
+    job = jobs.enqueue(kind, payload)
+    return {'upgrade_job_id': job.pk, 'upgrade_status_url': reverse('job_status_api', args=[job.token])}
+
+
+def wants_async(data) -> bool:
+    """True when the request body asks for background processing ({"async": true})."""
+    return str(data.get('async', '')).lower() in ('1', 'true', 'yes')
+
+
+def enqueue_job_response(kind: str, payload: dict) -> JsonResponse:
+    """Queue a background job and answer 202 with the URL to poll."""
+    job = jobs.enqueue(kind, payload)
+    return JsonResponse({
+        'job_id': job.pk,
+        'status': job.status,
+        'status_url': reverse('job_status_api', args=[job.token]),
+    }, status=202)
+
+
+@require_http_methods(["GET"])
+def job_status_api(request, token):
+    """Poll a background job created by an endpoint's async mode.
+
+    Jobs are looked up by their unguessable token (the status_url handed out
+    when the job was queued), so one caller cannot read another's results.
+    """
+    try:
+        job = Job.objects.get(token=token)
+    except Job.DoesNotExist:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(jobs.job_state(job))
+
+
+def submit_recommendation(profile, ranked, source):
+    """Queue a profile with its (role, score) ranking for write-behind storage.
+
+    The comma-joined `recommended_roles` column is still written for existing
+    readers; RecommendationItem rows carry rank, score and the scorer that
+    produced it (`source`) for SQL analytics.
+    """
+    if not ranked:
+        write_behind.buffer.submit(profile)
+        return
+    rec = Recommendation(profile=profile, recommended_roles=','.join(role for role, _ in ranked))
+    items = [
+        RecommendationItem(recommendation=rec, role=role, rank=rank, source=source,
+                           score=float(score) if score is not None else None)
+        for rank, (role, score) in enumerate(ranked, start=1)
+    ]
+    write_behind.buffer.submit(profile, [rec], items)
+
+
+@require_http_methods(["GET"])
+def ollama_ready_api(request):
+    """Readiness probe: 200 once the model is loaded, 503 while it is cold."""
+    state = ollama.status()
+    if not state['warmer_running'] and request.GET.get('check') == '1':
+        # No warmer in this process: ask Ollama directly
+        state['ready'] = ollama.is_loaded()
+    return JsonResponse(state, status=200 if state['ready'] else 503)
+
+
+@require_http_methods(["GET"])
+def ollama_stats_api(request):
+    """Request-coalescing counters for this worker process."""
+    return JsonResponse({'singleflight': ollama_flights.stats()})
+
+
 def index(request):
     """Home page with feature overview."""
-    stats = {
-        'conversations': Conversation.objects.count(),
-        'profiles': Profile.objects.count(),
-        'interviews': InterviewAttempt.objects.count(),
-        'resumes': Resume.objects.count(),
-    }
-    return render(request, 'main/index.html', stats)
+    # Denormalized counters (main/utils/stats.py) instead of COUNT(*) scans
+    return render(request, 'main/index.html', stats.get_stats())
 
 
 def post_detail(request, pk):
@@ -224,20 +374,22 @@ def chat_api(request):
             try:
                 conversation = Conversation.objects.get(pk=conv_id)
             except Conversation.DoesNotExist:
-                conversation = Conversation.objects.create(title=text[:50])
+                conversation = create_with_retry(Conversation, title=text[:50])
         else:
-            conversation = Conversation.objects.create(title=text[:50])
+            conversation = create_with_retry(Conversation, title=text[:50])
             request.session['current_conversation'] = conversation.pk
         
         # Save user message
-        Message.objects.create(conversation=conversation, role='user', text=text)
+        create_with_retry(Message, conversation=conversation, role='user', text=text)
         
-        # Get AI response from Ollama
+        # Get AI response from Ollama, with recent turns and a rolling summary as context
         system_prompt = "You are a helpful career guidance AI advisor. Provide thoughtful, professional advice about careers, skills, and professional development."
-        ai_response = call_ollama(text, system_prompt)
+        with llm_deadline('chat_summary'):
+            prompt = chat_context.build_prompt(conversation, call_ollama) or text
+        ai_response = call_ollama(prompt, system_prompt)
         
         # Save assistant response
-        Message.objects.create(conversation=conversation, role='assistant', text=ai_response)
+        create_with_retry(Message, conversation=conversation, role='assistant', text=ai_response)
         
         return JsonResponse({
             'response': ai_response,
@@ -252,6 +404,90 @@ def recommendations_page(request):
     return render(request, 'main/recommendations_new.html')
 
 
+def _recommend_inputs(data):
+    """Normalize a recommend_api request body into (predictor payload, skill tokens)."""
+    education = str(data.get('education', 'UG') or 'UG').strip()
+    experience = int(str(data.get('experience', '0') or '0').strip() or 0)
+
+    skills_raw = data.get('skills')
+    if isinstance(skills_raw, list):
+        skill_tokens = [str(s).strip().lower() for s in skills_raw if str(s).strip()]
+    else:
+        skill_tokens = [s.strip().lower() for s in str(skills_raw or '').split(',') if s.strip()]
+
+    token_to_name = {
+        'python': 'Python',
+        'java': 'Java',
+        'javascript': 'JavaScript',
+        'sql': 'SQL',
+        'react': 'React',
+        'docker': 'Docker',
+        'kubernetes': 'Kubernetes',
+        'aws': 'AWS',
+        'cloud': 'AWS',
+        'statistics': 'Statistics',
+        'data_viz': 'Tableau',
+        'ux_research': 'User Research',
+        'ui_design': 'UI Design',
+        'problem_solving': 'Problem Solving',
+        'communication': 'Communication'
+    }
+    user_skills = [token_to_name.get(t, t.title()) for t in skill_tokens]
+
+    risk = str(data.get('risk_taking', 'medium') or 'medium').lower()
+    risk_map = {'low': 2, 'medium': 3, 'high': 5}
+    risk_num = risk_map.get(risk, 3)
+
+    work_pref = str(data.get('work_preference', 'team') or 'team')
+    sentiment = str(data.get('sentiment', 'neutral') or 'neutral')
+    motivation = int(data.get('motivation', data.get('motivation_score', 70) or 70))
+
+    payload = {
+        'age': 25,
+        'education': education or 'UG',
+        'field_of_study': 'CS',
+        'skills': user_skills,
+        'personality': 'ambivert',
+        'risk_taking': risk_num,
+        'work_preference': work_pref,
+        'motivation_score': motivation,
+        'sentiment': sentiment,
+        'years_experience': experience,
+        'desired_roles': []
+    }
+
+    interests = data.get('interests') or {}
+    try:
+        payload['interest_data'] = int(interests.get('data', 3))
+        payload['interest_programming'] = int(interests.get('programming', 3))
+        payload['interest_design'] = int(interests.get('design', 3))
+        payload['interest_management'] = int(interests.get('management', 3))
+    except Exception:
+        payload['interest_data'] = 3
+        payload['interest_programming'] = 3
+        payload['interest_design'] = 3
+        payload['interest_management'] = 3
+
+    return payload, skill_tokens
+
+
+def _role_configs():
+    """(roles, role_required, skill_courses) for the rule-based scorer."""
+    try:
+        cfg_dir = Path(__file__).resolve().parents[1] / 'src' / 'configs'
+        role_required = json.loads((cfg_dir / 'role_required_skills.json').read_text())
+        skill_courses = json.loads((cfg_dir / 'skill_to_course.json').read_text())
+    except Exception:
+        role_required = {}
+        skill_courses = {}
+
+    roles = list(role_required.keys()) or [
+        'Software Developer','Data Scientist','Data Analyst','Full Stack Developer','Frontend Developer','Backend Developer',
+        'Machine Learning Engineer','Product Manager','Business Analyst','Blockchain Developer'
+    ]
+    return roles, role_required, skill_courses
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def recommend_api(request):
@@ -259,72 +495,14 @@ def recommend_api(request):
         data = json.loads(request.body.decode('utf-8'))
         name = str(data.get('name', 'User') or 'User').strip()
         email = str(data.get('email', '') or '').strip()
-        education = str(data.get('education', 'UG') or 'UG').strip()
-        experience = int(str(data.get('experience', '0') or '0').strip() or 0)
-
-        skills_raw = data.get('skills')
-        if isinstance(skills_raw, list):
-            skill_tokens = [str(s).strip().lower() for s in skills_raw if str(s).strip()]
-        else:
-            skill_tokens = [s.strip().lower() for s in str(skills_raw or '').split(',') if s.strip()]
-
-        token_to_name = {
-            'python': 'Python',
-            'java': 'Java',
-            'javascript': 'JavaScript',
-            'sql': 'SQL',
-            'react': 'React',
-            'docker': 'Docker',
-            'kubernetes': 'Kubernetes',
-            'aws': 'AWS',
-            'cloud': 'AWS',
-            'statistics': 'Statistics',
-            'data_viz': 'Tableau',
-            'ux_research': 'User Research',
-            'ui_design': 'UI Design',
-            'problem_solving': 'Problem Solving',
-            'communication': 'Communication'
-        }
-        user_skills = [token_to_name.get(t, t.title()) for t in skill_tokens]
-
-        risk = str(data.get('risk_taking', 'medium') or 'medium').lower()
-        risk_map = {'low': 2, 'medium': 3, 'high': 5}
-        risk_num = risk_map.get(risk, 3)
+        payload, skill_tokens = _recommend_inputs(data)
+        user_skills = payload['skills']
+        risk_num = payload['risk_taking']
+        sentiment = payload['sentiment']
+        motivation = payload['motivation_score']
 
-        work_pref = str(data.get('work_preference', 'team') or 'team')
-        sentiment = str(data.get('sentiment', 'neutral') or 'neutral')
-        motivation = int(data.get('motivation', data.get('motivation_score', 70) or 70))
-
-        try:
-            profile = Profile.objects.create(name=name, email=email)
-        except Exception:
-            profile = None
-
-        payload = {
-            'age': 25,
-            'education': education or 'UG',
-            'field_of_study': 'CS',
-            'skills': user_skills,
-            'personality': 'ambivert',
-            'risk_taking': risk_num,
-            'work_preference': work_pref,
-            'motivation_score': motivation,
-            'sentiment': sentiment,
-            'years_experience': experience,
-            'desired_roles': []
-        }
-
-        interests = data.get('interests') or {}
-        try:
-            payload['interest_data'] = int(interests.get('data', 3))
-            payload['interest_programming'] = int(interests.get('programming', 3))
-            payload['interest_design'] = int(interests.get('design', 3))
-            payload['interest_management'] = int(interests.get('management', 3))
-        except Exception:
-            payload['interest_data'] = 3
-            payload['interest_programming'] = 3
-            payload['interest_design'] = 3
-            payload['interest_management'] = 3
+        # Saved later by the write-behind buffer, together with its recommendation
+        profile = Profile(name=name, email=email)
 
         if not USE_LOCAL_MODEL:
             try:
@@ -337,15 +515,11 @@ def recommend_api(request):
                     emotion = result.get('emotion') or {}
                     market_trend = result.get('market_trend') or {}
 
-                    try:
-                        roles_for_storage = [rec.get('role') for rec in recommendations if rec.get('role')]
-                        if roles_for_storage and profile:
-                            Recommendation.objects.create(
-                                profile=profile,
-                                recommended_roles=','.join(roles_for_storage[:5])
-                            )
-                    except Exception:
-                        pass
+                    ranked_for_storage = [
+                        (rec.get('role'), rec.get('score'))
+                        for rec in recommendations if isinstance(rec, dict) and rec.get('role')
+                    ]
+                    submit_recommendation(profile, ranked_for_storage[:5], 'predictor')
 
                     # Generate job estimates based on real Bureau of Labor Statistics (BLS) data
                     # Source: U.S. BLS Occupational Outlook Handbook (2024-2025)
@@ -470,18 +644,7 @@ def recommend_api(request):
         local_recs = predict_roles_local(skill_tokens)
         local_top = [(rec['role'], rec['score'], rec['score']) for rec in local_recs] if local_recs else []
 
-        try:
-            cfg_dir = Path(__file__).resolve().parents[1] / 'src' / 'configs'
-            role_required = json.loads((cfg_dir / 'role_required_skills.json').read_text())
-            skill_courses = json.loads((cfg_dir / 'skill_to_course.json').read_text())
-        except Exception:
-            role_required = {}
-            skill_courses = {}
-
-        roles = list(role_required.keys()) or [
-            'Software Developer','Data Scientist','Data Analyst','Full Stack Developer','Frontend Developer','Backend Developer',
-            'Machine Learning Engineer','Product Manager','Business Analyst','Blockchain Developer'
-        ]
+        roles, role_required, skill_courses = _role_configs()
 
         interests = data.get('interests') or {}
         interest_data = int(interests.get('data', 3))
@@ -489,45 +652,15 @@ def recommend_api(request):
         interest_design = int(interests.get('design', 3))
         interest_mgmt = int(interests.get('management', 3))
 
-        role_interest = {
-            'Data Scientist': (interest_data, interest_prog),
-            'Data Analyst': (interest_data, interest_prog),
-            'Machine Learning Engineer': (interest_data, interest_prog),
-            'Software Developer': (interest_prog, interest_data),
-            'Full Stack Developer': (interest_prog, interest_design),
-            'Frontend Developer': (interest_design, interest_prog),
-            'Backend Developer': (interest_prog, interest_data),
-            'Product Manager': (interest_mgmt, interest_design),
-            'Business Analyst': (interest_mgmt, interest_data),
-            'Blockchain Developer': (interest_prog, interest_data),
-        }
-
         user_set = set([s.strip() for s in user_skills])
-        exp_norm = min(experience / 5.0, 1.0)
-        risk_norm = {2:0.2,3:0.5,5:1.0}.get(risk_num,0.5)
-        mot_norm = min(max(motivation,0),100)/100.0
 
         if local_top:
             top = local_top
         else:
-            raw_scores = []
-            for role in roles:
-                required = role_required.get(role, [])
-                overlap = len(set(required) & user_set)
-                skill_fit = overlap / max(len(required),1) if required else 0.0
-                a,b = role_interest.get(role,(3,3))
-                interest_fit = (a+b)/10.0
-                raw = 0.55*skill_fit + 0.25*interest_fit + 0.1*mot_norm + 0.1*risk_norm
-                raw_scores.append((role, raw))
-
-            import math
-            temperature = 0.8
-            logits = [s/temperature for _,s in raw_scores]
-            maxlog = max(logits) if logits else 0.0
-            exps = [math.exp(l-maxlog) for l in logits]
-            denom = sum(exps) if exps else 1.0
-            scores = [e/denom for e in exps]
-            ranked = sorted(zip(roles, scores, raw_scores), key=lambda x: x[1], reverse=True)
+            interests_row = [[interest_data, interest_prog, interest_design, interest_mgmt]]
+            raw, scores = role_scoring.rule_scores(roles, role_required, user_set, interests_row, motivation, risk_num)
+            raw_scores = list(zip(roles, raw[0].tolist()))
+            ranked = sorted(zip(roles, scores[0].tolist(), raw_scores), key=lambda x: x[1], reverse=True)
             top = ranked[:5]
 
         top_role = top[0][0] if top else roles[0]
@@ -547,11 +680,7 @@ def recommend_api(request):
             'Software Developer': 'stable','UX/UI Designer': 'stable','Product Manager': 'stable','Data Analyst': 'stable'
         }
 
-        try:
-            if profile:
-                Recommendation.objects.create(profile=profile, recommended_roles=','.join([r for r,_,_ in top]))
-        except Exception:
-            pass
+        submit_recommendation(profile, [(r, sc) for r, sc, _ in top], 'role_matcher' if local_top else 'rules')
 
         # Build series for top roles
         # Generate job estimates based on real Bureau of Labor Statistics (BLS) data
@@ -677,6 +806,187 @@ def recommend_api(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+MAX_SENSITIVITY_POINTS = 5000
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def recommend_sensitivity_api(request):
+    """Role scores over many interest-slider settings in one batched pass.
+
+    Body: the recommend_api profile plus optional
+      mode   'grid' (all combinations, default) or 'axis' (one slider at a time)
+      axes   subset of data/programming/design/management (default all four)
+      values slider values to try (default 1-5)
+    Returns roles, the slider points ([data, programming, design, management]
+    per row) and one row of role scores per point, scored the way
+    recommend_api would score them, so the page can interpolate locally.
+    Scores from the role matcher do not depend on the sliders; the response
+    says so with slider_dependent=false.
+    """
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+        mode = str(data.get('mode') or 'grid')
+        axes = data.get('axes') or list(role_scoring.INTEREST_AXES)
+        values = [int(v) for v in (data.get('values') or role_scoring.SLIDER_VALUES)]
+        payload, skill_tokens = _recommend_inputs(data)
+        base = {axis: payload[f'interest_{axis}'] for axis in role_scoring.INTEREST_AXES}
+        n_points = len(values) ** len(axes) if mode == 'grid' else len(values) * len(axes)
+        if n_points > MAX_SENSITIVITY_POINTS:
+            return JsonResponse({'error': f'{n_points} points requested; at most {MAX_SENSITIVITY_POINTS}'}, status=400)
+        points = role_scoring.slider_points(base, mode=mode, axes=axes, values=values)
+    except (ValueError, TypeError, AttributeError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    try:
+        result = {
+            'mode': mode,
+            'axes': list(axes),
+            'values': values,
+            'point_axes': list(role_scoring.INTEREST_AXES),
+            'points': points.astype(int).tolist(),
+        }
+        if mode == 'grid':
+            result['shape'] = [len(values)] * len(axes)
+
+        if not USE_LOCAL_MODEL:
+            try:
+                variants = [
+                    {f'interest_{axis}': int(v) for axis, v in zip(role_scoring.INTEREST_AXES, point)}
+                    for point in points
+                ]
+                r = requests.post('http://127.0.0.1:8001/sensitivity', json={**payload, 'variants': variants}, timeout=10)
+                if r.status_code == 200:
+                    scored = r.json()
+                    return JsonResponse({**result, 'source': 'predictor', 'slider_dependent': True,
+                                         'roles': scored['roles'], 'scores': scored['scores']})
+            except Exception as e:
+                logger.warning(f"Predictor sensitivity call failed: {e}")
+
+        local_recs = predict_roles_local(skill_tokens)
+        if local_recs:
+            row = [rec['score'] for rec in local_recs]
+            return JsonResponse({**result, 'source': 'role_matcher', 'slider_dependent': False,
+                                 'roles': [rec['role'] for rec in local_recs], 'scores': [row] * len(points)})
+
+        roles, role_required, _ = _role_configs()
+        user_set = set(s.strip() for s in payload['skills'])
+        _, scores = role_scoring.rule_scores(
+            roles, role_required, user_set, points, payload['motivation_score'], payload['risk_taking'])
+        return JsonResponse({**result, 'source': 'rules', 'slider_dependent': True,
+                             'roles': roles, 'scores': scores.tolist()})
+    except Exception as e:
+        logger.error(f"Recommendation sensitivity API error: {str(e)}")
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+ANALYTICS_BUCKETS = {'day': '%Y-%m-%d', 'week': '%Y-W%W', 'month': '%Y-%m'}
+ANALYTICS_PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def _analytics_since(request):
+    days = max(1, min(int(request.GET.get('days', 30)), 3650))
+    return timezone.now() - timedelta(days=days), days
+
+
+def _analytics_source(request):
+    source = request.GET.get('source', '').strip()
+    if source and source not in dict(RecommendationItem.SOURCE_CHOICES):
+        raise ValueError(f'source must be one of {", ".join(dict(RecommendationItem.SOURCE_CHOICES))}')
+    return source
+
+
+@require_http_methods(["GET"])
+def recommendation_role_stats_api(request):
+    """Role frequency over a time window, aggregated with GROUP BY.
+
+    Query params: days (default 30), top_k (only count ranks <= top_k, default 5),
+    source (optional scorer filter; avg_score mixes scales without it).
+    """
+    try:
+        since, days = _analytics_since(request)
+        top_k = int(request.GET.get('top_k', 5))
+        source = _analytics_source(request)
+        items = RecommendationItem.objects.filter(recommendation__created_at__gte=since, rank__lte=top_k)
+        if source:
+            items = items.filter(source=source)
+        rows = (
+            items
+            .values('role')
+            .annotate(
+                count=Count('id'),
+                top1=Count('id', filter=Q(rank=1)),
+                avg_score=Avg('score'),
+                avg_rank=Avg('rank'),
+            )
+            .order_by('-count', 'role')
+        )
+        return JsonResponse({'days': days, 'top_k': top_k, 'source': source or None, 'roles': list(rows)})
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        logger.error(f"Role stats API error: {str(e)}")
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@require_http_methods(["GET"])
+def recommendation_score_stats_api(request):
+    """Score percentiles per scorer, role and time bucket.
+
+    Query params: days (default 30), bucket (day/week/month, default day),
+    role and source (optional filters). The predictor, the role matcher and
+    the rules score on different scales, so every series belongs to one
+    source; legacy rows without a source form their own series (source '').
+    Percentiles are computed in SQLite with CUME_DIST so only one row per
+    (bucket, source, role) leaves the database.
+    """
+    try:
+        since, days = _analytics_since(request)
+        bucket = request.GET.get('bucket', 'day')
+        if bucket not in ANALYTICS_BUCKETS:
+            return JsonResponse({'error': f'bucket must be one of {", ".join(ANALYTICS_BUCKETS)}'}, status=400)
+        role = request.GET.get('role', '').strip()
+        source = _analytics_source(request)
+
+        item_table = RecommendationItem._meta.db_table
+        rec_table = Recommendation._meta.db_table
+        params = [ANALYTICS_BUCKETS[bucket], connection.ops.adapt_datetimefield_value(since)]
+        filters = ''
+        if role:
+            filters = 'AND i.role = %s'
+            params.append(role)
+        if source:
+            filters += ' AND i.source = %s'
+            params.append(source)
+        pct_cols = ', '.join(
+            f"MIN(CASE WHEN cd >= {p} THEN score END) AS p{int(p * 100)}" for p in ANALYTICS_PERCENTILES
+        )
+        sql = f"""
+            WITH scored AS (
+                SELECT strftime(%s, r.created_at) AS bucket, i.source AS source, i.role AS role, i.score AS score
+                FROM {item_table} i JOIN {rec_table} r ON r.id = i.recommendation_id
+                WHERE r.created_at >= %s AND i.score IS NOT NULL {filters}
+            ), ranked AS (
+                SELECT bucket, source, role, score,
+                       CUME_DIST() OVER (PARTITION BY bucket, source, role ORDER BY score) AS cd
+                FROM scored
+            )
+            SELECT bucket, source, role, COUNT(*) AS count, AVG(score) AS avg_score, {pct_cols}
+            FROM ranked GROUP BY bucket, source, role ORDER BY bucket, source, role
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            cols = [c[0] for c in cursor.description]
+            rows = [dict(zip(cols, row)) for row in cursor.fetchall()]
+        return JsonResponse({'days': days, 'bucket': bucket, 'role': role or None, 'source': source or None,
+                             'series': rows})
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        logger.error(f"Score stats API error: {str(e)}")
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 def interview_page(request):
     """Mock interview page."""
     return render(request, 'main/interview.html', {
@@ -698,10 +1008,19 @@ def interview_api(request):
     try:
         data = json.loads(request.body.decode('utf-8'))
         role = data.get('role', '').strip()
-        count = int(data.get('count', 5))
         
         if not role:
             return JsonResponse({'error': 'Role is required'}, status=400)
+
+        # Every question costs a model call share; cap what a client can ask for
+        max_count = getattr(settings, 'INTERVIEW_MCQ', {}).get('MAX_COUNT', MAX_MCQ_COUNT)
+        try:
+            count = int(data.get('count', 5))
+        except (TypeError, ValueError):
+            count = 0
+        if count < 1:
+            return JsonResponse({'error': f'count must be an integer between 1 and {max_count}'}, status=400)
+        count = min(count, max_count)
         
         # Validate role
         matching_role = None
@@ -716,104 +1035,216 @@ def interview_api(request):
                 'valid_roles': VALID_CAREER_ROLES
             }, status=400)
 
-        # Try to generate MCQs using Ollama (strict JSON)
-        import time as _t
-        t0 = _t.perf_counter()
-        mcqs = []
-        try:
-            prompt = (
-                f"Create {count} multiple-choice questions (MCQs) for the role: {matching_role}. "
-                "Return STRICT JSON with this exact schema and nothing else: "
-                "{\"mcqs\":[{\"question\":\"...\",\"options\":[\"A\",\"B\",\"C\",\"D\"],\"answer_index\":0}]} . "
-                "Each options array must have 4 concise choices. answer_index is 0-3. "
-                "Questions should be practical and role-appropriate."
-            )
-            resp = call_ollama(prompt)
-            try:
-                parsed = json.loads(resp)
-                mcqs = parsed.get('mcqs', []) if isinstance(parsed, dict) else []
-            except Exception:
-                mcqs = []
-        except Exception:
-            mcqs = []
-
-        # Fallback MCQ generator if AI fails
-        def fallback_mcqs(r: str, n: int):
-            base = [
-                {
-                    'question': f"Which of the following BEST aligns with a {r} core responsibility?",
-                    'options': [
-                        'Design and optimize systems relevant to the role',
-                        'Handle general office administration',
-                        'Plan company events',
-                        'Manage retail inventories'
-                    ],
-                    'answer_index': 0
-                },
-                {
-                    'question': f"In a {r} role, which tool/tech is MOST relevant?",
-                    'options': ['Git', 'Adobe Premiere', 'WordPress Themes', 'QuickBooks'],
-                    'answer_index': 0
-                },
-                {
-                    'question': f"What does a {r} typically use to validate solutions?",
-                    'options': ['Testing/Simulation', 'Random choice', 'Public voting', 'A/B clothing tests'],
-                    'answer_index': 0
-                },
-                {
-                    'question': f"Which practice improves outcomes for a {r}?",
-                    'options': ['Code reviews/peer review', 'Ignoring feedback', 'Skipping docs', 'Guessing requirements'],
-                    'answer_index': 0
-                },
-                {
-                    'question': f"For a {r}, what is MOST important when prioritizing tasks?",
-                    'options': ['Impact and risk', 'Alphabetical order', 'Color of tickets', 'Day of week'],
-                    'answer_index': 0
-                },
-            ]
-            out = []
-            i = 0
-            while len(out) < n:
-                out.append(base[i % len(base)])
-                i += 1
-            return out
-
-        if not mcqs or any(('question' not in q or 'options' not in q or 'answer_index' not in q) for q in mcqs):
-            mcqs = fallback_mcqs(matching_role, count)
-        else:
-            # Normalize and trim
-            norm = []
-            for q in mcqs[:count]:
-                opts = q.get('options', [])
-                if len(opts) < 4:
-                    # pad options if needed
-                    opts = (opts + ['N/A']*4)[:4]
-                norm.append({
-                    'question': str(q.get('question', '')).strip(),
-                    'options': [str(o).strip()[:120] for o in opts[:4]],
-                    'answer_index': int(q.get('answer_index', 0)) % 4
-                })
-            mcqs = norm
-
-        t1 = _t.perf_counter()
-
-        # Create interview attempt (for history)
-        ia = InterviewAttempt.objects.create(
-            role=matching_role,
-            questions=json.dumps(mcqs)
-        )
+        if wants_async(data):
+            return enqueue_job_response('interview_mcqs', {'role': matching_role, 'count': count})
 
-        return JsonResponse({
-            'mcqs': mcqs,
-            'attempt_id': ia.pk,
-            'role': matching_role,
-            'generation_ms': int((t1 - t0) * 1000)
-        })
+        with llm_deadline('interview_mcqs') as dl:
+            result = generate_interview(matching_role, count)
+        # Questions are shown right away, so fallback MCQs are not upgraded later
+        result['deadline_exceeded'] = dl.exceeded
+        return JsonResponse(result)
     except Exception as e:
         logger.error(f"Interview API error: {str(e)}")
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def fallback_mcqs(r: str, n: int):
+    """Deterministic MCQs used when the model is unavailable or returns bad JSON."""
+    base = [
+        {
+            'question': f"Which of the following BEST aligns with a {r} core responsibility?",
+            'options': [
+                'Design and optimize systems relevant to the role',
+                'Handle general office administration',
+                'Plan company events',
+                'Manage retail inventories'
+            ],
+            'answer_index': 0
+        },
+        {
+            'question': f"In a {r} role, which tool/tech is MOST relevant?",
+            'options': ['Git', 'Adobe Premiere', 'WordPress Themes', 'QuickBooks'],
+            'answer_index': 0
+        },
+        {
+            'question': f"What does a {r} typically use to validate solutions?",
+            'options': ['Testing/Simulation', 'Random choice', 'Public voting', 'A/B clothing tests'],
+            'answer_index': 0
+        },
+        {
+            'question': f"Which practice improves outcomes for a {r}?",
+            'options': ['Code reviews/peer review', 'Ignoring feedback', 'Skipping docs', 'Guessing requirements'],
+            'answer_index': 0
+        },
+        {
+            'question': f"For a {r}, what is MOST important when prioritizing tasks?",
+            'options': ['Impact and risk', 'Alphabetical order', 'Color of tickets', 'Day of week'],
+            'answer_index': 0
+        },
+    ]
+    out = []
+    i = 0
+    while len(out) < n:
+        out.append(base[i % len(base)])
+        i += 1
+    return out
+
+
+# interview_api clamps `count` to this unless settings.INTERVIEW_MCQ sets MAX_COUNT
+MAX_MCQ_COUNT = 20
+
+# Topic hints keep concurrent shards from producing the same questions
+MCQ_SHARD_TOPICS = [
+    'core concepts and fundamentals',
+    'tools and technologies',
+    'practical problem solving scenarios',
+    'best practices and quality',
+    'collaboration, planning and trade-offs',
+    'debugging and troubleshooting',
+    'architecture and design decisions',
+]
+
+
+def _mcq_prompt(role: str, n: int, topic: str = '') -> str:
+    focus = f"Focus on {topic}. " if topic else ""
+    return (
+        f"Create {n} multiple-choice questions (MCQs) for the role: {role}. {focus}"
+        "Return STRICT JSON with this exact schema and nothing else: "
+        "{\"mcqs\":[{\"question\":\"...\",\"options\":[\"A\",\"B\",\"C\",\"D\"],\"answer_index\":0}]} . "
+        "Each options array must have 4 concise choices. answer_index is 0-3. "
+        "Questions should be practical and role-appropriate."
+    )
+
+
+def parse_mcq_shard(resp: str) -> list:
+    """Validate one model reply and return its well-formed, normalized MCQs.
+
+    A malformed question only drops itself, not the rest of the shard.
+    """
+    try:
+        parsed = json.loads(resp)
+    except Exception:
+        # Models sometimes wrap the JSON in prose; try the outermost object
+        import re
+        m = re.search(r"\{.*\}", resp or '', re.S)
+        try:
+            parsed = json.loads(m.group(0)) if m else None
+        except Exception:
+            parsed = None
+    items = parsed.get('mcqs', []) if isinstance(parsed, dict) else []
+    out = []
+    for q in items if isinstance(items, list) else []:
+        if not isinstance(q, dict) or 'question' not in q or 'options' not in q or 'answer_index' not in q:
+            continue
+        question = str(q.get('question', '')).strip()
+        opts = q.get('options')
+        if not question or not isinstance(opts, list) or not opts:
+            continue
+        if len(opts) < 4:
+            # pad options if needed
+            opts = (opts + ['N/A']*4)[:4]
+        try:
+            answer_index = int(q.get('answer_index', 0)) % 4
+        except (TypeError, ValueError):
+            continue
+        out.append({
+            'question': question,
+            'options': [str(o).strip()[:120] for o in opts[:4]],
+            'answer_index': answer_index
+        })
+    return out
+
+
+def _question_key(q) -> str:
+    return ' '.join(''.join(c for c in q['question'].lower() if c.isalnum() or c.isspace()).split())
+
+
+def generate_mcqs(role: str, count: int, shard_size: int = None, max_parallel: int = None):
+    """Generate `count` MCQs as concurrent shards and merge them.
+
+    Shards of `shard_size` questions are requested in parallel, each parsed on
+    its own and merged as they finish, with duplicates dropped. Only slots no
+    shard could fill come from `fallback_mcqs`. shard_size >= count gives the
+    old single-shot behaviour. Returns (mcqs, info) where info reports shard
+    and fallback counts.
+    """
+    if count <= 0:
+        return [], {'shards': 0, 'failed_shards': 0, 'generated': 0, 'fallback': 0}
+    cfg = getattr(settings, 'INTERVIEW_MCQ', {})
+    shard_size = max(1, shard_size or cfg.get('SHARD_SIZE', 3))
+    max_parallel = max(1, max_parallel or cfg.get('MAX_PARALLEL', 4))
+    sizes = [min(shard_size, count - i) for i in range(0, count, shard_size)]
+    single = len(sizes) == 1
+    prompts = [
+        _mcq_prompt(role, n, '' if single else MCQ_SHARD_TOPICS[i % len(MCQ_SHARD_TOPICS)])
+        for i, n in enumerate(sizes)
+    ]
+
+    merged, seen, failed = [], set(), 0
+
+    def take(questions):
+        for q in questions:
+            key = _question_key(q)
+            if key and key not in seen and len(merged) < count:
+                seen.add(key)
+                merged.append(q)
+
+    if single:
+        try:
+            shard = parse_mcq_shard(call_ollama(prompts[0]))
+        except Exception:
+            shard = []
+        failed += 0 if shard else 1
+        take(shard)
+    else:
+        import contextvars
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(prompts))) as pool:
+            # copy_context() carries the request deadline into the shard threads
+            futures = [pool.submit(contextvars.copy_context().run, call_ollama, p) for p in prompts]
+            for fut in as_completed(futures):
+                try:
+                    shard = parse_mcq_shard(fut.result())
+                except Exception:
+                    shard = []
+                failed += 0 if shard else 1
+                take(shard)
+
+    generated = len(merged)
+    if generated < count:
+        take(q for q in fallback_mcqs(role, count) if _question_key(q) not in seen)
+        # The fallback bank is small; repeat it if the request needs more
+        for q in fallback_mcqs(role, count):
+            if len(merged) >= count:
+                break
+            merged.append(q)
+    return merged, {'shards': len(sizes), 'failed_shards': failed,
+                    'generated': generated, 'fallback': len(merged) - generated}
+
+
+def generate_interview(matching_role: str, count: int) -> dict:
+    """Generate MCQs for a validated role, store the attempt and return the API payload."""
+    import time as _t
+    t0 = _t.perf_counter()
+    mcqs, info = generate_mcqs(matching_role, count)
+    t1 = _t.perf_counter()
+
+    # Create interview attempt (for history)
+    ia = create_with_retry(
+        InterviewAttempt,
+        role=matching_role,
+        questions=json.dumps(mcqs)
+    )
+
+    return {
+        'mcqs': mcqs,
+        'attempt_id': ia.pk,
+        'role': matching_role,
+        'generation_ms': int((t1 - t0) * 1000),
+        'generation': info,
+    }
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def interview_submit_api(request):
@@ -828,53 +1259,14 @@ def interview_submit_api(request):
 
         ia = InterviewAttempt.objects.get(pk=attempt_id)
 
-        # Build prompt for scoring: include questions and answers, request JSON output
-        questions = json.loads(ia.questions) if isinstance(ia.questions, str) else ia.questions
-        prompt = {
-            'instructions': 'Score each answer on a scale 0-10 and provide brief feedback. Return JSON with keys: scores (list), feedback (list), overall_score (int), summary (string).',
-            'role': ia.role,
-            'questions': questions,
-            'answers': answers
-        }
-
-        system_prompt = "You are an expert technical interviewer and grader. Provide objective, constructive feedback."
-        # Ask Ollama to return JSON
-        scoring_prompt = f"Please provide a JSON object with keys: scores, feedback, overall_score, summary.\nInput:\n{json.dumps(prompt)}"
+        if wants_async(data):
+            return enqueue_job_response('interview_grade', {'attempt_id': ia.pk, 'answers': answers})
 
-        ai_response = call_ollama(scoring_prompt, system_prompt)
-
-        # Try to parse JSON from AI response
-        scored = None
-        try:
-            scored = json.loads(ai_response)
-        except Exception:
-            # Best-effort parse: try to find JSON substring
-            import re
-            m = re.search(r"\{.*\}", ai_response, re.S)
-            if m:
-                try:
-                    scored = json.loads(m.group(0))
-                except Exception:
-                    scored = None
-
-        if not scored:
-            # Fallback: simple heuristic scoring
-            scores = []
-            feedback = []
-            for a in answers:
-                l = len(a or "")
-                s = min(10, max(0, int(l / 20)))
-                scores.append(s)
-                feedback.append('Answer reviewed. Consider expanding details and adding examples.' )
-            overall = int(sum(scores) / max(1, len(scores)))
-            scored = {'scores': scores, 'feedback': feedback, 'overall_score': overall, 'summary': 'Automatic fallback scoring applied.'}
-
-        # Save answers and score
-        ia.answers = json.dumps(answers)
-        ia.score = int(scored.get('overall_score', 0)) if scored.get('overall_score') is not None else 0
-        ia.save()
-
-        return JsonResponse({'result': scored, 'attempt_id': ia.pk})
+        with llm_deadline('interview_grade') as dl:
+            result = grade_interview(ia, answers)
+        if result['fallback'] and dl.exceeded:
+            result.update(schedule_upgrade('interview_grade_upgrade', {'attempt_id': ia.pk, 'answers': answers}))
+        return JsonResponse(result)
     except InterviewAttempt.DoesNotExist:
         return JsonResponse({'error': 'Interview attempt not found'}, status=404)
     except Exception as e:
@@ -882,6 +1274,64 @@ def interview_submit_api(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def grade_interview(ia, answers, raise_on_error: bool = False) -> dict:
+    """Score answers for an attempt with Ollama (heuristic fallback) and save them.
+
+    With raise_on_error=True an Ollama error raises LLMError instead of
+    falling back, so background upgrade jobs can retry it.
+    """
+    # Build prompt for scoring: include questions and answers, request JSON output
+    questions = json.loads(ia.questions) if isinstance(ia.questions, str) else ia.questions
+    prompt = {
+        'instructions': 'Score each answer on a scale 0-10 and provide brief feedback. Return JSON with keys: scores (list), feedback (list), overall_score (int), summary (string).',
+        'role': ia.role,
+        'questions': questions,
+        'answers': answers
+    }
+
+    system_prompt = "You are an expert technical interviewer and grader. Provide objective, constructive feedback."
+    # Ask Ollama to return JSON
+    scoring_prompt = f"Please provide a JSON object with keys: scores, feedback, overall_score, summary.\nInput:\n{json.dumps(prompt)}"
+
+    ai_response = call_ollama(scoring_prompt, system_prompt)
+    if raise_on_error and ai_response.startswith('Error:'):
+        raise LLMError(ai_response)
+
+    # Try to parse JSON from AI response
+    scored = None
+    try:
+        scored = json.loads(ai_response)
+    except Exception:
+        # Best-effort parse: try to find JSON substring
+        import re
+        m = re.search(r"\{.*\}", ai_response, re.S)
+        if m:
+            try:
+                scored = json.loads(m.group(0))
+            except Exception:
+                scored = None
+
+    fallback = not scored
+    if fallback:
+        # Fallback: simple heuristic scoring
+        scores = []
+        feedback = []
+        for a in answers:
+            l = len(a or "")
+            s = min(10, max(0, int(l / 20)))
+            scores.append(s)
+            feedback.append('Answer reviewed. Consider expanding details and adding examples.' )
+        overall = int(sum(scores) / max(1, len(scores)))
+        scored = {'scores': scores, 'feedback': feedback, 'overall_score': overall, 'summary': 'Automatic fallback scoring applied.'}
+
+    # Save answers and score
+    ia.answers = json.dumps(answers)
+    ia.score = int(scored.get('overall_score', 0)) if scored.get('overall_score') is not None else 0
+    ia.save()
+
+    return {'result': scored, 'attempt_id': ia.pk, 'fallback': fallback}
+
+
 def resume_page(request):
     """Resume builder page."""
     if request.method == 'POST':
@@ -894,7 +1344,7 @@ def resume_page(request):
                 'education': form.cleaned_data.get('education', ''),
                 'skills': form.cleaned_data.get('skills', ''),
             }
-            r = Resume.objects.create(name=name, data_json=json.dumps(data))
+            r = create_with_retry(Resume, name=name, data_json=json.dumps(data))
             # Redirect to download; check requested format
             fmt = request.POST.get('format', 'json')
             if fmt == 'pdf':
@@ -911,77 +1361,9 @@ def resume_download(request):
     if not latest:
         return HttpResponse('No resume yet', status=404)
 
-    # If PDF requested via query param ?pdf=1, generate PDF
+    # If PDF requested via query param ?pdf=1, serve the (cached) PDF render
     if request.GET.get('pdf', '') == '1':
-        try:
-            data = json.loads(latest.data_json)
-        except Exception:
-            data = {}
-
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
-        width, height = letter
-        x = 50
-        y = height - 50
-
-        p.setFont('Helvetica-Bold', 16)
-        p.drawString(x, y, f"{latest.name} - Resume")
-        y -= 30
-
-        p.setFont('Helvetica', 11)
-        summary = data.get('summary', '')
-        if summary:
-            p.drawString(x, y, 'Professional Summary:')
-            y -= 18
-            text = p.beginText(x, y)
-            text.setFont('Helvetica', 10)
-            for line in summary.split('\n'):
-                text.textLine(line)
-                y -= 14
-            p.drawText(text)
-            y -= 10
-
-        experiences = data.get('experiences', '')
-        if experiences:
-            p.setFont('Helvetica-Bold', 12)
-            p.drawString(x, y, 'Experience:')
-            y -= 18
-            p.setFont('Helvetica', 10)
-            text = p.beginText(x, y)
-            for line in experiences.split('\n'):
-                text.textLine(line)
-                y -= 14
-            p.drawText(text)
-            y -= 10
-
-        education = data.get('education', '')
-        if education:
-            p.setFont('Helvetica-Bold', 12)
-            p.drawString(x, y, 'Education:')
-            y -= 18
-            p.setFont('Helvetica', 10)
-            text = p.beginText(x, y)
-            for line in education.split('\n'):
-                text.textLine(line)
-                y -= 14
-            p.drawText(text)
-            y -= 10
-
-        skills = data.get('skills', '')
-        if skills:
-            p.setFont('Helvetica-Bold', 12)
-            p.drawString(x, y, 'Skills:')
-            y -= 18
-            p.setFont('Helvetica', 10)
-            text = p.beginText(x, y)
-            text.textLine(skills)
-            p.drawText(text)
-
-        p.showPage()
-        p.save()
-
-        buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        response = HttpResponse(resume_pdf.get_resume_pdf(latest), content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="resume_{latest.pk}.pdf"'
         return response
 
@@ -990,6 +1372,28 @@ def resume_download(request):
     return response
 
 
+@staff_member_required
+def resume_export(request):
+    """Admin export of resumes as a streamed zip of PDFs.
+
+    Optional ?ids=1,2,3 limits the export; otherwise every resume is included.
+    PDFs are rendered in a process pool (settings.RESUME_EXPORT_WORKERS) and
+    written to the response as they finish, so memory use stays bounded.
+    """
+    qs = Resume.objects.order_by('pk')
+    ids = request.GET.get('ids', '').strip()
+    if ids:
+        try:
+            qs = qs.filter(pk__in=[int(i) for i in ids.split(',') if i.strip()])
+        except ValueError:
+            return JsonResponse({'error': 'ids must be a comma separated list of integers'}, status=400)
+    rows = qs.values_list('pk', 'name', 'data_json').iterator(chunk_size=500)
+    workers = getattr(settings, 'RESUME_EXPORT_WORKERS', 4)
+    response = StreamingHttpResponse(resume_pdf.stream_resume_zip(rows, workers=workers), content_type='application/zip')
+    response['Content-Disposition'] = 'attachment; filename="resumes.zip"'
+    return response
+
+
 def cover_letter_page(request):
     """Cover letter generator page."""
     return render(request, 'main/cover_letter.html')
@@ -1008,25 +1412,76 @@ def cover_letter_api(request):
         if not name or not role:
             return JsonResponse({'error': 'Name and role are required'}, status=400)
         
-        # Generate cover letter
-        prompt = f"""Write a professional cover letter for {name} applying for a {role} position.
-Additional context: {context if context else 'N/A'}
-Format the letter properly with greeting, body paragraphs, and closing."""
-        
-        body = call_ollama(prompt)
-        
-        # Save cover letter
-        cl = CoverLetter.objects.create(name=name, role=role, body=body)
-        
-        return JsonResponse({
-            'cover_letter': body,
-            'id': cl.pk
-        })
+        if wants_async(data):
+            return enqueue_job_response('cover_letter', {'name': name, 'role': role, 'context': context})
+
+        with llm_deadline('cover_letter') as dl:
+            result = generate_cover_letter(name, role, context, use_template_on_error=True)
+        if result['fallback'] and dl.exceeded:
+            result.update(schedule_upgrade('cover_letter_upgrade', {'cover_letter_id': result['id'], 'context': context}))
+        return JsonResponse(result)
     except Exception as e:
         logger.error(f"Cover Letter API error: {str(e)}")
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def _cover_letter_prompt(name: str, role: str, context: str = '') -> str:
+    return f"""Write a professional cover letter for {name} applying for a {role} position.
+Additional context: {context if context else 'N/A'}
+Format the letter properly with greeting, body paragraphs, and closing."""
+
+
+def template_cover_letter(name: str, role: str, context: str = '') -> str:
+    """Deterministic cover letter used when the model cannot answer in time."""
+    extra = f"\n\n{context.strip()}" if context and context.strip() else ""
+    return (
+        "Dear Hiring Manager,\n\n"
+        f"I am writing to express my interest in the {role} position. I am confident that my skills "
+        f"and experience make me a strong fit for the role, and I am eager to contribute to your team.{extra}\n\n"
+        f"As a {role}, I would bring a commitment to quality work, continuous learning and close "
+        "collaboration with colleagues and stakeholders. I would welcome the opportunity to discuss "
+        "how I can support your goals.\n\n"
+        "Thank you for your time and consideration.\n\n"
+        f"Sincerely,\n{name}"
+    )
+
+
+def generate_cover_letter(name: str, role: str, context: str = '', raise_on_error: bool = False,
+                          use_template_on_error: bool = False) -> dict:
+    """Generate and store a cover letter; returns the API payload.
+
+    With raise_on_error=True an Ollama error raises LLMError instead of being
+    saved as the letter body, so background jobs can retry it. With
+    use_template_on_error=True the letter falls back to `template_cover_letter`.
+    """
+    body = call_ollama(_cover_letter_prompt(name, role, context))
+    fallback = body.startswith('Error:')
+    if fallback and raise_on_error:
+        raise LLMError(body)
+    if fallback and use_template_on_error:
+        body = template_cover_letter(name, role, context)
+
+    # Save cover letter
+    cl = create_with_retry(CoverLetter, name=name, role=role, body=body)
+
+    return {
+        'cover_letter': body,
+        'id': cl.pk,
+        'fallback': fallback
+    }
+
+
+def upgrade_cover_letter(cover_letter_id: int, context: str = '') -> dict:
+    """Regenerate a fallback cover letter with the model and overwrite its body."""
+    cl = CoverLetter.objects.get(pk=cover_letter_id)
+    body = call_ollama(_cover_letter_prompt(cl.name, cl.role, context))
+    if body.startswith('Error:'):
+        raise LLMError(body)
+    cl.body = body
+    retry_on_locked(cl.save, update_fields=['body'])
+    return {'cover_letter': body, 'id': cl.pk, 'fallback': False}
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def analyze_sentiment_api(request):
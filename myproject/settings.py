@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -73,13 +74,127 @@ WSGI_APPLICATION = 'myproject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite is tuned for concurrent API writers: WAL lets readers proceed during a
+# write, synchronous=NORMAL is durable across app crashes in WAL mode, and
+# IMMEDIATE transactions take the write lock up front so a waiting writer
+# honours `timeout` instead of failing with "database is locked" on upgrade.
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA busy_timeout=20000',
+]
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests instead of reconnecting every time
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': '; '.join(SQLITE_PRAGMAS),
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# recommend_api persists Profile/Recommendation rows through a write-behind
+# buffer (main/utils/write_behind.py) flushed by size or time.
+WRITE_BEHIND = {
+    'ENABLED': True,
+    'MAX_BATCH': 200,
+    'FLUSH_INTERVAL': 1.0,
+    'MAX_PENDING': 5000,
+}
+
+# Ollama (local LLM). With OLLAMA_WARMUP the model is preloaded at startup and
+# kept resident (main/utils/ollama.py); LLM views fail fast while it is cold.
+OLLAMA_URL = 'http://localhost:11434'
+OLLAMA_MODEL = 'mistral'
+OLLAMA_KEEP_ALIVE = '30m'
+OLLAMA_WARMUP = os.environ.get('OLLAMA_WARMUP', '1') == '1'
+OLLAMA_WARMUP_TIMEOUT = 300
+OLLAMA_KEEPALIVE_REFRESH = 240
+OLLAMA_WARMUP_RETRY = 10
+
+# Offline stand-in for Ollama (main/utils/fake_ollama.py), started with
+# `python manage.py fake_ollama`. With OLLAMA_FAKE=1 in the environment the
+# app talks to it instead of the real server, for reproducible load tests.
+OLLAMA_FAKE = {
+    'ENABLED': os.environ.get('OLLAMA_FAKE', '') == '1',
+    'HOST': '127.0.0.1',
+    'PORT': 11435,
+    'LATENCY': {'dist': 'lognormal', 'median_ms': 300, 'sigma': 0.5},
+    'ERROR_RATE': 0.0,
+    'RESPONSES': None,  # optional JSON file of {"match": regex, "response": ...} rules
+    'SEED': None,
+}
+if OLLAMA_FAKE['ENABLED']:
+    OLLAMA_URL = f"http://{OLLAMA_FAKE['HOST']}:{OLLAMA_FAKE['PORT']}"
+
+# Per-view time budgets (seconds) for LLM work. call_ollama honours them across
+# retries and backoff; when one runs out the view answers with its
+# deterministic fallback and, with LLM_BACKGROUND_UPGRADE, queues a job that
+# replaces the stored fallback with a model answer.
+LLM_DEADLINES = {
+    'interview_mcqs': 8,
+    'interview_grade': 15,
+    'cover_letter': 20,
+    'chat_summary': 15,
+}
+LLM_BACKGROUND_UPGRADE = True
+
+# interview_api asks for MCQs in concurrent shards of SHARD_SIZE questions,
+# at most MAX_PARALLEL at a time, and merges the valid ones. Requests for more
+# than MAX_COUNT questions are clamped.
+INTERVIEW_MCQ = {
+    'SHARD_SIZE': 3,
+    'MAX_PARALLEL': 4,
+    'MAX_COUNT': 20,
+}
+
+# Background jobs for slow LLM endpoints (main/jobs.py), run with
+# `python manage.py run_jobs`. Clients opt in with {"async": true}.
+JOBS = {
+    'WORKERS': 2,
+    'POLL_INTERVAL': 0.5,
+    'MAX_ATTEMPTS': 3,
+    'BACKOFF': 2.0,
+    'LEASE_SECONDS': 600,
+    'DEADLINE_SECONDS': 480,
+}
+
+# chat_api prompt window: recent turns under a token budget plus a rolling
+# summary of older turns stored on Conversation (main/utils/chat_context.py).
+CHAT_CONTEXT = {
+    'MAX_TURNS': 8,
+    'TOKEN_BUDGET': 1500,
+    'SUMMARY_EVERY': 6,
+    'SUMMARY_MAX_TOKENS': 300,
+    'SUMMARY_BATCH_LIMIT': 100,
+    'SUMMARY_MAX_BATCHES': 1,
+}
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Rendered resume PDFs are keyed by a hash of their content, so a file cache
+# shared by all workers serves repeat downloads without re-rendering.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'resume_pdf': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'resume_pdf',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+# Process-pool size for the admin bulk resume export (0 renders inline)
+RESUME_EXPORT_WORKERS = 4
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,480 @@
+"""Load generator for the Django endpoints and the role predictor service.
+
+Replays realistic payloads, built from data/synthetic_career_data.csv or a
+recorded request log, against recommend_api, chat_api, interview_api and the
+SenseiPredictor service (src/predict_api.py: /predict, optionally
+/predict_batch), then reports p50/p95/p99 latency, error rate and throughput
+per endpoint. Pure asyncio with a small keep-alive HTTP/1.1 client, so it
+needs nothing beyond the standard library.
+
+    # Django with the Ollama stand-in, the predictor where recommend_api calls it
+    OLLAMA_FAKE=1 python manage.py runserver --noreload &
+    python manage.py fake_ollama &
+    python -m src.predict_api --artifacts_dir src/artifacts --configs_dir src/configs --port 8001 &
+    python scripts/load_test.py --concurrency 16 --duration 30 --out load.json
+    python scripts/load_test.py --rate 50 --endpoints recommend,predict,predict_batch --compare load.json
+
+Predictor payloads have the shape recommend_api sends (main/views.py
+_recommend_inputs): a skills list, years_experience and interest sliders.
+/predict_batch sends --batch_size such profiles per request.
+
+With --rate the arrivals are open-loop (Poisson, per endpoint), so a slow
+server shows up as queueing latency instead of silently lowering the offered
+load; without it each of --concurrency workers per endpoint sends back to back.
+
+Errors are 5xx responses, timeouts and connection failures. 4xx responses
+(e.g. interview roles from the CSV that interview_api does not offer) are
+counted as client_errors and left out of both error rate and throughput.
+
+Recorded logs are JSON lines {"endpoint": "chat", "payload": {...}}.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DATA = ROOT / "data" / "synthetic_career_data.csv"
+
+# endpoint -> (server, path)
+ENDPOINTS = {
+    "recommend": ("django", "/api/recommend/"),
+    "chat": ("django", "/api/chat/"),
+    "interview": ("django", "/api/interview/"),
+    "predict": ("predictor", "/predict"),
+    "predict_batch": ("predictor", "/predict_batch"),
+}
+RISK = ["low", "medium", "high"]
+WORK_PREF = ["team", "remote", "hybrid", "solo"]
+INTEREST_AXES = ["data", "programming", "design", "management"]
+# Same token -> skill name mapping as _recommend_inputs
+SKILL_NAMES = {
+    "python": "Python", "java": "Java", "javascript": "JavaScript", "sql": "SQL", "react": "React",
+    "docker": "Docker", "kubernetes": "Kubernetes", "aws": "AWS", "cloud": "AWS",
+    "statistics": "Statistics", "data_viz": "Tableau", "ux_research": "User Research",
+    "ui_design": "UI Design", "problem_solving": "Problem Solving", "communication": "Communication",
+}
+RISK_LEVELS = {"low": 2, "medium": 3, "high": 5}
+CHAT_TEMPLATES = [
+    "How can I move into a {role} role with {skills}?",
+    "Which skills should I learn next as a {role}? I know {skills}.",
+    "Is {years} years of experience enough to apply for {role} positions?",
+]
+
+
+# ---------------------------------------------------------------- payloads
+
+
+def load_rows(path: Path, limit: int = None) -> list:
+    with open(path, newline="", encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    return rows[:limit] if limit else rows
+
+
+def recommend_body(row: dict, rng: random.Random) -> dict:
+    return {
+        "name": f"Load {row.get('id', '')}",
+        "email": "",
+        "education": row.get("education", "UG"),
+        "experience": int(float(row.get("experience_years") or 0)),
+        "skills": row.get("skills", ""),
+        "risk_taking": rng.choice(RISK),
+        "work_preference": rng.choice(WORK_PREF),
+        "motivation": rng.randint(40, 100),
+        "interests": {axis: rng.randint(1, 5) for axis in INTEREST_AXES},
+    }
+
+
+def predictor_payload(body: dict) -> dict:
+    """The /predict payload recommend_api builds from `body` (see _recommend_inputs)."""
+    tokens = [s.strip().lower() for s in str(body.get("skills") or "").split(",") if s.strip()]
+    payload = {
+        "age": 25,
+        "education": body.get("education") or "UG",
+        "field_of_study": "CS",
+        "skills": [SKILL_NAMES.get(t, t.title()) for t in tokens],
+        "personality": "ambivert",
+        "risk_taking": RISK_LEVELS.get(body.get("risk_taking"), 3),
+        "work_preference": body.get("work_preference") or "team",
+        "motivation_score": int(body.get("motivation") or 70),
+        "sentiment": "neutral",
+        "years_experience": int(body.get("experience") or 0),
+        "desired_roles": [],
+    }
+    for axis in INTEREST_AXES:
+        payload[f"interest_{axis}"] = int((body.get("interests") or {}).get(axis, 3))
+    return payload
+
+
+def payload_for(endpoint: str, row: dict, rng: random.Random, batch_size: int = 32, rows=None) -> dict:
+    """A request body for `endpoint` shaped like real traffic for this profile."""
+    skills = row.get("skills", "")
+    years = int(float(row.get("experience_years") or 0))
+    role = row.get("role", "Software Developer")
+    if endpoint == "recommend":
+        return recommend_body(row, rng)
+    if endpoint == "chat":
+        tpl = rng.choice(CHAT_TEMPLATES)
+        return {"text": tpl.format(role=role, skills=skills or "no listed skills", years=years)}
+    if endpoint == "interview":
+        return {"role": role, "count": rng.choice([3, 5, 5, 10])}
+    if endpoint == "predict":
+        return predictor_payload(recommend_body(row, rng))
+    if endpoint == "predict_batch":
+        batch = [row] + [rng.choice(rows or [row]) for _ in range(batch_size - 1)]
+        return {"profiles": [predictor_payload(recommend_body(r, rng)) for r in batch]}
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def payload_source(endpoints, rows, replay, seed, batch_size=32):
+    """endpoint -> zero-arg callable returning the next payload."""
+    rng = random.Random(seed)
+    if replay:
+        recorded = {e: [] for e in endpoints}
+        with open(replay, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    rec = json.loads(line)
+                    if rec.get("endpoint") in recorded:
+                        recorded[rec["endpoint"]].append(rec["payload"])
+        missing = [e for e, p in recorded.items() if not p]
+        if missing:
+            sys.exit(f"{replay}: no recorded requests for {', '.join(missing)}")
+        cycles = {e: iter_cycle(p) for e, p in recorded.items()}
+        return {e: (lambda c=c: next(c)) for e, c in cycles.items()}
+    return {e: (lambda e=e: payload_for(e, rng.choice(rows), rng, batch_size, rows)) for e in endpoints}
+
+
+def iter_cycle(items):
+    while True:
+        yield from items
+
+
+# ---------------------------------------------------------------- HTTP client
+
+
+class HTTPConnection:
+    """Minimal keep-alive HTTP/1.1 client with a cookie jar (chat uses sessions)."""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.cookies = {}
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+        self.reader = self.writer = None
+
+    async def post_json(self, path: str, body: dict):
+        """(status, body bytes); reconnects once if the kept-alive socket was closed."""
+        for attempt in (1, 2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await asyncio.wait_for(self._exchange(path, body), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if attempt == 2:
+                    raise
+            except BaseException:
+                await self.close()
+                raise
+
+    async def _exchange(self, path, body):
+        data = json.dumps(body).encode("utf-8")
+        headers = [
+            f"POST {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(data)}",
+            "Connection: keep-alive",
+        ]
+        if self.cookies:
+            headers.append("Cookie: " + "; ".join(f"{k}={v}" for k, v in self.cookies.items()))
+        self.writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + data)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        length, chunked, close = None, False, False
+        while True:
+            line = (await self.reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            name, value = name.lower(), value.strip()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value.lower():
+                chunked = True
+            elif name == "connection" and value.lower() == "close":
+                close = True
+            elif name == "set-cookie":
+                key, _, val = value.split(";", 1)[0].partition("=")
+                self.cookies[key.strip()] = val.strip()
+        if chunked:
+            payload = b""
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                payload += chunk[:-2]
+        elif length is not None:
+            payload = await self.reader.readexactly(length)
+        else:
+            payload = await self.reader.read()
+            close = True
+        if close:
+            await self.close()
+        return status, payload
+
+
+# ---------------------------------------------------------------- load loop
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.client_errors = 0
+        self.statuses = {}
+        self.exceptions = {}
+
+    def add(self, seconds, status=None, exc=None):
+        self.latencies.append(seconds)
+        if exc is not None:
+            self.errors += 1
+            name = type(exc).__name__
+            self.exceptions[name] = self.exceptions.get(name, 0) + 1
+            return
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        if status >= 500:
+            self.errors += 1
+        elif status >= 400:
+            self.client_errors += 1
+
+
+async def timed_request(conn, path, body, rec, scheduled=None):
+    # Open-loop latency is measured from the scheduled arrival, so waiting for
+    # a free connection counts against the server
+    start = scheduled if scheduled is not None else time.perf_counter()
+    try:
+        status, _ = await conn.post_json(path, body)
+        rec.add(time.perf_counter() - start, status=status)
+    except Exception as exc:
+        rec.add(time.perf_counter() - start, exc=exc)
+
+
+async def closed_loop(base, path, next_payload, rec, concurrency, stop_at, budget, timeout):
+    async def worker():
+        conn = HTTPConnection(base, timeout)
+        try:
+            while time.perf_counter() < stop_at and budget.take():
+                await timed_request(conn, path, next_payload(), rec)
+        finally:
+            await conn.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def open_loop(base, path, next_payload, rec, concurrency, stop_at, budget, timeout, rate, rng):
+    pool = asyncio.Queue()
+    for _ in range(concurrency):
+        pool.put_nowait(HTTPConnection(base, timeout))
+    pending = set()
+
+    async def fire(scheduled):
+        conn = await pool.get()
+        try:
+            await timed_request(conn, path, next_payload(), rec, scheduled)
+        finally:
+            pool.put_nowait(conn)
+
+    next_at = time.perf_counter()
+    while next_at < stop_at and budget.take():
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.ensure_future(fire(next_at))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        next_at += rng.expovariate(rate)
+    if pending:
+        await asyncio.gather(*pending)
+    while not pool.empty():
+        await pool.get_nowait().close()
+
+
+class Budget:
+    """Optional cap on the number of requests per endpoint."""
+
+    def __init__(self, limit):
+        self.left = limit
+
+    def take(self) -> bool:
+        if self.left is None:
+            return True
+        if self.left <= 0:
+            return False
+        self.left -= 1
+        return True
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(q / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+def summarize(rec: Recorder, elapsed: float) -> dict:
+    lat = sorted(rec.latencies)
+    n = len(lat)
+    ms = lambda v: None if v is None else round(v * 1000, 2)
+    return {
+        "requests": n,
+        "errors": rec.errors,
+        "client_errors": rec.client_errors,
+        "error_rate": round(rec.errors / n, 4) if n else None,
+        "throughput_rps": round((n - rec.errors - rec.client_errors) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": ms(percentile(lat, 50)),
+            "p95": ms(percentile(lat, 95)),
+            "p99": ms(percentile(lat, 99)),
+            "mean": ms(sum(lat) / n) if n else None,
+            "max": ms(lat[-1]) if n else None,
+        },
+        "status_codes": rec.statuses,
+        "exceptions": rec.exceptions,
+    }
+
+
+async def run(args, sources) -> dict:
+    bases = {"django": args.django, "predictor": args.predictor}
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    stop_at = start + args.duration
+    recorders, tasks, timings = {}, [], {}
+
+    async def one(endpoint):
+        server, path = ENDPOINTS[endpoint]
+        rec = recorders[endpoint] = Recorder()
+        t0 = time.perf_counter()
+        budget = Budget(args.requests)
+        if args.rate:
+            await open_loop(bases[server], path, sources[endpoint], rec, args.concurrency, stop_at,
+                            budget, args.timeout, args.rate, random.Random(rng.random()))
+        else:
+            await closed_loop(bases[server], path, sources[endpoint], rec, args.concurrency, stop_at,
+                              budget, args.timeout)
+        timings[endpoint] = time.perf_counter() - t0
+
+    for endpoint in args.endpoints:
+        tasks.append(one(endpoint))
+    await asyncio.gather(*tasks)
+    return {e: summarize(recorders[e], timings[e]) for e in args.endpoints}
+
+
+# ---------------------------------------------------------------- reporting
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def print_table(results, baseline=None):
+    print(f"{'endpoint':<14} {'reqs':>6} {'err%':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for endpoint, r in results.items():
+        lat = r["latency_ms"]
+        err = 100 * (r["error_rate"] or 0)
+        fmt = lambda v: "-" if v is None else f"{v:.1f}"
+        print(f"{endpoint:<14} {r['requests']:>6} {err:>6.1f} {fmt(r['throughput_rps']):>8} "
+              f"{fmt(lat['p50']):>9} {fmt(lat['p95']):>9} {fmt(lat['p99']):>9}")
+        old = (baseline or {}).get(endpoint)
+        if old:
+            delta = lambda new, prev: "-" if not new or not prev else f"{100 * (new - prev) / prev:+.0f}%"
+            ol = old["latency_ms"]
+            print(f"{'  vs base':<14} {'':>6} {'':>6} {delta(r['throughput_rps'], old['throughput_rps']):>8} "
+                  f"{delta(lat['p50'], ol['p50']):>9} {delta(lat['p95'], ol['p95']):>9} {delta(lat['p99'], ol['p99']):>9}")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--django", default="http://127.0.0.1:8000", help="Django base URL.")
+    p.add_argument("--predictor", "--flask", dest="predictor", default="http://127.0.0.1:8001",
+                   help="SenseiPredictor service (src/predict_api.py) base URL; recommend_api calls :8001.")
+    p.add_argument("--endpoints", default="recommend,chat,interview,predict",
+                   help=f"Comma-separated subset of {', '.join(ENDPOINTS)}.")
+    p.add_argument("--concurrency", type=int, default=8, help="Connections per endpoint.")
+    p.add_argument("--rate", type=float, default=0, help="Open-loop arrivals/s per endpoint (0 = closed loop).")
+    p.add_argument("--duration", type=float, default=30, help="Seconds to run.")
+    p.add_argument("--requests", type=int, default=None, help="Stop each endpoint after this many requests.")
+    p.add_argument("--timeout", type=float, default=120, help="Per-request timeout (s).")
+    p.add_argument("--data", default=str(DEFAULT_DATA), help="CSV of profiles to draw payloads from.")
+    p.add_argument("--batch_size", type=int, default=32, help="Profiles per /predict_batch request.")
+    p.add_argument("--replay", default=None, help="JSON-lines request log to replay instead of the CSV.")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out", default=None, help="Write the JSON report here.")
+    p.add_argument("--compare", default=None, help="Earlier JSON report to diff against.")
+    args = p.parse_args(argv)
+    args.endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        p.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = None if args.replay else load_rows(Path(args.data))
+    sources = payload_source(args.endpoints, rows, args.replay, args.seed, args.batch_size)
+    mode = f"open loop at {args.rate}/s" if args.rate else "closed loop"
+    print(f"Load test: {', '.join(args.endpoints)}; {mode}, concurrency {args.concurrency}, {args.duration:g}s")
+
+    results = asyncio.run(run(args, sources))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh).get("results")
+    print_table(results, baseline)
+
+    if args.out:
+        report = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "config": {k: getattr(args, k) for k in
+                       ("django", "predictor", "endpoints", "concurrency", "rate", "duration",
+                        "requests", "timeout", "batch_size", "replay", "seed")},
+            "results": results,
+        }
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
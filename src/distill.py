@@ -0,0 +1,238 @@
+"""
+Distilled linear "preview" tier for the role predictor.
+
+The instant preview shown while a user types skills calls /predict on
+every keystroke. Even with the NumPy tree evaluator, most of that time goes
+to FeatureEncoder.transform: a one-row DataFrame pushed through four sklearn
+transformers. The student defined here is one L1-regularised logistic
+regression per role. It is fitted to the XGBoost teacher's probabilities
+on the training rows, so it learns the teacher's soft scores rather than
+the raw labels. Each row enters twice: once as a positive weighted p, once
+as a negative weighted 1 - p.
+
+A linear model over one-hot/standardised features does not need the
+encoder at serving time. `LinearStudent.bind(encoder)` turns the encoder's
+vocabularies into index tables. `predict_payload` then adds up the
+coefficient columns of the skills, desired roles and categories a payload
+names, plus the standardised numerics. That is a few dozen array
+additions.
+
+train_xgb.py distills after every full training run into student_linear.npz
+and writes distill_report.json (teacher vs student ranking metrics,
+agreement, latency). To re-distill existing artifacts:
+
+  python -m src.distill --data data/synthetic_career_data.csv --artifacts_dir src/artifacts
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+STUDENT_FILE = "student_linear.npz"
+STUDENT_VERSION = 1
+DEFAULT_C = 1.0
+
+
+def _sigmoid(margin: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-margin))
+
+
+class LinearStudent:
+    """proba = sigmoid(X @ coef.T + intercept), one row of coef per role."""
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self._tables = None
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearStudent":
+        with np.load(path) as data:
+            if int(data["version"]) != STUDENT_VERSION:
+                raise ValueError(f"{path} has student version {int(data['version'])}, expected {STUDENT_VERSION}")
+            return cls(data["coef"], data["intercept"])
+
+    def save(self, path: Path) -> Path:
+        np.savez(path, coef=self.coef.astype(np.float32), intercept=self.intercept,
+                 version=np.int32(STUDENT_VERSION))
+        return path
+
+    @property
+    def sparsity(self) -> float:
+        return float((self.coef == 0).mean())
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return _sigmoid(np.asarray(X, dtype=np.float64) @ self.coef.T + self.intercept)
+
+    def bind(self, encoder) -> "LinearStudent":
+        """Precompute lookup tables so payloads can be scored without the encoder."""
+        offset = 0
+        skills = {s: offset + i for i, s in enumerate(encoder.skills_mlb.classes_)}
+        offset += len(skills)
+        desired = {r: offset + i for i, r in enumerate(encoder.desired_mlb.classes_)}
+        offset += len(desired)
+        categories = {}
+        for col, cats in zip(encoder.categorical_cols, encoder.cat_encoder.categories_):
+            categories[col] = {c: offset + i for i, c in enumerate(cats)}
+            offset += len(cats)
+        scaler = encoder.scaler
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(len(encoder.numeric_cols))
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(len(encoder.numeric_cols))
+        numeric = slice(offset, offset + len(encoder.numeric_cols))
+        if numeric.stop != self.coef.shape[1]:
+            raise ValueError(f"Encoder has {numeric.stop} features, student expects {self.coef.shape[1]}")
+        self._tables = {
+            "skills": skills,
+            "desired_roles": desired,
+            "categories": categories,
+            "numeric_cols": list(encoder.numeric_cols),
+            "mean": np.asarray(mean, dtype=np.float64),
+            "scale": np.asarray(scale, dtype=np.float64),
+            "numeric_coef": self.coef[:, numeric],
+            "coef_t": np.ascontiguousarray(self.coef.T),
+        }
+        return self
+
+    def predict_payload(self, clean: Dict) -> np.ndarray:
+        """Role probabilities for one sanitized payload; equals predict_proba(encoder.transform(row))."""
+        t = self._tables
+        if t is None:
+            raise RuntimeError("LinearStudent.bind(encoder) must be called first")
+        columns = {t["skills"][s] for s in clean.get("skills") or [] if s in t["skills"]}
+        columns.update(t["desired_roles"][r] for r in clean.get("desired_roles") or [] if r in t["desired_roles"])
+        for col, lookup in t["categories"].items():
+            index = lookup.get(clean.get(col))
+            if index is not None:
+                columns.add(index)
+        margin = self.intercept + t["coef_t"][sorted(columns)].sum(axis=0)
+        nums = np.array([_number(clean.get(col)) for col in t["numeric_cols"]])
+        margin += t["numeric_coef"] @ ((nums - t["mean"]) / t["scale"])
+        return _sigmoid(margin)
+
+
+def _number(value) -> float:
+    # Same as the encoder's fillna(0) for missing numerics
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if np.isnan(value) else value
+
+
+def _l1_penalty() -> dict:
+    """LogisticRegression arguments selecting a pure L1 penalty.
+
+    scikit-learn 1.8 deprecated `penalty` in favour of `l1_ratio`; before it,
+    `l1_ratio` is ignored unless penalty="elasticnet" and the default is L2.
+    """
+    import sklearn
+
+    version = tuple(int(part) for part in re.findall(r"\d+", sklearn.__version__)[:2])
+    return {"l1_ratio": 1.0} if version >= (1, 8) else {"penalty": "l1"}
+
+
+def fit_student(X: np.ndarray, teacher_proba: np.ndarray, C: float = DEFAULT_C) -> LinearStudent:
+    """Per-role L1 logistic regression on the teacher's soft labels."""
+    from sklearn.linear_model import LogisticRegression
+
+    X = np.asarray(X, dtype=np.float64)
+    n = X.shape[0]
+    X2 = np.vstack([X, X])
+    y2 = np.concatenate([np.ones(n), np.zeros(n)])
+    coef = np.zeros((teacher_proba.shape[1], X.shape[1]))
+    intercept = np.zeros(teacher_proba.shape[1])
+    for j in range(teacher_proba.shape[1]):
+        p = np.clip(teacher_proba[:, j], 1e-6, 1 - 1e-6)
+        clf = LogisticRegression(C=C, solver="saga", max_iter=2000, tol=1e-4, **_l1_penalty())
+        clf.fit(X2, y2, sample_weight=np.concatenate([p, 1 - p]))
+        coef[j] = clf.coef_[0]
+        intercept[j] = clf.intercept_[0]
+    return LinearStudent(coef, intercept)
+
+
+def _per_row_ms(fn, rows, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for row in rows:
+            fn(row)
+        best = min(best, (time.perf_counter() - started) / len(rows))
+    return round(best * 1000, 4)
+
+
+def compare_tiers(teacher, student: LinearStudent, X_val, y_val, ks=(1, 3, 5), latency_rows: int = 200) -> dict:
+    """Ranking metrics, teacher agreement and single-row latency of both tiers."""
+    from src.ranking_metrics import ranking_metrics, top_k_indices
+
+    teacher_proba = teacher.predict_proba(X_val)
+    student_proba = student.predict_proba(X_val)
+    top3_t = top_k_indices(teacher_proba, 3)
+    top3_s = top_k_indices(student_proba, 3)
+    overlap = np.mean([len(set(a) & set(b)) / 3 for a, b in zip(top3_t, top3_s)])
+    rows = [X_val[i:i + 1] for i in range(min(latency_rows, len(X_val)))]
+    return {
+        "teacher": {**ranking_metrics(y_val, teacher_proba, ks=ks),
+                    "predict_1_row_ms": _per_row_ms(teacher.predict_proba, rows)},
+        "student": {**ranking_metrics(y_val, student_proba, ks=ks),
+                    "predict_1_row_ms": _per_row_ms(student.predict_proba, rows)},
+        "agreement": {
+            "top1": float((teacher_proba.argmax(axis=1) == student_proba.argmax(axis=1)).mean()),
+            "top3_overlap": float(overlap),
+            "mean_abs_proba_diff": float(np.abs(teacher_proba - student_proba).mean()),
+        },
+        "student_sparsity": student.sparsity,
+    }
+
+
+def distill(teacher, X_train, X_val, y_val, artifacts_dir: Path, C: float = DEFAULT_C, ks=(1, 3, 5)) -> dict:
+    """Fit the student on the teacher's training probabilities and save it with a report."""
+    started = time.perf_counter()
+    student = fit_student(X_train, teacher.predict_proba(X_train), C=C)
+    fit_seconds = time.perf_counter() - started
+    report = {"C": C, "fit_seconds": round(fit_seconds, 3), **compare_tiers(teacher, student, X_val, y_val, ks=ks)}
+    student.save(artifacts_dir / STUDENT_FILE)
+    (artifacts_dir / "distill_report.json").write_text(json.dumps(report, indent=2))
+    return report
+
+
+def summary(report: dict) -> str:
+    lines = [f"Student: {report['student_sparsity']:.0%} zero weights, fitted in {report['fit_seconds']}s"]
+    for tier in ("teacher", "student"):
+        r = report[tier]
+        lines.append(f"  {tier:<8} ndcg@3={r.get('ndcg@3', float('nan')):.4f}  precision@3={r.get('precision@3', float('nan')):.4f}"
+                     f"  {r['predict_1_row_ms']} ms/row")
+    a = report["agreement"]
+    lines.append(f"  agreement top1={a['top1']:.3f}  top3_overlap={a['top3_overlap']:.3f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    import joblib
+    from sklearn.model_selection import train_test_split
+
+    from src.train_xgb import load_features
+    from src.tree_export import TREES_FILE, TreeEnsemble
+
+    parser = argparse.ArgumentParser(description="Distill the XGBoost model into a sparse linear preview model.")
+    parser.add_argument("--data", type=Path, required=True, help="Dataset the model was trained on.")
+    parser.add_argument("--artifacts_dir", type=Path, default=Path("artifacts"))
+    parser.add_argument("--test_size", type=float, default=0.2)
+    parser.add_argument("--C", type=float, default=DEFAULT_C, help="Inverse L1 strength; smaller is sparser.")
+    args = parser.parse_args()
+
+    X, Y, _, _ = load_features(args.data, args.artifacts_dir / "cache")
+    X_train, X_val, _, y_val = train_test_split(X, Y, test_size=args.test_size, random_state=42)
+    trees = args.artifacts_dir / TREES_FILE
+    teacher = TreeEnsemble.load(trees) if trees.exists() else joblib.load(args.artifacts_dir / "xgb_onevsrest.joblib")
+    print(summary(distill(teacher, X_train, X_val, y_val, args.artifacts_dir, C=args.C)))
+
+
+if __name__ == "__main__":
+    main()
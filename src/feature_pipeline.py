@@ -61,3 +61,11 @@ class FeatureEncoder:
         nums = self.scaler.transform(df[self.numeric_cols].fillna(0))
         return np.hstack([skills, desired, cats, nums])
 
+    def feature_names(self) -> List[str]:
+        """Readable name of each column transform() produces, in order."""
+        names = [f"skill:{s}" for s in self.skills_mlb.classes_]
+        names += [f"desired_role:{r}" for r in self.desired_mlb.classes_]
+        for col, cats in zip(self.categorical_cols, self.cat_encoder.categories_):
+            names += [f"{col}={c}" for c in cats]
+        return names + list(self.numeric_cols)
+
@@ -0,0 +1,124 @@
+"""
+On-disk cache of the encoded training matrices.
+
+Re-running train_xgb.py only to try other XGBoost settings used to re-parse
+the dataset, refit FeatureEncoder and rebuild X/Y every time. The encoded
+matrices are now saved once as plain .npy files, next to the fitted encoder
+and label binarizer, under a key made from:
+
+  - a content hash of the dataset file,
+  - the encoder configuration (columns and each component's parameters),
+  - FEATURES_VERSION, bumped whenever the schema adaptation in train_xgb
+    changes what X/Y contain.
+
+Later runs open X and Y with `np.load(mmap_mode="r")`, which takes
+milliseconds however large they are; pages are read lazily as training
+touches them, and several processes can share one copy through the OS page
+cache.
+
+Layout: <cache_dir>/features-<key>/{X.npy, Y.npy, encoder.joblib,
+label_binarizer.joblib, meta.json}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+import joblib
+import numpy as np
+
+from src.feature_pipeline import FeatureEncoder
+from src.ingest import file_fingerprint
+
+logger = logging.getLogger(__name__)
+
+FEATURES_VERSION = 1
+
+
+def encoder_config(encoder: FeatureEncoder) -> dict:
+    """What determines the encoding, independent of the fitted state."""
+    components = {
+        name: {"class": type(obj).__name__, "params": obj.get_params()}
+        for name, obj in (
+            ("skills_mlb", encoder.skills_mlb),
+            ("desired_mlb", encoder.desired_mlb),
+            ("cat_encoder", encoder.cat_encoder),
+            ("scaler", encoder.scaler),
+        )
+    }
+    return {
+        "categorical_cols": list(encoder.categorical_cols),
+        "numeric_cols": list(encoder.numeric_cols),
+        "components": components,
+    }
+
+
+def cache_key(data_path: Path, encoder: FeatureEncoder) -> str:
+    payload = json.dumps(
+        {
+            "data": file_fingerprint(data_path),
+            "encoder": encoder_config(encoder),
+            "version": FEATURES_VERSION,
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def entry_dir(cache_dir: Path, key: str) -> Path:
+    return cache_dir / f"features-{key}"
+
+
+def load(cache_dir: Path, key: str) -> Optional[Tuple[np.ndarray, np.ndarray, FeatureEncoder, object]]:
+    """(X, Y, encoder, label_binarizer) with X/Y memory-mapped, or None on a miss."""
+    path = entry_dir(cache_dir, key)
+    if not (path / "meta.json").exists():
+        return None
+    try:
+        X = np.load(path / "X.npy", mmap_mode="r")
+        Y = np.load(path / "Y.npy", mmap_mode="r")
+        encoder = joblib.load(path / "encoder.joblib")
+        label_binarizer = joblib.load(path / "label_binarizer.joblib")
+    except Exception as exc:
+        logger.warning("Ignoring unreadable feature cache %s: %s", path, exc)
+        return None
+    logger.info("Loaded encoded features %s from %s", X.shape, path)
+    return X, Y, encoder, label_binarizer
+
+
+def save(cache_dir: Path, key: str, X: np.ndarray, Y: np.ndarray,
+         encoder: FeatureEncoder, label_binarizer, source: Path) -> Path:
+    """Write an entry atomically: build it in a temp dir, then rename into place."""
+    final = entry_dir(cache_dir, key)
+    tmp = cache_dir / f".{final.name}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    np.save(tmp / "X.npy", np.ascontiguousarray(X))
+    np.save(tmp / "Y.npy", np.ascontiguousarray(Y))
+    joblib.dump(encoder, tmp / "encoder.joblib")
+    joblib.dump(label_binarizer, tmp / "label_binarizer.joblib")
+    meta = {
+        "key": key,
+        "source": str(source),
+        "X_shape": list(X.shape),
+        "Y_shape": list(Y.shape),
+        "X_dtype": str(X.dtype),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "features_version": FEATURES_VERSION,
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta, indent=2))
+    try:
+        tmp.rename(final)
+    except OSError:
+        # Another run stored the same key first; its entry is equivalent
+        shutil.rmtree(tmp, ignore_errors=True)
+    logger.info("Cached encoded features at %s", final)
+    return final
@@ -0,0 +1,210 @@
+"""
+Parallel hyperparameter search for the per-role XGBoost models.
+
+Used by `train_xgb.py --search`. Each trial trains one binary XGBClassifier
+per role with early stopping on the validation split, then scores the
+stacked validation probabilities with the ranking metrics. Trials run in a
+process pool. CPU cores are split between workers, with each trial's
+`n_jobs` = cores // workers, so the pool never runs more XGBoost threads than
+there are cores.
+
+The train/validation matrices are written once as .npy files. Every worker
+opens them with mmap_mode="r" in its initializer, so all trials share one
+copy through the page cache instead of pickling the data to each process.
+
+Search spaces are JSON:
+
+  {"grid": {"max_depth": [4, 6, 8], "learning_rate": [0.05, 0.1]}}
+  {"random": {"max_depth": [3, 4, 6, 8],
+              "learning_rate": {"low": 0.01, "high": 0.3, "log": true},
+              "subsample": {"low": 0.6, "high": 1.0}},
+   "n_trials": 20, "seed": 0}
+
+Results go to leaderboard.json / leaderboard.csv, best trial first.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.ranking_metrics import check_metric, ranking_metrics
+
+DEFAULT_SPACE = {
+    "random": {
+        "max_depth": [3, 4, 6, 8],
+        "learning_rate": {"low": 0.02, "high": 0.3, "log": True},
+        "subsample": {"low": 0.6, "high": 1.0},
+        "colsample_bytree": {"low": 0.5, "high": 1.0},
+        "min_child_weight": [1, 2, 5],
+        "reg_lambda": {"low": 0.1, "high": 10.0, "log": True},
+    },
+    "n_trials": 12,
+    "seed": 0,
+}
+MAX_ESTIMATORS = 1000
+# Computed by every trial next to the ranking metrics of --ks
+TRIAL_METRICS = ("hamming_loss", "logloss")
+EARLY_STOPPING_ROUNDS = 30
+
+# Per-worker state, set by _init_worker
+_data: Dict[str, np.ndarray] = {}
+
+
+def load_space(spec) -> dict:
+    """A space from a JSON file path, a JSON string, or None for DEFAULT_SPACE."""
+    if spec is None:
+        return DEFAULT_SPACE
+    path = Path(spec)
+    return json.loads(path.read_text() if path.exists() else spec)
+
+
+def _sample(dist, rng: random.Random):
+    if isinstance(dist, list):
+        return rng.choice(dist)
+    if isinstance(dist, dict):
+        low, high = dist["low"], dist["high"]
+        if dist.get("log"):
+            value = math.exp(rng.uniform(math.log(low), math.log(high)))
+        else:
+            value = rng.uniform(low, high)
+        return int(round(value)) if dist.get("int") else round(value, 6)
+    return dist
+
+
+def expand_space(space: dict) -> List[dict]:
+    """The list of parameter dicts a space describes."""
+    if "grid" in space:
+        keys = sorted(space["grid"])
+        return [dict(zip(keys, values)) for values in itertools.product(*(space["grid"][k] for k in keys))]
+    rng = random.Random(space.get("seed", 0))
+    dists = space.get("random", {})
+    return [{k: _sample(v, rng) for k, v in sorted(dists.items())} for _ in range(space.get("n_trials", 10))]
+
+
+def plan_workers(n_trials: int, workers: int | None = None) -> tuple:
+    """(processes, XGBoost threads per trial) without oversubscribing the cores."""
+    cores = os.cpu_count() or 1
+    workers = workers or min(n_trials, max(1, cores // 2))
+    workers = max(1, min(workers, n_trials, cores))
+    return workers, max(1, cores // workers)
+
+
+def share_matrices(out_dir: Path, **arrays) -> Dict[str, Path]:
+    """Write arrays as .npy once so workers can memory-map them."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name, arr in arrays.items():
+        paths[name] = out_dir / f"{name}.npy"
+        np.save(paths[name], np.ascontiguousarray(arr))
+    return paths
+
+
+def _init_worker(paths: Dict[str, str]) -> None:
+    for name, path in paths.items():
+        _data[name] = np.load(path, mmap_mode="r")
+
+
+def fit_roles(params: dict, X_train, y_train, X_val, y_val, n_jobs: int):
+    """Per-role early-stopped boosters; returns (models, val probabilities)."""
+    from xgboost import XGBClassifier
+
+    proba = np.zeros(y_val.shape, dtype=np.float64)
+    models = []
+    for j in range(y_train.shape[1]):
+        column = np.asarray(y_train[:, j])
+        if column.min() == column.max():
+            # Same as OneVsRestClassifier: a constant label gets a constant score
+            models.append(float(column[0]))
+            proba[:, j] = column[0]
+            continue
+        clf = XGBClassifier(
+            **{**params, "n_estimators": params.get("n_estimators", MAX_ESTIMATORS)},
+            early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+            n_jobs=n_jobs,
+            objective="binary:logistic",
+            eval_metric="logloss",
+        )
+        clf.fit(X_train, column, eval_set=[(X_val, y_val[:, j])], verbose=False)
+        proba[:, j] = clf.predict_proba(X_val)[:, 1]
+        models.append(clf)
+    return models, proba
+
+
+def _run_trial(trial_id: int, params: dict, n_jobs: int, ks) -> dict:
+    X_train, y_train, X_val, y_val = (_data[k] for k in ("X_train", "y_train", "X_val", "y_val"))
+    started = time.perf_counter()
+    models, proba = fit_roles(params, X_train, y_train, X_val, y_val, n_jobs)
+    fit_seconds = time.perf_counter() - started
+
+    y_val = np.asarray(y_val)
+    metrics = ranking_metrics(y_val, proba, ks=ks)
+    metrics["hamming_loss"] = float(((proba >= 0.5) != y_val).mean())
+    eps = 1e-7
+    clipped = np.clip(proba, eps, 1 - eps)
+    metrics["logloss"] = float(-(y_val * np.log(clipped) + (1 - y_val) * np.log(1 - clipped)).mean())
+    best_iterations = [m.best_iteration + 1 for m in models if not isinstance(m, float)]
+    return {
+        "trial": trial_id,
+        "params": params,
+        "metrics": metrics,
+        "fit_seconds": round(fit_seconds, 3),
+        "n_jobs": n_jobs,
+        "mean_trees": float(np.mean(best_iterations)) if best_iterations else 0.0,
+        "max_trees": int(max(best_iterations)) if best_iterations else 0,
+    }
+
+
+def run_search(X_train, y_train, X_val, y_val, space: dict, work_dir: Path, out_dir: Path,
+               workers: int | None = None, metric: str = "ndcg@3", ks=(1, 3, 5), log=print) -> List[dict]:
+    check_metric(metric, ks, extra=TRIAL_METRICS)
+    trials = expand_space(space)
+    if not trials:
+        raise ValueError("Search space produced no trials")
+    workers, n_jobs = plan_workers(len(trials), workers)
+    paths = share_matrices(work_dir, X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val)
+    log(f"Searching {len(trials)} trials on {workers} workers x {n_jobs} threads "
+        f"(train {X_train.shape}, val {X_val.shape}); ranking by {metric}")
+
+    higher_is_better = not metric.startswith(("hamming_loss", "logloss"))
+    results = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=({k: str(v) for k, v in paths.items()},)) as pool:
+        futures = [pool.submit(_run_trial, i, params, n_jobs, tuple(ks)) for i, params in enumerate(trials)]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            log(f"  trial {result['trial']:>3}  {metric}={result['metrics'].get(metric, float('nan')):.4f}  "
+                f"trees~{result['mean_trees']:.0f}  {result['fit_seconds']:.1f}s  {result['params']}")
+    wall = time.perf_counter() - started
+
+    results.sort(key=lambda r: r["metrics"].get(metric, float("nan")), reverse=higher_is_better)
+    for rank, r in enumerate(results, 1):
+        r["rank"] = rank
+    write_leaderboard(results, out_dir, metric, wall)
+    return results
+
+
+def write_leaderboard(results: List[dict], out_dir: Path, metric: str, wall_seconds: float) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "leaderboard.json").write_text(json.dumps(
+        {"metric": metric, "wall_seconds": round(wall_seconds, 3), "trials": results}, indent=2))
+    param_keys = sorted({k for r in results for k in r["params"]})
+    metric_keys = sorted({k for r in results for k in r["metrics"]})
+    with open(out_dir / "leaderboard.csv", "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["rank", "trial", "fit_seconds", "n_jobs", "mean_trees", "max_trees", *param_keys, *metric_keys])
+        for r in results:
+            writer.writerow([r["rank"], r["trial"], r["fit_seconds"], r["n_jobs"], r["mean_trees"], r["max_trees"],
+                             *(r["params"].get(k) for k in param_keys), *(r["metrics"].get(k) for k in metric_keys)])
@@ -0,0 +1,196 @@
+"""
+Warm-start incremental retraining for the one-vs-rest XGBoost model.
+
+Used by `train_xgb.py --incremental_from <artifacts> --new_data <file>`.
+It loads the previous xgb_onevsrest.joblib, encoder and label binarizer and
+keeps the encoder's vocabulary unchanged, so existing feature columns keep
+their meaning. Each role's booster then continues boosting for
+--incremental_rounds extra trees on the new rows only
+(`XGBClassifier.fit(..., xgb_model=booster)`).
+
+Vocabulary policy (--unseen_skills):
+  ignore  skills the encoder has never seen are dropped (the model cannot
+          use them without a new column); their rate is reported
+  fail    abort when new rows contain unseen skills, forcing a full rebuild
+New roles cannot be added incrementally; rows labelled only with unknown
+roles contribute negatives and are counted in the report.
+
+Roles whose new rows hold a single class are left as they were: boosting on
+all-negative data would only push those scores down.
+
+To decide when a full rebuild is due, the previous, incremental and (unless
+--skip_full_compare) fully retrained models are scored on the same
+validation rows: the old split plus a held-out share of the new data. The
+report sets full_rebuild_recommended when the incremental model trails the
+full retrain by more than --rebuild_tolerance, or when unseen skills are
+common.
+
+The preview student (student_linear.npz) is re-distilled from the updated
+trees on the old and new training rows, as a full run would; with
+--no_distill a student left in the artifacts dir is removed instead, since
+it would still mirror the previous trees.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.multiclass import OneVsRestClassifier
+from xgboost import XGBClassifier
+
+from src import distill, tree_export
+from src.ingest import load_parsed_dataset
+from src.ranking_metrics import check_metric, ranking_metrics
+
+UNSEEN_SKILL_ROWS_LIMIT = 0.05
+
+
+def vocabulary_drift(df: pd.DataFrame, encoder, label_binarizer) -> dict:
+    known_skills = set(encoder.skills_mlb.classes_)
+    known_roles = set(label_binarizer.classes_)
+    unseen_per_row = df["skills"].map(lambda skills: [s for s in skills if s not in known_skills])
+    unseen = sorted({s for row in unseen_per_row for s in row})
+    unknown_roles = sorted({r for labels in df["labels"] for r in labels if r not in known_roles})
+    return {
+        "rows": int(len(df)),
+        "unseen_skills": unseen,
+        "rows_with_unseen_skills": float((unseen_per_row.map(len) > 0).mean()) if len(df) else 0.0,
+        "unknown_roles": unknown_roles,
+        "rows_with_unknown_roles": float(df["labels"].map(lambda ls: any(r not in known_roles for r in ls)).mean())
+        if len(df) else 0.0,
+    }
+
+
+def encode(df: pd.DataFrame, encoder, label_binarizer):
+    known = set(encoder.skills_mlb.classes_)
+    roles = set(label_binarizer.classes_)
+    df = df.assign(
+        skills=df["skills"].map(lambda skills: [s for s in skills if s in known]),
+        labels=df["labels"].map(lambda labels: [r for r in labels if r in roles]),
+    )
+    return encoder.transform(df), label_binarizer.transform(df["labels"])
+
+
+def continue_boosting(model: OneVsRestClassifier, X, Y, rounds: int) -> dict:
+    """Add `rounds` trees to each role's booster in place; returns per-role status."""
+    status = {"updated": [], "skipped_single_class": [], "skipped_constant": []}
+    for j, est in enumerate(model.estimators_):
+        column = Y[:, j]
+        if not isinstance(est, XGBClassifier):
+            # Role had a single class at training time; nothing to warm-start
+            status["skipped_constant"].append(j)
+            continue
+        if column.min() == column.max():
+            status["skipped_single_class"].append(j)
+            continue
+        previous = est.get_booster()
+        est.set_params(n_estimators=rounds)
+        est.fit(X, column, xgb_model=previous, verbose=False)
+        status["updated"].append(j)
+    return status
+
+
+# Scored next to the ranking metrics of --ks, so --search_metric may name it
+SCORE_METRICS = ("hamming_loss",)
+
+
+def _score(model, X, Y, ks) -> dict:
+    proba = model.predict_proba(X)
+    return {**ranking_metrics(Y, proba, ks=ks), "hamming_loss": float(((proba >= 0.5) != Y).mean())}
+
+
+def run_incremental(args, cache_dir, prepare_frame, build_features, params: dict) -> None:
+    # The models are compared by this metric at the end; fail before training them
+    check_metric(args.search_metric, args.ks, extra=SCORE_METRICS)
+    prev_dir: Path = args.incremental_from
+    model = joblib.load(prev_dir / "xgb_onevsrest.joblib")
+    encoder = joblib.load(prev_dir / "feature_encoder.joblib")
+    label_binarizer = joblib.load(prev_dir / "label_binarizer.joblib")
+    roles = label_binarizer.classes_.tolist()
+
+    # prepare_frame maps raw values in place and is not idempotent, so the
+    # raw frames are kept and each encoder gets its own prepared copy
+    old_raw = load_parsed_dataset(args.data, cache_dir)
+    new_raw = load_parsed_dataset(args.new_data, cache_dir)
+    drift = vocabulary_drift(prepare_frame(new_raw.copy(), encoder), encoder, label_binarizer)
+    print(f"New data: {drift['rows']} rows; {drift['rows_with_unseen_skills']:.1%} with unseen skills "
+          f"({len(drift['unseen_skills'])} distinct), {drift['rows_with_unknown_roles']:.1%} with unknown roles")
+    if drift["unseen_skills"] and args.unseen_skills == "fail":
+        raise SystemExit(f"Unseen skills in new data: {drift['unseen_skills'][:20]} ... run a full rebuild")
+
+    # Same split as the original training run, plus a held-out share of the new rows
+    old_train, old_val = train_test_split(old_raw, test_size=args.test_size, random_state=42)
+    new_train, new_val = train_test_split(new_raw, test_size=args.test_size, random_state=42)
+    val_raw = pd.concat([old_val, new_val], ignore_index=True)
+    X_val, y_val = encode(prepare_frame(val_raw.copy(), encoder), encoder, label_binarizer)
+    X_new, y_new = encode(prepare_frame(new_train.copy(), encoder), encoder, label_binarizer)
+
+    report = {"drift": drift, "rounds": args.incremental_rounds, "validation_rows": int(len(val_raw))}
+    report["previous"] = _score(model, X_val, y_val, args.ks)
+
+    updated = copy.deepcopy(model)
+    started = time.perf_counter()
+    status = continue_boosting(updated, X_new, y_new, args.incremental_rounds)
+    report["incremental_seconds"] = round(time.perf_counter() - started, 3)
+    report["roles"] = {key: [roles[j] for j in idx] for key, idx in status.items()}
+    report["incremental"] = _score(updated, X_val, y_val, args.ks)
+
+    if not args.skip_full_compare:
+        started = time.perf_counter()
+        X_full, Y_full, full_encoder, full_lb = build_features(pd.concat([old_train, new_train], ignore_index=True))
+        full = OneVsRestClassifier(XGBClassifier(**params, n_jobs=-1, objective="binary:logistic",
+                                                 eval_metric="logloss"))
+        full.fit(X_full, Y_full)
+        report["full_seconds"] = round(time.perf_counter() - started, 3)
+        val_full = prepare_frame(val_raw.copy(), full_encoder)
+        report["full"] = _score(full, full_encoder.transform(val_full), full_lb.transform(val_full["labels"]), args.ks)
+
+    metric = args.search_metric
+    reasons = []
+    if "full" in report:
+        gap = report["full"][metric] - report["incremental"][metric]
+        report["gap_to_full"] = {metric: gap}
+        if gap > args.rebuild_tolerance:
+            reasons.append(f"{metric} trails a full retrain by {gap:.4f}")
+    if drift["rows_with_unseen_skills"] > UNSEEN_SKILL_ROWS_LIMIT:
+        reasons.append(f"{drift['rows_with_unseen_skills']:.1%} of new rows have unseen skills")
+    if drift["unknown_roles"]:
+        reasons.append(f"new roles: {', '.join(drift['unknown_roles'])}")
+    report["full_rebuild_recommended"] = bool(reasons)
+    report["reasons"] = reasons
+
+    for name in ("previous", "incremental", "full"):
+        if name in report:
+            print(f"{name:<12} {metric}={report[name][metric]:.4f}  precision@3={report[name].get('precision@3', float('nan')):.4f}")
+    print("Full rebuild recommended: " + ("; ".join(reasons) if reasons else "no"))
+
+    artifacts_dir = args.artifacts_dir
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(updated, artifacts_dir / "xgb_onevsrest.joblib")
+    tree_export.export_model(updated, artifacts_dir / tree_export.TREES_FILE)
+    joblib.dump(encoder, artifacts_dir / "feature_encoder.joblib")
+    joblib.dump(label_binarizer, artifacts_dir / "label_binarizer.joblib")
+    np.save(artifacts_dir / "val_proba.npy", updated.predict_proba(X_val))
+    np.save(artifacts_dir / "y_val.npy", y_val)
+    (artifacts_dir / "roles.json").write_text(json.dumps(roles, indent=2))
+    (artifacts_dir / "metrics.json").write_text(json.dumps(report["incremental"], indent=2))
+    (artifacts_dir / "incremental_report.json").write_text(json.dumps(report, indent=2))
+
+    if args.no_distill:
+        # A student fitted to the previous trees would disagree with the new full tier
+        for name in (distill.STUDENT_FILE, "distill_report.json"):
+            (artifacts_dir / name).unlink(missing_ok=True)
+    else:
+        teacher = tree_export.TreeEnsemble.load(artifacts_dir / tree_export.TREES_FILE)
+        X_old, _ = encode(prepare_frame(old_train.copy(), encoder), encoder, label_binarizer)
+        student_report = distill.distill(teacher, np.vstack([X_old, X_new]), X_val, y_val, artifacts_dir,
+                                         C=args.student_C, ks=args.ks)
+        print(distill.summary(student_report))
+    print(f"Artifacts saved under {artifacts_dir}")
@@ -0,0 +1,211 @@
+"""
+Fast dataset ingestion for training.
+
+List-valued columns (skills, desired_roles, labels) arrive as native lists
+(parquet), JSON strings, Python literals or comma-separated text. The old
+per-row `ensure_list` tried json.loads, then ast.literal_eval, then a split
+for every value, so a plain CSV paid for two exceptions per row. Here the
+encoding is detected once per column from a sample. Delimited text is then
+split with vectorized pandas string operations, and JSON goes straight to
+json.loads. The result matches `ensure_list` value for value; rows that do
+not fit the detected encoding fall back to it.
+
+The parsed frame can be cached as parquet with native list columns, keyed by
+a content hash of the source file, so later runs skip parsing entirely. The
+cache needs pyarrow and is skipped with a message when it is missing.
+"""
+
+from __future__ import annotations
+
+import ast
+import gc
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+LIST_COLUMNS = ("skills", "desired_roles", "labels")
+SAMPLE_SIZE = 1000
+# Strings json.loads or ast.literal_eval might accept: brackets, quotes,
+# numbers and keyword constants
+LITERAL_PREFIX = r"\s*(?:[\[{(\"'.+\-\d]|[a-zA-Z]{1,2}[\"']|(?:true|false|null|True|False|None|NaN|Infinity)\b)"
+INGEST_VERSION = 2  # bump when parsing changes so stale caches are ignored
+
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PARQUET = True
+except Exception:
+    _HAS_PARQUET = False
+
+
+def load_dataset(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    if path.suffix == ".csv":
+        return pd.read_csv(path)
+    raise ValueError(f"Unsupported file extension: {path.suffix}")
+
+
+def ensure_list(value):
+    """Per-value parser kept as the reference and the fallback for odd rows."""
+    if isinstance(value, list):
+        return value
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, str) and value:
+        try:
+            return json.loads(value)
+        except Exception:
+            try:
+                return ast.literal_eval(value)
+            except Exception:
+                return [v.strip() for v in value.split(",") if v.strip()]
+    return []
+
+
+def file_fingerprint(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_list_encoding(series: pd.Series, sample_size: int = SAMPLE_SIZE) -> str:
+    """One of 'native', 'json', 'python', 'delimited' or 'empty' for a column."""
+    sample = series.dropna().head(sample_size)
+    if sample.empty:
+        return "empty"
+    if sample.map(lambda v: isinstance(v, (list, tuple, np.ndarray))).all():
+        return "native"
+    text = sample[sample.map(lambda v: isinstance(v, str))].str.strip()
+    text = text[text != ""]
+    if text.empty:
+        return "empty"
+    bracketed = text.str.startswith("[") & text.str.endswith("]")
+    if not bracketed.all():
+        return "delimited"
+    try:
+        text.map(json.loads)
+        return "json"
+    except ValueError:
+        return "python"
+
+
+def _split_delimited(text: pd.Series) -> pd.Series:
+    """Vectorized `[v.strip() for v in s.split(",") if v.strip()]` over strings."""
+    # Collapse separators with their surrounding whitespace and empty fields,
+    # then trim what is left at the ends, so a plain split yields clean tokens
+    text = text.str.replace(r"\s*,[\s,]*", ",", regex=True).str.strip().str.strip(",").str.strip()
+    with _gc_paused():
+        parts = text.str.split(",")
+        empty = text == ""
+        parts[empty] = parts[empty].map(lambda _: [])
+    return parts
+
+
+@contextmanager
+def _gc_paused():
+    """Suspend cyclic GC while building millions of small lists.
+
+    Each new container counts towards a collection, and every collection
+    rescans the lists already built, which made the split several times
+    slower than the string work itself. Lists of str cannot form cycles.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _map_values(series: pd.Series, fn) -> pd.Series:
+    # Series.map infers a dtype from the results, so cells that all decode to
+    # scalars ('None', '1') would come back as floats [nan, 1.0]
+    return pd.Series([fn(v) for v in series], index=series.index, dtype=object)
+
+
+def _parse_bracketed(series: pd.Series, loads) -> pd.Series:
+    def parse(value):
+        if isinstance(value, str) and value:
+            try:
+                return loads(value)
+            except Exception:
+                return ensure_list(value)
+        return ensure_list(value)
+
+    return _map_values(series, parse)
+
+
+def parse_list_column(series: pd.Series, encoding: Optional[str] = None) -> pd.Series:
+    """Parse a list-valued column; same values as `series.apply(ensure_list)`."""
+    encoding = encoding or detect_list_encoding(series)
+    if encoding in ("empty", "native"):
+        return _map_values(series, ensure_list)
+    if encoding == "json":
+        return _parse_bracketed(series, json.loads)
+    if encoding == "python":
+        return _parse_bracketed(series, ast.literal_eval)
+
+    # The .str accessor yields NaN for non-string cells, which marks them
+    literal = series.str.match(LITERAL_PREFIX)
+    is_text = literal.notna()
+    parsed = _split_delimited(series.where(is_text, ""))
+    # Values ensure_list would have decoded rather than split (JSON/Python
+    # literals, numbers, keywords) and non-string cells keep its answer
+    odd = literal.fillna(False).astype(bool) | (~is_text & series.notna())
+    if odd.any():
+        parsed[odd] = _map_values(series[odd], ensure_list)
+    return parsed
+
+
+def parse_list_columns(df: pd.DataFrame, columns: Iterable[str] = LIST_COLUMNS) -> pd.DataFrame:
+    for col in columns:
+        if col in df.columns:
+            encoding = detect_list_encoding(df[col])
+            logger.info("Parsing list column %s as %s", col, encoding)
+            df[col] = parse_list_column(df[col], encoding)
+    return df
+
+
+def cache_path(path: Path, cache_dir: Path) -> Path:
+    return cache_dir / f"{path.stem}-{file_fingerprint(path)[:16]}-v{INGEST_VERSION}.parquet"
+
+
+def load_parsed_dataset(path: Path, cache_dir: Optional[Path] = None,
+                        columns: Iterable[str] = LIST_COLUMNS) -> pd.DataFrame:
+    """Read `path` with list columns parsed, using the parquet cache when possible."""
+    if cache_dir is None or not _HAS_PARQUET:
+        if cache_dir is not None:
+            logger.warning("pyarrow is not installed; parsed-dataset cache disabled")
+        return parse_list_columns(load_dataset(path), columns)
+
+    cached = cache_path(path, cache_dir)
+    if cached.exists():
+        logger.info("Loading parsed dataset from %s", cached)
+        df = pd.read_parquet(cached)
+        for col in columns:
+            if col in df.columns:
+                df[col] = df[col].map(ensure_list)
+        return df
+
+    df = parse_list_columns(load_dataset(path), columns)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        df.to_parquet(cached, index=False)
+        logger.info("Cached parsed dataset at %s", cached)
+    except Exception as exc:
+        # Mixed-type list columns cannot be stored natively; training goes on
+        logger.warning("Could not cache parsed dataset: %s", exc)
+        cached.unlink(missing_ok=True)
+    return df
@@ -5,8 +5,11 @@ Flask prediction service for the Sensei Phase 1 engine.
 from __future__ import annotations
 
 import argparse
+import functools
+import itertools
 import json
 import logging
+import re
 from pathlib import Path
 from typing import Dict, List
 
@@ -24,6 +27,15 @@ except Exception:
     except Exception:
         feature_pipeline = None
 
+try:
+    from src.distill import STUDENT_FILE, LinearStudent
+    from src.ingest import file_fingerprint
+    from src.tree_export import TREES_FILE, TreeEnsemble
+except Exception:
+    from distill import STUDENT_FILE, LinearStudent
+    from ingest import file_fingerprint
+    from tree_export import TREES_FILE, TreeEnsemble
+
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -57,16 +69,94 @@ MARKET_TREND_MAP = {
     "UX/UI Designer": "stable",
 }
 
+# The NumPy tree evaluator is faster than xgboost up to about this many rows
+# per call; larger batches go to the xgboost model when it is available
+TREE_ENGINE_MAX_ROWS = 32
+
+# "full": XGBoost trees; "preview": the distilled linear model, which scores a
+# payload without FeatureEncoder (falls back to full when not trained)
+MODEL_TIERS = ("full", "preview")
+
+# explain=true: roles explained per profile and contributions listed per role
+EXPLAIN_TOP_K = 3
+EXPLAIN_TOP_FEATURES = 10
+
+
+# Encoder skill tokens ('python', 'rest_apis') and the Title Case names in
+# configs/ ('Python', 'REST APIs') meet on skill_key(); these cover the pairs
+# that differ by more than case and punctuation
+SKILL_KEY_ALIASES = {
+    "node_js": "nodejs",
+    "ci_cd": "cicd",
+    "power_bi": "powerbi",
+    "c_cpp": "cpp",
+    "user_research": "ux_research",
+    "data_viz": "tableau",
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def skill_key(name) -> str:
+    """Canonical form of a skill name, e.g. 'Machine Learning' -> 'machine_learning'."""
+    key = str(name).strip().lower().replace("c++", "cpp").replace("c#", "csharp")
+    key = re.sub(r"[^a-z0-9]+", "_", key).strip("_")
+    return SKILL_KEY_ALIASES.get(key, key)
+
+
+MAX_BATCH_PROFILES = 1000
+MAX_SENSITIVITY_VARIANTS = 5000
+
+
+def _json_value(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def _flag(value) -> bool:
+    """Boolean request options arrive as JSON booleans or query strings."""
+    return str(value).lower() in ("1", "true", "yes")
+
 
 class SenseiPredictor:
-    def __init__(self, artifacts_dir: Path, configs_dir: Path):
-        self.model = joblib.load(artifacts_dir / "xgb_onevsrest.joblib")
+    def __init__(self, artifacts_dir: Path, configs_dir: Path, engine: str = "auto"):
+        """engine: "auto" uses the exported trees (xgb_trees.npz) when present,
+        "numpy" requires them, "xgboost" always uses the pickled model."""
+        if engine not in ("auto", "numpy", "xgboost"):
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
+        self.model_path = artifacts_dir / "xgb_onevsrest.joblib"
+        self._model = None
+        self._model_version = None
+        self._explainers: Dict[str, Dict] = {}
+        self.trees = None
+        trees_path = artifacts_dir / TREES_FILE
+        if engine != "xgboost" and trees_path.exists():
+            self.trees = TreeEnsemble.load(trees_path)
+        elif engine == "numpy":
+            raise FileNotFoundError(f"{trees_path} not found; run `python -m src.tree_export`")
+        else:
+            self._model = joblib.load(self.model_path)
         self.encoder = joblib.load(artifacts_dir / "feature_encoder.joblib")
         self.label_binarizer = joblib.load(artifacts_dir / "label_binarizer.joblib")
         self.roles = self.label_binarizer.classes_.tolist()
+        student_path = artifacts_dir / STUDENT_FILE
+        self.student = LinearStudent.load(student_path).bind(self.encoder) if student_path.exists() else None
         self.thresholds = self._load_thresholds(artifacts_dir)
         self.role_required = json.loads((configs_dir / "role_required_skills.json").read_text())
         self.skill_courses = json.loads((configs_dir / "skill_to_course.json").read_text())
+        # Config name of each skill_key, so encoder tokens find their course
+        self._skill_names = {}
+        for name in [*self.skill_courses, *itertools.chain.from_iterable(self.role_required.values())]:
+            self._skill_names.setdefault(skill_key(name), name)
+        # Required skills (by skill_key) as a (skill, role) indicator matrix for the vectorized skill fit
+        self._required_skills = {}
+        for role in self.roles:
+            for skill in self.role_required.get(role, []):
+                self._required_skills.setdefault(skill_key(skill), len(self._required_skills))
+        self._required_matrix = np.zeros((len(self._required_skills), len(self.roles)))
+        for j, role in enumerate(self.roles):
+            for skill in self.role_required.get(role, []):
+                self._required_matrix[self._required_skills[skill_key(skill)], j] = 1.0
+        self._required_count = np.array([max(len(self.role_required.get(role, [])), 1) for role in self.roles], dtype=float)
 
     def _load_thresholds(self, artifacts_dir: Path) -> np.ndarray:
         path = artifacts_dir / "thresholds.npy"
@@ -77,6 +167,20 @@ class SenseiPredictor:
             return arr
         return np.full(len(self.roles), 0.5)
 
+    @property
+    def model(self):
+        """The pickled OneVsRestClassifier, loaded on first use when serving from exported trees."""
+        if self._model is None:
+            self._model = joblib.load(self.model_path)
+        return self._model
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        if self.trees is not None and (
+            self.engine == "numpy" or len(features) <= TREE_ENGINE_MAX_ROWS or not self.model_path.exists()
+        ):
+            return self.trees.predict_proba(features)
+        return self.model.predict_proba(features)
+
     def _sanitize(self, payload: Dict) -> Dict:
         defaults = {
             "age": 25,
@@ -107,60 +211,41 @@ class SenseiPredictor:
         clean = self._sanitize(payload)
         return pd.DataFrame([clean])
 
-    def predict(self, payload: Dict) -> Dict:
-        df = self._to_dataframe(payload)
-        features = self.encoder.transform(df)
-        proba = self.model.predict_proba(features)[0]
-
-        # Rule features
-        user_skills = set(df.iloc[0]["skills"]) if isinstance(df.iloc[0]["skills"], list) else set()
-        exp_years = float(df.iloc[0]["years_experience"]) if pd.notna(df.iloc[0]["years_experience"]) else 0.0
-        exp_norm = min(exp_years / 5.0, 1.0)
-        sent = DEFAULT_SENTIMENT_MAP.get(df.iloc[0]["sentiment"], DEFAULT_SENTIMENT_MAP["neutral"]) 
-        sent_pos = float(sent.get("pos", 0.33))
-
-        # Interest fit (limited mapping based on available sliders)
-        interest_data = float(df.iloc[0].get("interest_data", 3))
-        interest_prog = float(df.iloc[0].get("interest_programming", 3))
-        interest_design = float(df.iloc[0].get("interest_design", 3))
-        interest_mgmt = float(df.iloc[0].get("interest_management", 3))
-
-        role_interest = {
-            "Data Scientist": (interest_data, interest_prog),
-            "Data Analyst": (interest_data, interest_prog),
-            "Machine Learning Engineer": (interest_data, interest_prog),
-            "Software Developer": (interest_prog, interest_data),
-            "Full Stack Developer": (interest_prog, interest_design),
-            "Frontend Developer": (interest_design, interest_prog),
-            "Backend Developer": (interest_prog, interest_data),
-            "Product Manager": (interest_mgmt, interest_design),
-            "Business Analyst": (interest_mgmt, interest_data),
-            "Blockchain Developer": (interest_prog, interest_data),
-        }
-
-        # Compute blended score per role
-        blended = []
-        for i, role in enumerate(self.roles):
-            ml = float(proba[i])
-            required = self.role_required.get(role, [])
-            if required:
-                overlap = len(set(required) & user_skills)
-                skill_fit = overlap / max(len(required), 1)
-            else:
-                skill_fit = 0.0
-
-            a, b = role_interest.get(role, (3.0, 3.0))
-            interest_fit = (a + b) / 10.0  # normalize to ~[0,1]
-
-            raw = 0.6 * ml + 0.25 * skill_fit + 0.1 * interest_fit + 0.05 * (0.5 * exp_norm + 0.5 * sent_pos)
-            blended.append(raw)
-
-        # Temperature-scaled softmax to produce sharp percentages
-        temperature = 0.7
-        logits = np.array(blended) / max(temperature, 1e-6)
-        exps = np.exp(logits - logits.max())
-        scores = exps / exps.sum()
-
+    def predict(self, payload: Dict, model_tier: str = "full", explain: bool = False) -> Dict:
+        return self.predict_batch([payload], model_tier=model_tier, explain=explain)[0]
+
+    def predict_batch(self, payloads: List[Dict], model_tier: str = "full", explain: bool = False,
+                      explain_top_k: int = EXPLAIN_TOP_K) -> List[Dict]:
+        """predict() for many profiles: one encoder pass and one predict_proba call.
+
+        explain=True attaches XGBoost's per-feature contributions (log-odds)
+        for each profile's top `explain_top_k` recommended roles.
+        """
+        if model_tier not in MODEL_TIERS:
+            raise ValueError(f"Unknown model_tier {model_tier!r}; expected one of {', '.join(MODEL_TIERS)}")
+        if not payloads:
+            return []
+        rows = [self._sanitize(payload) for payload in payloads]
+        if model_tier == "preview" and self.student is not None:
+            if explain:
+                raise ValueError("explain is only available with model_tier=full")
+            proba = np.vstack([self.student.predict_payload(row) for row in rows])
+        else:
+            model_tier = "full"
+            features = self.encoder.transform(pd.DataFrame(rows))
+            proba = self.predict_proba(features)
+
+        skill_sets = [set(row["skills"]) if isinstance(row["skills"], list) else set() for row in rows]
+        scores = self._blend(proba, skill_sets, rows)
+        results = [self._build_result(row, proba[i], scores[i], model_tier) for i, row in enumerate(rows)]
+        if explain:
+            top_roles = [np.argsort(s)[::-1][:explain_top_k] for s in scores]
+            for result, explanation in zip(results, self.explain(features, rows, top_roles)):
+                result["explanations"] = explanation
+                result["model_version"] = self.model_version
+        return results
+
+    def _build_result(self, row: Dict, proba: np.ndarray, scores: np.ndarray, model_tier: str) -> Dict:
         ranked = np.argsort(scores)[::-1]
         top_indices = ranked[:5]
 
@@ -174,16 +259,16 @@ class SenseiPredictor:
             activated_roles = [self.roles[top_indices[0]]]
 
         top_role = recommendations[0]["role"]
-        skill_gap = self._build_skill_gap(top_role, df.iloc[0]["skills"])
+        skill_gap = self._build_skill_gap(top_role, row["skills"])
         try:
             learning_plan = self._build_learning_plan(skill_gap["missing"])
         except Exception:
             learning_plan = []
 
         emotion = {
-            "motivation_score": int(df.iloc[0]["motivation_score"]),
+            "motivation_score": int(row["motivation_score"]),
             "sentiment": DEFAULT_SENTIMENT_MAP.get(
-                df.iloc[0]["sentiment"], DEFAULT_SENTIMENT_MAP["neutral"]
+                row["sentiment"], DEFAULT_SENTIMENT_MAP["neutral"]
             ),
         }
 
@@ -195,17 +280,221 @@ class SenseiPredictor:
             "learning_plan": learning_plan,
             "emotion": emotion,
             "market_trend": market_trend,
+            "model_tier": model_tier,
+        }
+
+    @property
+    def model_version(self) -> str:
+        """Content hash of the pickled model, computed once."""
+        if self._model_version is None:
+            self._model_version = file_fingerprint(self.model_path)[:12]
+        return self._model_version
+
+    def _explainer(self) -> Dict:
+        """Readable feature names and per-role boosters, cached per model version."""
+        version = self.model_version
+        if version not in self._explainers:
+            names = self.encoder.feature_names()
+            n_numeric = len(self.encoder.numeric_cols)
+            self._explainers[version] = {
+                "names": names,
+                # Numeric columns are the encoder's last block; report their raw values
+                "numeric": {len(names) - n_numeric + i: col for i, col in enumerate(self.encoder.numeric_cols)},
+                "boosters": [est.get_booster() if hasattr(est, "get_booster") else None
+                             for est in self.model.estimators_],
+            }
+        return self._explainers[version]
+
+    def explain(self, features: np.ndarray, rows: List[Dict], top_roles: List[np.ndarray],
+                top_features: int = EXPLAIN_TOP_FEATURES) -> List[List[Dict]]:
+        """Per-feature contributions for the given roles of each row.
+
+        Runs XGBoost's native pred_contribs once per role that appears in
+        any row's top roles, on just the rows that need it. Contributions
+        and bias are in log-odds and sum to the role's margin.
+        """
+        import xgboost
+
+        explainer = self._explainer()
+        names = explainer["names"]
+        needed: Dict[int, List[int]] = {}
+        for i, roles in enumerate(top_roles):
+            for j in roles:
+                needed.setdefault(int(j), []).append(i)
+
+        contribs: Dict[tuple, np.ndarray] = {}
+        for j, row_ids in needed.items():
+            booster = explainer["boosters"][j]
+            if booster is None:
+                continue
+            best = booster.attributes().get("best_iteration")
+            out = booster.predict(
+                xgboost.DMatrix(features[row_ids]),
+                pred_contribs=True,
+                iteration_range=(0, int(best) + 1) if best is not None else (0, 0),
+            )
+            for i, values in zip(row_ids, out):
+                contribs[(i, j)] = values
+
+        explanations = []
+        for i, roles in enumerate(top_roles):
+            entries = []
+            for j in roles:
+                j = int(j)
+                values = contribs.get((i, j))
+                if values is None:
+                    # Constant estimator: the role's score does not depend on the features
+                    entries.append({"role": self.roles[j], "bias": None, "contributions": []})
+                    continue
+                order = np.argsort(-np.abs(values[:-1]), kind="stable")[:top_features]
+                entries.append({
+                    "role": self.roles[j],
+                    "bias": float(values[-1]),
+                    "contributions": [
+                        {
+                            "feature": names[f],
+                            "value": _json_value(rows[i].get(explainer["numeric"][f])) if f in explainer["numeric"]
+                            else float(features[i, f]),
+                            "contribution": float(values[f]),
+                        }
+                        for f in order if values[f] != 0
+                    ],
+                })
+            explanations.append(entries)
+        return explanations
+
+    def score_variants(self, payload: Dict, variants: List[Dict]) -> np.ndarray:
+        """Recommendation scores (n_variants, n_roles) for the profile with each
+        variant's fields overridden, e.g. interest slider settings, from one
+        encoder pass and one predict_proba call."""
+        rows = [self._sanitize({**payload, **variant}) for variant in variants]
+        if not rows:
+            return np.zeros((0, len(self.roles)))
+        proba = self.predict_proba(self.encoder.transform(pd.DataFrame(rows)))
+        skill_sets = [set(row["skills"]) if isinstance(row["skills"], list) else set() for row in rows]
+        return self._blend(proba, skill_sets, rows)
+
+    def what_if(self, payload: Dict, target_role: str, pairwise: bool = False, top_n: int = 10) -> Dict:
+        """Rank the skills (or pairs of skills) whose addition most raises `target_role`.
+
+        Every candidate comes from the encoder's skill vocabulary. All of them
+        go through the model in one batched predict_proba call and are then
+        scored by the same blend as predict().
+        """
+        if target_role not in self.roles:
+            raise ValueError(f"Unknown target_role {target_role!r}")
+        row = self._sanitize(payload)
+        have = set(row["skills"]) if isinstance(row["skills"], list) else set()
+        vocab = self.encoder.skills_mlb.classes_.tolist()
+        have_keys = {skill_key(skill) for skill in have}
+        singles = [skill for skill in vocab if skill_key(skill) not in have_keys]
+        candidates = [(skill,) for skill in singles]
+        if pairwise:
+            candidates += list(itertools.combinations(singles, 2))
+
+        # Row 0 is the profile as is; skill indicators are the encoder's first columns
+        base = self.encoder.transform(pd.DataFrame([row]))
+        X = np.repeat(base, len(candidates) + 1, axis=0)
+        column = {skill: i for i, skill in enumerate(vocab)}
+        rows = [i for i, added in enumerate(candidates, 1) for _ in added]
+        cols = [column[skill] for added in candidates for skill in added]
+        X[rows, cols] = 1.0
+
+        proba = self.predict_proba(X)
+        scores = self._blend(proba, [have] + [have | set(added) for added in candidates], [row])
+        j = self.roles.index(target_role)
+        ranks = (scores > scores[:, [j]]).sum(axis=1) + 1
+        delta = scores[1:, j] - scores[0, j]
+        order = np.argsort(-delta, kind="stable")[:top_n]
+
+        return {
+            "target_role": target_role,
+            "baseline": {"score": float(scores[0, j]), "probability": float(proba[0, j]), "rank": int(ranks[0])},
+            "candidates_scored": len(candidates),
+            "results": [
+                {
+                    "skills": list(candidates[i]),
+                    "score": float(scores[i + 1, j]),
+                    "score_delta": float(delta[i]),
+                    "probability": float(proba[i + 1, j]),
+                    "probability_delta": float(proba[i + 1, j] - proba[0, j]),
+                    "rank": int(ranks[i + 1]),
+                    "learning_plan": self._build_learning_plan(list(candidates[i])),
+                }
+                for i in order
+            ],
         }
 
+    def _blend(self, proba: np.ndarray, skill_sets: List[set], rows: List[Dict]) -> np.ndarray:
+        """Recommendation scores, one row per (model probabilities, skill set) pair.
+
+        Blends the model probability with the rule features (required-skill
+        overlap, interest sliders, experience and sentiment), then applies a
+        temperature-scaled softmax over the roles of each row. `rows` holds the
+        profile of each row, or a single profile shared by all of them.
+        """
+        terms = [self._rule_terms(row) for row in rows]
+        interest_fit = np.array([t[0] for t in terms])
+        context = np.array([[t[1]] for t in terms])
+
+        # Share of each role's required skills the profile has
+        required = self._required_skills
+        have = np.zeros((len(skill_sets), len(required)))
+        for i, skills in enumerate(skill_sets):
+            keys = {skill_key(s) for s in skills}
+            have[i, [required[k] for k in keys if k in required]] = 1.0
+        skill_fit = (have @ self._required_matrix) / self._required_count
+
+        blended = 0.6 * proba + 0.25 * skill_fit + 0.1 * interest_fit + 0.05 * context
+
+        # Temperature-scaled softmax to produce sharp percentages
+        temperature = 0.7
+        logits = blended / max(temperature, 1e-6)
+        exps = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exps / exps.sum(axis=1, keepdims=True)
+
+    def _rule_terms(self, row: Dict):
+        """(per-role interest fit, experience/sentiment term) for one profile."""
+        # Rule features
+        exp_years = float(row["years_experience"]) if pd.notna(row["years_experience"]) else 0.0
+        exp_norm = min(exp_years / 5.0, 1.0)
+        sent = DEFAULT_SENTIMENT_MAP.get(row["sentiment"], DEFAULT_SENTIMENT_MAP["neutral"])
+        sent_pos = float(sent.get("pos", 0.33))
+
+        # Interest fit (limited mapping based on available sliders)
+        interest_data = float(row.get("interest_data", 3))
+        interest_prog = float(row.get("interest_programming", 3))
+        interest_design = float(row.get("interest_design", 3))
+        interest_mgmt = float(row.get("interest_management", 3))
+
+        role_interest = {
+            "Data Scientist": (interest_data, interest_prog),
+            "Data Analyst": (interest_data, interest_prog),
+            "Machine Learning Engineer": (interest_data, interest_prog),
+            "Software Developer": (interest_prog, interest_data),
+            "Full Stack Developer": (interest_prog, interest_design),
+            "Frontend Developer": (interest_design, interest_prog),
+            "Backend Developer": (interest_prog, interest_data),
+            "Product Manager": (interest_mgmt, interest_design),
+            "Business Analyst": (interest_mgmt, interest_data),
+            "Blockchain Developer": (interest_prog, interest_data),
+        }
+        # normalize to ~[0,1]
+        interest_fit = [sum(role_interest.get(role, (3.0, 3.0))) / 10.0 for role in self.roles]
+        return interest_fit, 0.5 * exp_norm + 0.5 * sent_pos
+
     def _build_skill_gap(self, role: str, user_skills: List[str]) -> Dict[str, List[str]]:
         required = self.role_required.get(role, [])
         have = list(set(user_skills))
-        missing = [skill for skill in required if skill not in have]
+        have_keys = {skill_key(skill) for skill in have}
+        missing = [skill for skill in required if skill_key(skill) not in have_keys]
         return {"required": required, "have": have, "missing": missing}
 
     def _build_learning_plan(self, missing_skills: List[str]) -> List[Dict]:
         plan = []
         for skill in missing_skills:
+            # Encoder tokens such as 'sql' are listed under their config name ('SQL')
+            skill = self._skill_names.get(skill_key(skill), skill)
             course = self.skill_courses.get(skill)
             if course:
                 if isinstance(course, dict):
@@ -246,7 +535,10 @@ def create_app(predictor: SenseiPredictor, template_dir: Path | None = None) ->
             payload = request.get_json(force=True)
             logger.info(f"Prediction request received with payload: {payload}")
             
-            result = predictor.predict(payload)
+            # ?model_tier=preview (or "model_tier" in the body) selects the linear preview model
+            model_tier = payload.pop("model_tier", None) or request.args.get("model_tier") or "full"
+            explain = _flag(payload.pop("explain", None) or request.args.get("explain"))
+            result = predictor.predict(payload, model_tier=model_tier, explain=explain)
             logger.info(f"Prediction successful: {result['top_recommendations']}")
             
             return jsonify(result), 200
@@ -257,6 +549,75 @@ def create_app(predictor: SenseiPredictor, template_dir: Path | None = None) ->
                 "message": "Failed to generate predictions"
             }), 400
 
+    @app.route("/predict_batch", methods=["POST", "OPTIONS"])
+    def predict_batch_route():
+        if request.method == "OPTIONS":
+            return "", 200
+
+        try:
+            body = request.get_json(force=True)
+            if isinstance(body, list):
+                body = {"profiles": body}
+            profiles = body.get("profiles")
+            if not isinstance(profiles, list):
+                raise ValueError("profiles must be a list of profile objects")
+            if len(profiles) > MAX_BATCH_PROFILES:
+                raise ValueError(f"At most {MAX_BATCH_PROFILES} profiles per request")
+            model_tier = body.get("model_tier") or request.args.get("model_tier") or "full"
+            explain = _flag(body.get("explain") or request.args.get("explain"))
+            results = predictor.predict_batch(profiles, model_tier=model_tier, explain=explain)
+            logger.info(f"Batch prediction successful: {len(results)} profiles")
+            return jsonify({"results": results}), 200
+        except Exception as e:
+            logger.error(f"Batch prediction error: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": str(e),
+                "message": "Failed to generate predictions"
+            }), 400
+
+    @app.route("/sensitivity", methods=["POST", "OPTIONS"])
+    def sensitivity_route():
+        if request.method == "OPTIONS":
+            return "", 200
+
+        try:
+            payload = request.get_json(force=True)
+            variants = payload.pop("variants", None)
+            if not isinstance(variants, list):
+                raise ValueError("variants must be a list of field overrides")
+            if len(variants) > MAX_SENSITIVITY_VARIANTS:
+                raise ValueError(f"At most {MAX_SENSITIVITY_VARIANTS} variants per request")
+            scores = predictor.score_variants(payload, variants)
+            return jsonify({"roles": predictor.roles, "scores": scores.tolist()}), 200
+        except Exception as e:
+            logger.error(f"Sensitivity error: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": str(e),
+                "message": "Failed to score variants"
+            }), 400
+
+    @app.route("/what_if", methods=["POST", "OPTIONS"])
+    def what_if_route():
+        if request.method == "OPTIONS":
+            return "", 200
+
+        try:
+            payload = request.get_json(force=True)
+            target_role = payload.pop("target_role", None)
+            if not target_role:
+                raise ValueError("target_role is required")
+            pairwise = _flag(payload.pop("pairwise", False))
+            top_n = int(payload.pop("top_n", 10))
+            result = predictor.what_if(payload, target_role, pairwise=pairwise, top_n=top_n)
+            logger.info(f"What-if for {target_role}: {result['candidates_scored']} candidates scored")
+            return jsonify(result), 200
+        except Exception as e:
+            logger.error(f"What-if error: {str(e)}", exc_info=True)
+            return jsonify({
+                "error": str(e),
+                "message": "Failed to compute what-if recommendations"
+            }), 400
+
     return app
 
 
@@ -267,6 +628,8 @@ def main() -> None:
     parser.add_argument("--template_dir", type=Path, default=Path("templates"))
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--engine", choices=("auto", "numpy", "xgboost"), default="auto",
+                        help="Tree evaluator: exported NumPy arrays, the pickled xgboost model, or auto.")
     args = parser.parse_args()
 
     logger.info(f"Starting Sensei Prediction API")
@@ -274,7 +637,7 @@ def main() -> None:
     logger.info(f"  Configs: {args.configs_dir}")
     logger.info(f"  Listening on {args.host}:{args.port}")
 
-    predictor = SenseiPredictor(args.artifacts_dir, args.configs_dir)
+    predictor = SenseiPredictor(args.artifacts_dir, args.configs_dir, engine=args.engine)
     app = create_app(predictor, args.template_dir)
     app.run(host=args.host, port=args.port, debug=False)
 
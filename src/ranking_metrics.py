@@ -0,0 +1,148 @@
+"""
+Vectorized top-k ranking metrics for multi-label role predictions.
+
+Computes precision@k, recall@k, nDCG@k, MAP@k and label coverage@k for
+several k in one pass. The top max(k) labels per row come from
+`np.argpartition` (linear time) and are only sorted among themselves. Hits
+are gathered with fancy indexing, so there is no Python loop over rows.
+Large validation sets are processed in row chunks to bound memory.
+
+precision@k and recall@k keep the definitions of the original train_xgb
+helpers: hits / (rows * k) and hits / total positives (micro-averaged).
+nDCG@k and MAP@k are averaged over rows with at least one positive label.
+MAP@k normalises by min(positives, k).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+
+DEFAULT_KS = (1, 3, 5)
+DEFAULT_CHUNK_SIZE = 65_536
+METRIC_PREFIXES = ("precision", "recall", "ndcg", "map", "coverage")
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k highest scores per row, best first."""
+    n_labels = scores.shape[1]
+    k = min(k, n_labels)
+    if k < n_labels:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(n_labels), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+def ranking_metrics(
+    y_true: np.ndarray,
+    scores: np.ndarray,
+    ks: Iterable[int] = DEFAULT_KS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, float]:
+    ks = sorted({int(k) for k in ks})
+    if not ks or ks[0] < 1:
+        raise ValueError("ks must contain positive integers")
+    n_rows, n_labels = scores.shape
+    if y_true.shape != scores.shape:
+        raise ValueError(f"y_true {y_true.shape} and scores {scores.shape} differ in shape")
+    k_max = min(ks[-1], n_labels)
+
+    discounts = 1.0 / np.log2(np.arange(2, k_max + 2))
+    ideal_dcg = np.concatenate([[0.0], np.cumsum(discounts)])  # ideal_dcg[m]: m relevant at the top
+    ranks = np.arange(1, k_max + 1)
+
+    hits = {k: 0.0 for k in ks}
+    ndcg = {k: 0.0 for k in ks}
+    ap = {k: 0.0 for k in ks}
+    covered = {k: np.zeros(n_labels, dtype=bool) for k in ks}
+    total_pos = 0.0
+    rows_with_pos = 0
+
+    for start in range(0, n_rows, chunk_size):
+        y = y_true[start:start + chunk_size]
+        top = top_k_indices(scores[start:start + chunk_size], k_max)
+        rel = np.take_along_axis(y, top, axis=1) > 0
+        cum_hits = np.cumsum(rel, axis=1)
+        n_pos = (y > 0).sum(axis=1)
+        has_pos = n_pos > 0
+        total_pos += n_pos.sum()
+        rows_with_pos += int(has_pos.sum())
+
+        gains = np.cumsum(rel * discounts, axis=1)
+        precision_at_rank = np.cumsum(rel * (cum_hits / ranks), axis=1)
+        for k in ks:
+            kk = min(k, k_max)
+            hits[k] += cum_hits[:, kk - 1].sum()
+            idcg = ideal_dcg[np.minimum(n_pos, kk)]
+            ndcg[k] += (gains[has_pos, kk - 1] / idcg[has_pos]).sum()
+            ap[k] += (precision_at_rank[has_pos, kk - 1] / np.minimum(n_pos[has_pos], kk)).sum()
+            covered[k][top[:, :kk].ravel()] = True
+
+    metrics = {}
+    for k in ks:
+        metrics[f"precision@{k}"] = float(hits[k] / (n_rows * k)) if n_rows else 0.0
+        metrics[f"recall@{k}"] = float(hits[k] / (total_pos or 1))
+        metrics[f"ndcg@{k}"] = float(ndcg[k] / rows_with_pos) if rows_with_pos else 0.0
+        metrics[f"map@{k}"] = float(ap[k] / rows_with_pos) if rows_with_pos else 0.0
+        metrics[f"coverage@{k}"] = float(covered[k].mean()) if n_labels else 0.0
+    return metrics
+
+
+def precision_at_k(y_true: np.ndarray, scores: np.ndarray, k: int) -> float:
+    return ranking_metrics(y_true, scores, ks=(k,))[f"precision@{k}"]
+
+
+def recall_at_k(y_true: np.ndarray, scores: np.ndarray, k: int) -> float:
+    return ranking_metrics(y_true, scores, ks=(k,))[f"recall@{k}"]
+
+
+def metric_names(ks: Iterable[int]) -> list:
+    """Keys ranking_metrics() returns for `ks`, e.g. "ndcg@3"."""
+    return [f"{name}@{k}" for k in sorted({int(k) for k in ks}) for name in METRIC_PREFIXES]
+
+
+def check_metric(metric: str, ks: Iterable[int], extra: Iterable[str] = ()) -> None:
+    """Raise ValueError unless `metric` is computed for `ks` or is one of `extra`.
+
+    Callers that rank or compare by a metric run this before training, so a
+    --search_metric that --ks does not produce fails at once.
+    """
+    names = [*metric_names(ks), *extra]
+    if metric not in names:
+        raise ValueError(f"metric {metric!r} is not computed with ks={','.join(str(k) for k in ks)}; "
+                         f"choose one of {', '.join(names)}")
+
+
+def parse_ks(value: str) -> tuple:
+    return tuple(int(k) for k in value.split(",") if k.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compute top-k ranking metrics from saved validation outputs.")
+    parser.add_argument("--proba", type=Path, required=True, help="Path to val_proba.npy from training.")
+    parser.add_argument("--labels", type=Path, required=True, help="Path to y_val.npy from training.")
+    parser.add_argument("--ks", type=parse_ks, default=DEFAULT_KS, help="Comma-separated k values, e.g. 1,3,5.")
+    parser.add_argument("--chunk_size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--metrics", type=Path, default=None, help="metrics.json to update in place.")
+    args = parser.parse_args()
+
+    y_proba = np.load(args.proba, mmap_mode="r")
+    y_true = np.load(args.labels, mmap_mode="r")
+    metrics = ranking_metrics(y_true, y_proba, ks=args.ks, chunk_size=args.chunk_size)
+    print(json.dumps(metrics, indent=2))
+
+    if args.metrics:
+        existing = json.loads(args.metrics.read_text()) if args.metrics.exists() else {}
+        existing.update(metrics)
+        args.metrics.write_text(json.dumps(existing, indent=2))
+        print(f"Updated {args.metrics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,20 @@ Training pipeline for the Sensei Phase 1 Career Compass model.
 Loads a dataset generated via `data/data_gen.py`, performs feature encoding,
 trains an XGBoost One-vs-Rest classifier, and saves all artifacts required for
 inference (model, encoders, label binarizer, validation probabilities).
+
+The parsed dataset and the encoded X/Y are cached under --cache_dir (see
+src/ingest.py and src/feature_store.py), so reruns on the same data skip
+straight to training.
+
+--incremental_from continues an existing model on new rows instead of
+retraining from scratch (see src/incremental.py).
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import tempfile
 from pathlib import Path
 
 import joblib
@@ -21,69 +29,30 @@ from sklearn.multiclass import OneVsRestClassifier
 from sklearn.preprocessing import MultiLabelBinarizer
 from xgboost import XGBClassifier
 
+from src import distill, feature_store, hparam_search, incremental, tree_export
 from src.feature_pipeline import FeatureEncoder
-import ast
-
-
-def load_dataset(path: Path) -> pd.DataFrame:
-    if path.suffix == ".parquet":
-        return pd.read_parquet(path)
-    if path.suffix == ".csv":
-        return pd.read_csv(path)
-    raise ValueError(f"Unsupported file extension: {path.suffix}")
-
-
-def precision_at_k(y_true: np.ndarray, scores: np.ndarray, k: int) -> float:
-    top_k_idx = np.argsort(scores, axis=1)[:, -k:]
-    hits = 0
-    for row, idxs in enumerate(top_k_idx):
-        hits += y_true[row, idxs].sum()
-    return hits / (len(y_true) * k)
-
-
-def recall_at_k(y_true: np.ndarray, scores: np.ndarray, k: int) -> float:
-    top_k_idx = np.argsort(scores, axis=1)[:, -k:]
-    hits = 0
-    total = y_true.sum()
-    total = total if total > 0 else 1
-    for row, idxs in enumerate(top_k_idx):
-        hits += y_true[row, idxs].sum()
-    return hits / total
+from src.ingest import load_dataset, load_parsed_dataset  # noqa: F401
+from src.ranking_metrics import DEFAULT_KS, check_metric, parse_ks, precision_at_k, ranking_metrics, recall_at_k  # noqa: F401
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Train XGBoost One-vs-Rest model for Sensei.")
-    parser.add_argument("--data", type=Path, required=True, help="Path to dataset (parquet/csv).")
-    parser.add_argument("--artifacts_dir", type=Path, default=Path("artifacts"), help="Output directory.")
-    parser.add_argument("--test_size", type=float, default=0.2)
-    args = parser.parse_args()
+DEFAULT_PARAMS = {
+    "n_estimators": 300,
+    "max_depth": 6,
+    "learning_rate": 0.1,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "reg_lambda": 1.0,
+}
 
-    df = load_dataset(args.data)
-
-    def ensure_list(value):
-        if isinstance(value, list):
-            return value
-        if hasattr(value, "tolist"):
-            return value.tolist()
-        if isinstance(value, str) and value:
-            try:
-                return json.loads(value)
-            except Exception:
-                try:
-                    return ast.literal_eval(value)
-                except Exception:
-                    return [v.strip() for v in value.split(",") if v.strip()]
-        return []
 
+def prepare_frame(df: pd.DataFrame, encoder: FeatureEncoder) -> pd.DataFrame:
+    """Adapt a raw dataset (parsed list columns) to the columns `encoder` expects."""
     # Adapt minimal CSV schema: id, skills, education, experience, role
     if "labels" not in df.columns and "role" in df.columns:
         df["labels"] = df["role"].apply(lambda r: [str(r).strip()] if pd.notna(r) else [])
     if "desired_roles" not in df.columns:
         df["desired_roles"] = [[] for _ in range(len(df))]
-
-    if "skills" in df.columns:
-        df["skills"] = df["skills"].apply(ensure_list)
-    else:
+    if "skills" not in df.columns:
         df["skills"] = [[] for _ in range(len(df))]
 
     # Normalize education values to categories used in encoder
@@ -105,7 +74,6 @@ def main() -> None:
         else:
             df["years_experience"] = 0
 
-    encoder = FeatureEncoder.create()
     # Ensure required columns exist with defaults
     for col in encoder.numeric_cols:
         if col not in df.columns:
@@ -122,24 +90,121 @@ def main() -> None:
                 df[col] = "neutral"
             else:
                 df[col] = "UG"
+    return df
+
+
+def build_features(df: pd.DataFrame):
+    """Fit the encoder and label binarizer on `df`; returns (X, Y, encoder, label_binarizer)."""
+    encoder = FeatureEncoder.create()
+    df = prepare_frame(df, encoder)
     encoder.fit(df)
     X = encoder.transform(df)
 
     label_binarizer = MultiLabelBinarizer()
     Y = label_binarizer.fit_transform(df["labels"])
+    return X, Y, encoder, label_binarizer
+
+
+def load_features(data: Path, cache_dir: Path | None):
+    """(X, Y, encoder, label_binarizer), memory-mapped from the feature store when cached."""
+    key = feature_store.cache_key(data, FeatureEncoder.create())
+    if cache_dir is not None:
+        cached = feature_store.load(cache_dir, key)
+        if cached is not None:
+            print(f"Using cached features from {feature_store.entry_dir(cache_dir, key)}")
+            return cached
+    # List columns (skills, desired_roles, labels) come back parsed
+    X, Y, encoder, label_binarizer = build_features(load_parsed_dataset(data, cache_dir))
+    if cache_dir is not None:
+        feature_store.save(cache_dir, key, X, Y, encoder, label_binarizer, data)
+    return X, Y, encoder, label_binarizer
+
+
+def load_params(spec: str | None) -> dict:
+    if not spec:
+        return {}
+    path = Path(spec)
+    return json.loads(path.read_text() if path.exists() else spec)
+
+
+def search(args, X_train, X_val, y_train, y_val, cache_dir: Path | None) -> None:
+    """--search: rank a space of XGBoost settings and write the leaderboard."""
+    out_dir = args.artifacts_dir / "search"
+    with tempfile.TemporaryDirectory(dir=cache_dir if cache_dir and cache_dir.exists() else None) as work_dir:
+        results = hparam_search.run_search(
+            X_train, y_train, X_val, y_val,
+            space=hparam_search.load_space(args.search_space),
+            work_dir=Path(work_dir), out_dir=out_dir,
+            workers=args.search_workers, metric=args.search_metric, ks=args.ks,
+        )
+    best = results[0]
+    suggested = {**best["params"], "n_estimators": best["max_trees"]}
+    print(f"Leaderboard written to {out_dir}/leaderboard.{{json,csv}}")
+    print(f"Best trial {best['trial']}: {args.search_metric}={best['metrics'].get(args.search_metric):.4f}")
+    print(f"Train it with: --params '{json.dumps(suggested)}'")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train XGBoost One-vs-Rest model for Sensei.")
+    parser.add_argument("--data", type=Path, required=True, help="Path to dataset (parquet/csv).")
+    parser.add_argument("--artifacts_dir", type=Path, default=Path("artifacts"), help="Output directory.")
+    parser.add_argument("--test_size", type=float, default=0.2)
+    parser.add_argument("--ks", type=parse_ks, default=DEFAULT_KS, help="Comma-separated k for ranking metrics.")
+    parser.add_argument("--cache_dir", type=Path, default=None,
+                        help="Parsed-dataset and feature cache (default: <artifacts_dir>/cache).")
+    parser.add_argument("--no_cache", action="store_true", help="Do not read or write the dataset/feature caches.")
+    parser.add_argument("--params", type=str, default=None,
+                        help="JSON object (or file) of XGBoost parameters overriding the defaults.")
+    parser.add_argument("--search", action="store_true",
+                        help="Run a hyperparameter search and write a leaderboard instead of training one model.")
+    parser.add_argument("--search_space", type=str, default=None, help="JSON search space (file or string).")
+    parser.add_argument("--search_workers", type=int, default=None, help="Search processes (default: cores // 2).")
+    parser.add_argument("--search_metric", default="ndcg@3",
+                        help="Metric used to rank trials and to compare incremental vs full retraining.")
+    parser.add_argument("--no_distill", action="store_true",
+                        help="Skip fitting the linear preview model (student_linear.npz).")
+    parser.add_argument("--student_C", type=float, default=distill.DEFAULT_C,
+                        help="Inverse L1 strength of the preview model; smaller is sparser.")
+    parser.add_argument("--incremental_from", type=Path, default=None,
+                        help="Artifacts dir of a trained model to warm-start from; --data is its training set.")
+    parser.add_argument("--new_data", type=Path, default=None, help="New rows for --incremental_from.")
+    parser.add_argument("--incremental_rounds", type=int, default=50, help="Trees added per role.")
+    parser.add_argument("--unseen_skills", choices=("ignore", "fail"), default="ignore",
+                        help="What to do with skills missing from the encoder vocabulary.")
+    parser.add_argument("--skip_full_compare", action="store_true",
+                        help="Do not train a full model for comparison.")
+    parser.add_argument("--rebuild_tolerance", type=float, default=0.01,
+                        help="Recommend a full rebuild when the metric gap to a full retrain exceeds this.")
+    args = parser.parse_args()
+    if args.search or args.incremental_from:
+        extra = hparam_search.TRIAL_METRICS if args.search else incremental.SCORE_METRICS
+        try:
+            check_metric(args.search_metric, args.ks, extra=extra)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    cache_dir = None if args.no_cache else (args.cache_dir or args.artifacts_dir / "cache")
+    if args.incremental_from:
+        if args.new_data is None:
+            parser.error("--incremental_from needs --new_data")
+        params = {**DEFAULT_PARAMS, **load_params(args.params)}
+        incremental.run_incremental(args, cache_dir, prepare_frame, build_features, params)
+        return
+
+    X, Y, encoder, label_binarizer = load_features(args.data, cache_dir)
 
     X_train, X_val, y_train, y_val = train_test_split(
         X, Y, test_size=args.test_size, random_state=42
     )
 
+    if args.search:
+        search(args, X_train, X_val, y_train, y_val, cache_dir)
+        return
+
+    params = {**DEFAULT_PARAMS, **load_params(args.params)}
     model = OneVsRestClassifier(
         XGBClassifier(
-            n_estimators=300,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            reg_lambda=1.0,
+            **params,
             n_jobs=-1,
             objective="binary:logistic",
             eval_metric="logloss",
@@ -152,8 +217,7 @@ def main() -> None:
 
     metrics = {
         "hamming_loss": float(hamming_loss(y_val, y_val_pred)),
-        "precision@3": float(precision_at_k(y_val, y_proba, k=3)),
-        "recall@3": float(recall_at_k(y_val, y_proba, k=3)),
+        **ranking_metrics(y_val, y_proba, ks=args.ks),
     }
     report = classification_report(y_val, y_val_pred, target_names=label_binarizer.classes_)
     print(json.dumps(metrics, indent=2))
@@ -162,12 +226,19 @@ def main() -> None:
     artifacts_dir = args.artifacts_dir
     artifacts_dir.mkdir(parents=True, exist_ok=True)
     joblib.dump(model, artifacts_dir / "xgb_onevsrest.joblib")
+    tree_export.export_model(model, artifacts_dir / tree_export.TREES_FILE)
     joblib.dump(encoder, artifacts_dir / "feature_encoder.joblib")
     joblib.dump(label_binarizer, artifacts_dir / "label_binarizer.joblib")
     np.save(artifacts_dir / "val_proba.npy", y_proba)
     np.save(artifacts_dir / "y_val.npy", y_val)
     (artifacts_dir / "roles.json").write_text(json.dumps(label_binarizer.classes_.tolist(), indent=2))
     (artifacts_dir / "metrics.json").write_text(json.dumps(metrics, indent=2))
+
+    if not args.no_distill:
+        # The exported trees are what serves the full tier, so they stand in for the teacher
+        teacher = tree_export.TreeEnsemble.load(artifacts_dir / tree_export.TREES_FILE)
+        report = distill.distill(teacher, X_train, X_val, y_val, artifacts_dir, C=args.student_C, ks=args.ks)
+        print(distill.summary(report))
     print(f"Artifacts saved under {artifacts_dir}")
 
 
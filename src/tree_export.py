@@ -0,0 +1,286 @@
+"""
+Flat-array export of the one-vs-rest XGBoost model and a NumPy evaluator.
+
+Serving used to unpickle xgb_onevsrest.joblib, which imports xgboost and
+holds every booster in memory. Each predict_proba then looped over the 20
+roles in Python. `export_model` writes the trees of all roles into one
+xgb_trees.npz:
+
+  feature, threshold, left, right, value, default_left   one entry per node
+  roots, tree_role                                       one entry per tree
+  base_margin, constant                                  one entry per role
+
+Leaves point to themselves, with their leaf value in `value`. This lets
+`TreeEnsemble.predict_proba` advance every tree of every role for a whole
+batch one level per step, max_depth steps in total. It then sums the leaf
+values per role and applies the sigmoid. Roles that were constant at
+training time (sklearn's _ConstantPredictor) keep their constant.
+
+The evaluator needs only NumPy. The feature encoder is still a pickled
+sklearn object, so sklearn stays in the serving process, but xgboost and
+the boosters do not.
+
+  python -m src.tree_export --artifacts_dir src/artifacts            # export
+  python -m src.tree_export --artifacts_dir src/artifacts --check    # parity
+  python -m src.tree_export --artifacts_dir src/artifacts --measure  # cold start / RSS
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+TREES_FILE = "xgb_trees.npz"
+MODEL_FILE = "xgb_onevsrest.joblib"
+ENCODER_FILE = "feature_encoder.joblib"
+EXPORT_VERSION = 1
+
+
+def _booster_arrays(booster) -> dict:
+    """Nodes of one booster as arrays, in the layout of the exported file."""
+    model = json.loads(booster.save_raw("json"))["learner"]
+    gbm = model["gradient_booster"]
+    if gbm["name"] != "gbtree":
+        raise ValueError(f"Only gbtree boosters can be exported, got {gbm['name']}")
+    if model["objective"]["name"] != "binary:logistic":
+        raise ValueError(f"Unsupported objective {model['objective']['name']}")
+    trees = gbm["model"]["trees"]
+    best = booster.attributes().get("best_iteration")
+    if best is not None:
+        # predict_proba stops at the early-stopping iteration
+        per_round = int(gbm["model"]["gbtree_model_param"].get("num_parallel_tree", 1))
+        trees = trees[: (int(best) + 1) * per_round]
+
+    base_score = float(model["learner_model_param"]["base_score"].strip("[]"))
+    return {
+        "trees": [
+            {
+                "left": np.asarray(t["left_children"], dtype=np.int32),
+                "right": np.asarray(t["right_children"], dtype=np.int32),
+                "feature": np.asarray(t["split_indices"], dtype=np.int32),
+                "threshold": np.asarray(t["split_conditions"], dtype=np.float32),
+                "default_left": np.asarray(t["default_left"], dtype=bool),
+                "split_type": np.asarray(t["split_type"], dtype=np.int8),
+            }
+            for t in trees
+        ],
+        "base_margin": math.log(base_score / (1.0 - base_score)),
+    }
+
+
+def _depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth, frontier = 0, [0]
+    while True:
+        frontier = [c for n in frontier for c in (left[n], right[n]) if c != -1]
+        if not frontier:
+            return depth
+        depth += 1
+
+
+def flatten(model) -> dict:
+    """Arrays for a fitted OneVsRestClassifier of XGBClassifier estimators."""
+    feature, threshold, left, right, value, default_left = [], [], [], [], [], []
+    roots, tree_role = [], []
+    n_roles = len(model.estimators_)
+    base_margin = np.zeros(n_roles, dtype=np.float64)
+    constant = np.full(n_roles, np.nan, dtype=np.float64)
+    n_features = int(getattr(model, "n_features_in_", 0))
+    offset, max_depth = 0, 0
+
+    for role, est in enumerate(model.estimators_):
+        if not hasattr(est, "get_booster"):
+            constant[role] = float(est.predict_proba(np.zeros((1, max(n_features, 1))))[0, 1])
+            continue
+        exported = _booster_arrays(est.get_booster())
+        base_margin[role] = exported["base_margin"]
+        for tree in exported["trees"]:
+            if tree["split_type"].any():
+                raise ValueError("Categorical splits are not supported")
+            is_leaf = tree["left"] == -1
+            nodes = np.arange(len(is_leaf), dtype=np.int32) + offset
+            roots.append(offset)
+            tree_role.append(role)
+            feature.append(np.where(is_leaf, 0, tree["feature"]))
+            # Leaves loop back to themselves so extra steps are no-ops
+            left.append(np.where(is_leaf, nodes, tree["left"] + offset))
+            right.append(np.where(is_leaf, nodes, tree["right"] + offset))
+            threshold.append(np.where(is_leaf, 0.0, tree["threshold"]).astype(np.float32))
+            value.append(np.where(is_leaf, tree["threshold"], 0.0).astype(np.float32))
+            default_left.append(tree["default_left"])
+            max_depth = max(max_depth, _depth(tree["left"], tree["right"]))
+            offset += len(is_leaf)
+
+    def cat(parts, dtype):
+        return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+
+    return {
+        "feature": cat(feature, np.int32),
+        "threshold": cat(threshold, np.float32),
+        "left": cat(left, np.int32),
+        "right": cat(right, np.int32),
+        "value": cat(value, np.float32),
+        "default_left": cat(default_left, bool),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "tree_role": np.asarray(tree_role, dtype=np.int32),
+        "base_margin": base_margin,
+        "constant": constant,
+        "max_depth": np.int32(max_depth),
+        "n_features": np.int32(n_features),
+        "version": np.int32(EXPORT_VERSION),
+    }
+
+
+def export_model(model, path: Path) -> Path:
+    np.savez(path, **flatten(model))
+    return path
+
+
+class TreeEnsemble:
+    """NumPy evaluator for an exported model; predict_proba matches the original."""
+
+    def __init__(self, arrays):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.default_left = arrays["default_left"]
+        self.roots = arrays["roots"]
+        self.tree_role = arrays["tree_role"]
+        self.base_margin = arrays["base_margin"]
+        self.constant = arrays["constant"]
+        self.max_depth = int(arrays["max_depth"])
+        self.n_features = int(arrays["n_features"])
+        self.n_roles = len(self.base_margin)
+        # children[2 * node] is the left child, children[2 * node + 1] the right
+        self.children = np.stack([self.left, self.right], axis=1).ravel()
+        # Trees are stored role by role: first tree of each boosted role
+        self._boosted, self._role_start = np.unique(self.tree_role, return_index=True)
+
+    @classmethod
+    def load(cls, path: Path) -> "TreeEnsemble":
+        with np.load(path) as data:
+            if int(data["version"]) != EXPORT_VERSION:
+                raise ValueError(f"{path} has export version {int(data['version'])}, expected {EXPORT_VERSION}")
+            return cls({k: data[k] for k in data.files})
+
+    def leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """(n_rows, n_trees) leaf value each tree assigns to each row."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat = X.ravel()
+        row_start = (np.arange(X.shape[0], dtype=np.int64) * X.shape[1])[:, None]
+        has_nan = bool(np.isnan(flat).any())
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            x = flat[row_start + self.feature[node]]
+            # XGBoost goes left on x < threshold; missing values follow default_left
+            go_right = ~(x < self.threshold[node])
+            if has_nan:
+                go_right &= ~(np.isnan(x) & self.default_left[node])
+            node = self.children[2 * node + go_right]
+        return self.value[node]
+
+    def decision_function(self, X: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+        """Per-role margins (log-odds) for the boosted roles; 0 for constant roles."""
+        X = np.asarray(X)
+        margin = np.zeros((X.shape[0], self.n_roles), dtype=np.float64)
+        for start in range(0, X.shape[0], chunk_size):
+            leaves = self.leaf_values(X[start:start + chunk_size]).astype(np.float64)
+            margin[start:start + chunk_size, self._boosted] = np.add.reduceat(leaves, self._role_start, axis=1)
+        return margin + self.base_margin
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        proba = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        fixed = ~np.isnan(self.constant)
+        proba[:, fixed] = self.constant[fixed]
+        return proba
+
+
+def check(artifacts_dir: Path, n_rows: int = 2000, seed: int = 0) -> float:
+    """Largest |difference| against the pickled model on validation-like rows."""
+    import joblib
+
+    model = joblib.load(artifacts_dir / MODEL_FILE)
+    ensemble = TreeEnsemble.load(artifacts_dir / TREES_FILE)
+    # FeatureEncoder.transform puts the standardized numerics last
+    n_numeric = len(joblib.load(artifacts_dir / ENCODER_FILE).numeric_cols)
+    rng = np.random.default_rng(seed)
+    # Binary skill/one-hot columns plus standardized numerics, some NaN
+    X = (rng.random((n_rows, ensemble.n_features)) < 0.2).astype(np.float32)
+    X[:, -n_numeric:] = rng.normal(size=(n_rows, n_numeric))
+    X[rng.random(X.shape) < 0.01] = np.nan
+    return float(np.abs(model.predict_proba(X) - ensemble.predict_proba(X)).max())
+
+
+_MEASURE_SNIPPET = """
+import resource, sys, time
+from pathlib import Path
+t0 = time.perf_counter()
+import numpy as np
+engine, path = sys.argv[1], Path(sys.argv[2])
+if engine == "numpy":
+    from src.tree_export import TreeEnsemble, TREES_FILE
+    model = TreeEnsemble.load(path / TREES_FILE)
+    n_features = model.n_features
+else:
+    import joblib
+    model = joblib.load(path / "xgb_onevsrest.joblib")
+    n_features = model.n_features_in_
+x = np.zeros((1, n_features), dtype=np.float32)
+model.predict_proba(x)
+loaded = time.perf_counter() - t0
+t1 = time.perf_counter()
+for _ in range(200):
+    model.predict_proba(x)
+single = (time.perf_counter() - t1) / 200
+print(loaded, single, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+"""
+
+
+def measure(artifacts_dir: Path, runs: int = 3) -> dict:
+    """Cold start (imports + load + first prediction), single-row latency and peak RSS per engine."""
+    root = Path(__file__).resolve().parents[1]
+    results = {}
+    for engine in ("xgboost", "numpy"):
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run([sys.executable, "-c", _MEASURE_SNIPPET, engine, str(artifacts_dir.resolve())],
+                                 cwd=root, capture_output=True, text=True, check=True)
+            samples.append([float(v) for v in out.stdout.split()])
+        cold, single, rss = np.median(np.asarray(samples), axis=0)
+        results[engine] = {"cold_start_s": round(cold, 4), "predict_1_row_ms": round(single * 1000, 4),
+                           "peak_rss_mb": round(rss, 1)}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the XGBoost model to flat arrays for NumPy inference.")
+    parser.add_argument("--artifacts_dir", type=Path, default=Path("artifacts"))
+    parser.add_argument("--check", action="store_true", help="Compare exported predictions with the original model.")
+    parser.add_argument("--measure", action="store_true", help="Cold start, latency and RSS of both engines.")
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    if not (args.check or args.measure):
+        import joblib
+
+        path = export_model(joblib.load(args.artifacts_dir / MODEL_FILE), args.artifacts_dir / TREES_FILE)
+        print(f"Exported trees to {path} ({path.stat().st_size / 1e6:.2f} MB)")
+    if args.check:
+        diff = check(args.artifacts_dir)
+        print(f"Max |proba difference|: {diff:.2e}")
+        if diff > args.tolerance:
+            raise SystemExit(f"Exported model differs by more than {args.tolerance}")
+    if args.measure:
+        for engine, stats in measure(args.artifacts_dir).items():
+            print(f"{engine:<8} " + "  ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()